@@ -3,9 +3,11 @@ import os
 from datetime import datetime
 from dotenv import load_dotenv
 import sys
+import asyncio
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.pdf_script_extractor import extract_pdf_text
-from utils.langchain_util import analyze_script
+from utils.langchain_util import analyze_script_stream, analyze_script_chunked_stream, analyze_script_multi
+from utils.db_util import init_database, search_scripts, get_script
 
 # Load environment variables
 load_dotenv()
@@ -30,6 +32,8 @@ if 'analysis_result' not in st.session_state:
     st.session_state.analysis_result = None
 if 'current_script_name' not in st.session_state:
     st.session_state.current_script_name = None
+if 'multi_results' not in st.session_state:
+    st.session_state.multi_results = None
 
 # Sidebar
 with st.sidebar:
@@ -76,6 +80,13 @@ with st.sidebar:
     elif selected_model["provider"] == "xai":
         st.info(f"🔹 Using **{ai_model}** with real-time knowledge")
     
+    compare_models = st.multiselect(
+        "Compare Models Side-by-Side",
+        list(model_mapping.keys()),
+        default=[],
+        help="Analyze the same script with several models at once; results appear as each model finishes"
+    )
+    
     st.markdown("---")
     st.markdown("### ⚙️ AI Settings")
     
@@ -87,9 +98,17 @@ with st.sidebar:
         step=0.1,
         help="Lower values = more focused, Higher values = more creative"
     )
+    
+    full_length = st.checkbox(
+        "Analyze full screenplay (chunked)",
+        value=False,
+        help="Split long scripts at scene headings, analyze the parts in parallel and merge them into one report. "
+             "Costs one model call per part plus the final report (unchanged parts are served from the response "
+             "cache on re-runs)."
+    )
 
 # Main content
-tab1, tab2 = st.tabs(["📁 Upload PDF Script", "📚 Analyze Existing Script"])
+tab1, tab2, tab3 = st.tabs(["📁 Upload PDF Script", "📚 Analyze Existing Script", "🔎 Search Stored Scripts"])
 
 with tab1:
     st.markdown("### Upload Your PDF Script")
@@ -216,68 +235,52 @@ with tab2:
     else:
         st.info("📁 Scripts directory not found.")
 
-# Analysis section
-st.markdown("---")
-st.markdown("## 🔍 AI Analysis")
-
-if st.session_state.analyzed_script:
-    st.success(f"📄 Script loaded: **{st.session_state.current_script_name or 'Unknown'}**")
-    
-    # Show script stats
-    word_count = len(st.session_state.analyzed_script.split())
-    char_count = len(st.session_state.analyzed_script)
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.metric("Total Words", f"{word_count:,}")
-    with col2:
-        st.metric("Total Characters", f"{char_count:,}")
+with tab3:
+    st.markdown("### Search Stored Scripts")
+    st.markdown("Find screenplays in the database that mention a brand, location or character.")
     
-    # Preview pane before analysis
-    with st.expander("📖 Preview Script Content", expanded=False):
-        st.markdown("**Full Script Preview**")
-        st.text_area(
-            "Script Content",
-            st.session_state.analyzed_script,
-            height=400,
-            disabled=True,
-            label_visibility="collapsed"
-        )
-        
-        # Show first 1000 characters as quick preview
-        st.markdown("**Quick Preview (First 1000 characters):**")
-        st.info(st.session_state.analyzed_script[:1000])
-    
-    st.markdown("---")
+    search_query = st.text_input(
+        "Search terms",
+        placeholder="e.g. coffee shop, Tesla, SARAH",
+        help="All terms must match. End a term with * for prefix search (e.g. caf*)."
+    )
     
-    if st.button(f"🚀 Analyze Script with {ai_model}", type="primary", use_container_width=True):
-        # Check for appropriate API key based on provider
-        api_key_missing = False
-        if selected_model["provider"] == "google" and not os.getenv("GOOGLE_API_KEY"):
-            st.error("❌ Google API key not found. Please configure your .env file.")
-            api_key_missing = True
-        elif selected_model["provider"] == "openai" and not os.getenv("OPENAI_API_KEY"):
-            st.error("❌ OpenAI API key not found. Please configure your .env file.")
-            api_key_missing = True
-        elif selected_model["provider"] == "xai" and not os.getenv("XAI_API_KEY"):
-            st.error("❌ XAI API key not found. Please configure your .venv file.")
-            api_key_missing = True
+    if search_query:
+        init_database()
+        search_results = search_scripts(search_query, limit=20)
         
-        if not api_key_missing:
-            with st.spinner(f"🔍 Analyzing script with {ai_model}... This may take a moment due to the comprehensive analysis."):
-                try:
-                    # Load standardized analysis template
-                    template_path_md = "prompts/standardized_analysis_template.md"
-                    template_path_txt = "prompts/standardized_analysis_template.txt"
-                    if os.path.exists(template_path_md):
-                        with open(template_path_md, 'r') as f:
-                            analysis_template = f.read()
-                    elif os.path.exists(template_path_txt):
-                        with open(template_path_txt, 'r') as f:
-                            analysis_template = f.read()
-                    else:
-                        # Fallback template if file doesn't exist
-                        analysis_template = """## EXPERT SCREENPLAY ANALYSIS: {SCRIPT_TITLE}
+        if search_results:
+            st.caption(f"Top {len(search_results)} matches (best first)")
+            for row in search_results:
+                with st.container(border=True):
+                    col1, col2 = st.columns([4, 1])
+                    with col1:
+                        st.markdown(f"**{row['title']}** · {row['genre']}")
+                        st.markdown(f"…{row['snippet']}…")
+                    with col2:
+                        if st.button("📊 Load", key=f"load_db_{row['id']}", use_container_width=True):
+                            stored = get_script(row['id'])
+                            if stored:
+                                st.session_state.analyzed_script = stored['content']
+                                st.session_state.current_script_name = stored['title']
+                                st.rerun()
+        else:
+            st.info("No stored scripts match your search.")
+
+# Analysis helpers
+def load_analysis_template() -> str:
+    """Load the standardized analysis template (.md preferred, fallback .txt, then built-in)"""
+    template_path_md = "prompts/standardized_analysis_template.md"
+    template_path_txt = "prompts/standardized_analysis_template.txt"
+    if os.path.exists(template_path_md):
+        with open(template_path_md, 'r') as f:
+            analysis_template = f.read()
+    elif os.path.exists(template_path_txt):
+        with open(template_path_txt, 'r') as f:
+            analysis_template = f.read()
+    else:
+        # Fallback template if file doesn't exist
+        analysis_template = """## EXPERT SCREENPLAY ANALYSIS: {SCRIPT_TITLE}
 
 As an expert screenplay analyst specializing in brand integration and market valuation, analyze this screenplay excerpt and provide a comprehensive, structured analysis.
 
@@ -358,18 +361,94 @@ Provide a detailed table with the following columns:
 **Overall Assessment:** [Brief summary]
 **Top 3 Opportunities:** [List]
 **Recommended Next Steps:** [List]"""
+    return analysis_template
+
+
+# Analysis section
+st.markdown("---")
+st.markdown("## 🔍 AI Analysis")
+
+if st.session_state.analyzed_script:
+    st.success(f"📄 Script loaded: **{st.session_state.current_script_name or 'Unknown'}**")
+    
+    # Show script stats
+    word_count = len(st.session_state.analyzed_script.split())
+    char_count = len(st.session_state.analyzed_script)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Total Words", f"{word_count:,}")
+    with col2:
+        st.metric("Total Characters", f"{char_count:,}")
+    
+    # Preview pane before analysis
+    with st.expander("📖 Preview Script Content", expanded=False):
+        st.markdown("**Full Script Preview**")
+        st.text_area(
+            "Script Content",
+            st.session_state.analyzed_script,
+            height=400,
+            disabled=True,
+            label_visibility="collapsed"
+        )
+        
+        # Show first 1000 characters as quick preview
+        st.markdown("**Quick Preview (First 1000 characters):**")
+        st.info(st.session_state.analyzed_script[:1000])
+    
+    st.markdown("---")
+    
+    if st.button(f"🚀 Analyze Script with {ai_model}", type="primary", use_container_width=True):
+        # Check for appropriate API key based on provider
+        api_key_missing = False
+        if selected_model["provider"] == "google" and not os.getenv("GOOGLE_API_KEY"):
+            st.error("❌ Google API key not found. Please configure your .env file.")
+            api_key_missing = True
+        elif selected_model["provider"] == "openai" and not os.getenv("OPENAI_API_KEY"):
+            st.error("❌ OpenAI API key not found. Please configure your .env file.")
+            api_key_missing = True
+        elif selected_model["provider"] == "xai" and not os.getenv("XAI_API_KEY"):
+            st.error("❌ XAI API key not found. Please configure your .venv file.")
+            api_key_missing = True
+        
+        if not api_key_missing:
+            with st.spinner(f"🔍 Analyzing script with {ai_model}... This may take a moment due to the comprehensive analysis."):
+                try:
+                    analysis_template = load_analysis_template()
                     
                     # Get script title from filename and generate analysis via util
                     script_title = st.session_state.current_script_name.replace('.pdf', '').replace('_', ' ') if st.session_state.current_script_name else "Unknown Script"
-                    result = analyze_script(
-                        script_title=script_title,
-                        script_content=st.session_state.analyzed_script,
-                        selected_model=selected_model,
-                        temperature=temperature,
-                        max_tokens=4000,
-                        analysis_template=analysis_template
-                    )
+                    # Stream the report as it is generated
+                    metrics = {}
+                    if full_length:
+                        progress = st.progress(0.0, text="Analyzing screenplay parts...")
+                        stream = analyze_script_chunked_stream(
+                            script_title=script_title,
+                            script_content=st.session_state.analyzed_script,
+                            selected_model=selected_model,
+                            temperature=temperature,
+                            max_tokens=4000,
+                            analysis_template=analysis_template,
+                            progress_callback=lambda done, total: progress.progress(
+                                done / total, text=f"Analyzed part {done}/{total} — merging when all parts are done"
+                            ),
+                            metrics=metrics
+                        )
+                    else:
+                        stream = analyze_script_stream(
+                            script_title=script_title,
+                            script_content=st.session_state.analyzed_script,
+                            selected_model=selected_model,
+                            temperature=temperature,
+                            max_tokens=4000,
+                            analysis_template=analysis_template,
+                            metrics=metrics
+                        )
+                    result = st.write_stream(stream)
+                    if full_length:
+                        progress.empty()
                     
+                    st.session_state.analysis_metrics = metrics
                     st.session_state.analysis_result = result
                     st.success("✅ Analysis complete!")
                     st.rerun()
@@ -378,9 +457,66 @@ Provide a detailed table with the following columns:
                     st.error(f"❌ Error analyzing script: {str(e)}")
                     st.exception(e)
     
+    if len(compare_models) >= 2 and st.button(f"⚖️ Compare {len(compare_models)} Models Side-by-Side", use_container_width=True):
+        script_title = st.session_state.current_script_name.replace('.pdf', '').replace('_', ' ') if st.session_state.current_script_name else "Unknown Script"
+        columns = dict(zip(compare_models, st.columns(len(compare_models))))
+        placeholders = {}
+        for name, col in columns.items():
+            with col:
+                st.markdown(f"#### {name}")
+                placeholders[name] = st.empty()
+                placeholders[name].info("⏳ Waiting for response...")
+        
+        names_by_model = {(model_mapping[n]["provider"], model_mapping[n]["model"]): n for n in compare_models}
+        
+        async def run_comparison():
+            results = {}
+            async for item in analyze_script_multi(
+                script_title=script_title,
+                script_content=st.session_state.analyzed_script,
+                models=[model_mapping[n] for n in compare_models],
+                temperature=temperature,
+                max_tokens=4000,
+                analysis_template=load_analysis_template(),
+                chunked=full_length
+            ):
+                name = names_by_model[(item["selected_model"]["provider"], item["selected_model"]["model"])]
+                results[name] = item
+                if item["success"]:
+                    placeholders[name].success(f"✅ Done in {item['elapsed_s']:.1f}s")
+                else:
+                    placeholders[name].error(f"❌ {item['error']}")
+            # Keep the user's column order for the side-by-side view
+            return {n: results[n] for n in compare_models if n in results}
+        
+        st.session_state.multi_results = asyncio.run(run_comparison())
+        st.rerun()
+    
+    # Side-by-side results
+    if st.session_state.multi_results:
+        st.markdown("### ⚖️ Side-by-Side Analysis")
+        columns = st.columns(len(st.session_state.multi_results))
+        for col, (name, item) in zip(columns, st.session_state.multi_results.items()):
+            with col:
+                st.markdown(f"#### {name}")
+                if item["success"]:
+                    st.caption(f"⏱️ {item['elapsed_s']:.1f}s")
+                    with st.container(height=600):
+                        st.markdown(item["text"])
+                else:
+                    st.error(f"❌ {item['error']}")
+        if st.button("🔄 Clear Comparison", use_container_width=True):
+            st.session_state.multi_results = None
+            st.rerun()
+    
     # Display analysis results
     if st.session_state.analysis_result:
         st.markdown("### 📊 Analysis Results")
+        metrics = st.session_state.get("analysis_metrics") or {}
+        if metrics.get("cached"):
+            st.caption("⚡ Served from the response cache")
+        elif metrics.get("ttft_s") is not None:
+            st.caption(f"⏱️ First token after {metrics['ttft_s']:.1f}s · complete in {metrics.get('total_s', 0):.1f}s")
         st.markdown(st.session_state.analysis_result)
         
         # Save and download options
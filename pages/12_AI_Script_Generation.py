@@ -2,8 +2,8 @@ import streamlit as st
 import os
 from datetime import datetime
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
+from utils.langchain_util import create_llm, stream_llm
 
 # Load environment variables
 load_dotenv()
@@ -150,9 +150,9 @@ if st.button("🚀 Generate Script Outline", type="primary", use_container_width
     else:
         with st.spinner("🎬 Generating script outline... This may take a moment."):
             try:
-                # Initialize LLM
-                llm = ChatOpenAI(
-                    model="gpt-4.1-mini",
+                # Reuse a pooled client for this model/settings
+                llm = create_llm(
+                    {"provider": "openai", "model": "gpt-4.1-mini"},
                     temperature=temperature,
                     max_tokens=max_tokens
                 )
@@ -170,14 +170,22 @@ if st.button("🚀 Generate Script Outline", type="primary", use_container_width
                     setting=setting
                 )
                 
-                # Use invoke instead of predict (new LangChain API)
-                response = llm.invoke(formatted_prompt)
-                result = response.content
+                # Stream the outline as it is generated
+                st.markdown("### 📄 Generated Script Outline")
+                metrics = {}
+                result = st.write_stream(stream_llm(
+                    llm,
+                    formatted_prompt,
+                    {"provider": "openai", "model": "gpt-4.1-mini"},
+                    temperature,
+                    max_tokens,
+                    use_cache=False,  # every click should produce a fresh outline
+                    metrics=metrics
+                ))
                 
-                # Display result
                 st.success("✅ Script outline generated successfully!")
-                st.markdown("### 📄 Generated Script Outline")
-                st.markdown(result)
+                if not metrics.get("cached"):
+                    st.caption(f"⏱️ First token after {metrics['ttft_s'] or 0:.1f}s · complete in {metrics['total_s']:.1f}s")
                 
                 # Save script
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -4,6 +4,10 @@ from dotenv import load_dotenv
 from tmdbv3api import TMDb, Movie, Person
 import requests
 from tavily import TavilyClient
+from utils.langchain_util import get_llm_client_stats, get_streaming_stats, get_json_parse_stats
+from utils.llm_cache import get_cache_stats, clear_cache
+from utils import extraction_cache
+from utils.rate_limit import get_rate_limit_stats
 
 # Load environment variables
 load_dotenv()
@@ -421,6 +425,96 @@ with tab4:
             except Exception as e:
                 st.error(f"Error searching: {str(e)}")
 
+# LLM client metrics
+st.markdown("---")
+st.markdown("## 📈 LLM Client Metrics")
+
+client_stats = get_llm_client_stats()
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Client Reuse Rate", f"{client_stats['reuse_rate']:.0%}")
+col2.metric("Reused / Created", f"{client_stats['hits']} / {client_stats['misses']}")
+col3.metric("Cached Clients", f"{client_stats['size']}/{client_stats['max_size']}")
+col4.metric("Evictions", client_stats['evictions'])
+
+st.markdown("#### 💾 Response Cache")
+cache_stats = get_cache_stats()
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+col2.metric("Hits / Misses", f"{cache_stats['hits']} / {cache_stats['misses']}")
+col3.metric("Cached Responses", cache_stats['entries'])
+col4.metric("Cache Size", f"{cache_stats['bytes'] / 1024 / 1024:.1f} MB")
+
+if not cache_stats['enabled']:
+    st.warning("⚠️ Response cache disabled (LLM_CACHE_ENABLED=0)")
+
+if st.button("🗑️ Clear Response Cache"):
+    if clear_cache():
+        st.success("✅ Response cache cleared")
+        st.rerun()
+
+st.markdown("#### 📄 PDF Extraction Cache")
+extraction_stats = extraction_cache.get_cache_stats()
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Hit Rate", f"{extraction_stats['hit_rate']:.0%}")
+col2.metric("Hits / Misses", f"{extraction_stats['hits']} / {extraction_stats['misses']}")
+col3.metric("Cached PDFs", extraction_stats['documents'])
+col4.metric("Cache Size", f"{extraction_stats['bytes'] / 1024 / 1024:.1f} MB")
+
+if not extraction_stats['enabled']:
+    st.warning("⚠️ Extraction cache disabled (EXTRACTION_CACHE_ENABLED=0)")
+
+if st.button("🗑️ Clear Extraction Cache"):
+    if extraction_cache.clear_cache():
+        st.success("✅ Extraction cache cleared")
+        st.rerun()
+
+stream_stats = get_streaming_stats()
+if stream_stats['streams']:
+    st.markdown("#### ⏱️ Streaming Latency")
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Streams", stream_stats['streams'])
+    col2.metric("Time to First Token (p50)", f"{stream_stats['ttft_p50_s']:.2f}s")
+    col3.metric("Time to First Token (max)", f"{stream_stats['ttft_max_s']:.2f}s")
+    col4.metric("Full Response (p50)", f"{stream_stats['total_p50_s']:.1f}s")
+
+rate_stats = get_rate_limit_stats()
+if rate_stats:
+    st.markdown("#### 🚦 Rate Limiting & Retries")
+    st.dataframe(
+        [
+            {
+                "Provider": provider,
+                "Attempts": int(stats['calls']),
+                "Throttled": int(stats['throttled']),
+                "Throttle Wait (s)": round(stats['throttle_wait_s'], 1),
+                "Retried": int(stats['retries']),
+                "Failed": int(stats['failures']),
+            }
+            for provider, stats in sorted(rate_stats.items())
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
+json_stats = get_json_parse_stats()
+if json_stats:
+    st.markdown("#### 🧩 Structured Output")
+    st.dataframe(
+        [
+            {
+                "Call Site": purpose,
+                "Calls": stats['calls'],
+                "Parse Failures": stats['parse_failures'],
+                "Failure Rate": f"{stats['failure_rate']:.0%}",
+                "Repaired": stats['repaired'],
+                "Wasted Calls": stats['failed'],
+            }
+            for purpose, stats in sorted(json_stats.items())
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
 # Configuration section
 st.markdown("---")
 st.markdown("## ⚙️ API Configuration")
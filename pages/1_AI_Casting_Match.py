@@ -4,7 +4,7 @@ import sys
 from dotenv import load_dotenv
 from tmdbv3api import TMDb, Person, Movie
 import json
-from utils.ai_casting_util import generate_recommendations, score_actor_for_script
+from utils.ai_casting_util import generate_recommendations, score_actor_for_script, score_actors_for_script
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.pdf_script_extractor import extract_pdf_text
 
@@ -304,6 +304,41 @@ with tab_selected:
                 use_container_width=True
             )
         
+        # Score the whole cast against the script in one batch
+        context_text = st.session_state.get("modified_script") or script_context
+        if context_text:
+            st.markdown("---")
+            st.markdown("### 📈 Rank Cast vs Script")
+            single_prompt = st.checkbox("Score all actors in one prompt", value=False,
+                                        help="One multi-actor call instead of concurrent per-actor calls")
+            if st.button("📈 Score Selected Cast", use_container_width=True):
+                with st.spinner(f"Scoring {len(st.session_state.selected_actors)} actors..."):
+                    st.session_state.cast_scores = score_actors_for_script(
+                        actor_names=[a['name'] for a in st.session_state.selected_actors],
+                        script_text=context_text,
+                        selected_model=selected_model,
+                        temperature=0.2,
+                        max_tokens=600,
+                        single_prompt=single_prompt
+                    )
+            if st.session_state.get("cast_scores"):
+                rows = st.session_state.cast_scores
+                st.dataframe(
+                    [{
+                        "Rank": r["rank"],
+                        "Actor": r["actor"],
+                        "Score": r["score"] if r["score"] is not None else "—",
+                        "Latency": f"{r['latency_s']:.1f}s",
+                        "Error": r["error"] or ""
+                    } for r in rows],
+                    use_container_width=True,
+                    hide_index=True
+                )
+                for r in rows:
+                    if r["analysis"]:
+                        with st.expander(f"#{r['rank']} {r['actor']} — why"):
+                            st.markdown(r["analysis"])
+        
         # Clear all button
         if st.button("🗑️ Clear All", type="secondary"):
             st.session_state.selected_actors = []
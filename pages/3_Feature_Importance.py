@@ -2,11 +2,11 @@ import streamlit as st
 import os
 from datetime import datetime
 from dotenv import load_dotenv
-import requests
 import pandas as pd
 import numpy as np
 import plotly.express as px
 from utils.regression_util import run_random_forest_importance
+from utils.rate_limit import rate_limited_get
 
 # Load environment variables
 load_dotenv()
@@ -55,7 +55,7 @@ with st.sidebar:
 def fetch_tmdb_genres(api_key: str) -> dict:
     url = f"https://api.themoviedb.org/3/genre/movie/list"
     params = {"api_key": api_key}
-    r = requests.get(url, params=params, timeout=20)
+    r = rate_limited_get("tmdb", url, api_key=api_key, params=params, timeout=20)
     r.raise_for_status()
     data = r.json().get("genres", [])
     return {g["id"]: g["name"] for g in data}
@@ -73,7 +73,7 @@ def tmdb_discover_page(api_key: str, page: int, year_min: int, year_max: int, mi
         "include_adult": "false",
         "include_video": "false",
     }
-    r = requests.get(url, params=params, timeout=30)
+    r = rate_limited_get("tmdb", url, api_key=api_key, params=params, timeout=30)
     r.raise_for_status()
     return r.json().get("results", [])
 
@@ -81,7 +81,7 @@ def tmdb_discover_page(api_key: str, page: int, year_min: int, year_max: int, mi
 def tmdb_movie_details(api_key: str, movie_id: int) -> dict:
     url = f"https://api.themoviedb.org/3/movie/{movie_id}"
     params = {"api_key": api_key, "append_to_response": "credits,external_ids"}
-    r = requests.get(url, params=params, timeout=30)
+    r = rate_limited_get("tmdb", url, api_key=api_key, params=params, timeout=30)
     r.raise_for_status()
     return r.json()
 
@@ -89,7 +89,7 @@ def tmdb_movie_details(api_key: str, movie_id: int) -> dict:
 def omdb_by_imdb(api_key: str, imdb_id: str) -> dict:
     url = "http://www.omdbapi.com/"
     params = {"apikey": api_key, "i": imdb_id}
-    r = requests.get(url, params=params, timeout=20)
+    r = rate_limited_get("omdb", url, api_key=api_key, params=params, timeout=20)
     r.raise_for_status()
     return r.json()
 
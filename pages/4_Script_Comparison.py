@@ -5,7 +5,7 @@ import re
 from datetime import datetime
 from difflib import HtmlDiff, unified_diff
 from dotenv import load_dotenv
-from utils.langchain_util import compare_scripts, generate_modified_script
+from utils.langchain_util import compare_scripts_stream, generate_modified_script_stream
 import pandas as pd
 import json
 from typing import Dict
@@ -256,18 +256,23 @@ with gen_col1:
             preface = f"Parameters: subtlety={subtlety}; brands=[{brands}]; categories=[{categories}]\n\n"
             full_template = preface + base_template
             try:
-                with st.spinner("✨ Generating modified script..."):
-                    result = generate_modified_script(
+                metrics = {}
+                with st.container(height=300):
+                    result = st.write_stream(generate_modified_script_stream(
                         original_script=st.session_state.original_script,
                         template_text=full_template,
                         provider=selected_model["provider"],
                         model=selected_model["model"],
                         temperature=temperature,
-                        max_tokens=3500
-                    )
+                        max_tokens=3500,
+                        use_cache=False,  # regenerating should give a new variant
+                        metrics=metrics
+                    ))
                 st.session_state.modified_script = result
                 st.session_state.compare_ready = False
                 st.success("✅ Modified script generated!")
+                if not metrics.get("cached"):
+                    st.caption(f"⏱️ First token after {metrics['ttft_s'] or 0:.1f}s · complete in {metrics['total_s']:.1f}s")
                 # Save to scripts (keep original document name when possible)
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 base_name = st.session_state.original_script_name or "modified"
@@ -637,18 +642,22 @@ if st.session_state.compare_ready and st.session_state.original_script and st.se
                     "{modified_script}\n"
                 )
             try:
-                with st.spinner("🔎 Analyzing differences..."):
-                    result = compare_scripts(
+                metrics = {}
+                with st.expander("🔎 Analyzing differences...", expanded=True):
+                    result = st.write_stream(compare_scripts_stream(
                         original_script=st.session_state.original_script,
                         modified_script=st.session_state.modified_script,
                         template_text=comparison_template,
                         temperature=temperature,
                         model=selected_model["model"],
                         provider=selected_model["provider"],
-                        max_tokens=1500
-                    )
+                        max_tokens=1500,
+                        metrics=metrics
+                    ))
                 st.session_state.comparison_analysis = result
                 st.success("✅ Analysis complete!")
+                if not metrics.get("cached"):
+                    st.caption(f"⏱️ First token after {metrics['ttft_s'] or 0:.1f}s · complete in {metrics['total_s']:.1f}s")
             except Exception as e:
                 st.error(f"❌ Error during analysis: {str(e)}")
 
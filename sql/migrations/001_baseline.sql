@@ -0,0 +1,163 @@
+-- Movie Analytics Platform Database Schema
+-- Migration 001: baseline schema
+--
+-- Idempotent so it can also adopt databases created before schema
+-- versioning (see init_database() in utils/db_util.py).
+--
+-- Every migration is plain SQL and records its own version, so a new
+-- database can also be created without Python:
+--   cat sql/migrations/*.sql | sqlite3 db/movie_analytics.db
+
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Scripts table
+CREATE TABLE IF NOT EXISTS scripts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    genre TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    content_format TEXT NOT NULL DEFAULT 'text'  -- 'text', 'zlib' or 'zstd' (compressed BLOB)
+);
+
+-- Product placements table
+CREATE TABLE IF NOT EXISTS product_placements (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    script_id INTEGER,
+    product_name TEXT NOT NULL,
+    brand TEXT NOT NULL,
+    placement_type TEXT,
+    scene_description TEXT,
+    estimated_cost REAL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (script_id) REFERENCES scripts(id) ON DELETE CASCADE
+);
+
+-- Actors table
+CREATE TABLE IF NOT EXISTS actors (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tmdb_id INTEGER UNIQUE,
+    name TEXT NOT NULL,
+    country TEXT,
+    popularity REAL,
+    profile_path TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Script casting table
+CREATE TABLE IF NOT EXISTS script_casting (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    script_id INTEGER,
+    actor_id INTEGER,
+    role_name TEXT,
+    match_score REAL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (script_id) REFERENCES scripts(id) ON DELETE CASCADE,
+    FOREIGN KEY (actor_id) REFERENCES actors(id) ON DELETE CASCADE
+);
+
+-- Revenue forecasts table
+CREATE TABLE IF NOT EXISTS revenue_forecasts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    script_id INTEGER,
+    genre TEXT NOT NULL,
+    product_category TEXT,
+    estimated_revenue REAL,
+    estimated_roi REAL,
+    market_reach TEXT,
+    forecast_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (script_id) REFERENCES scripts(id) ON DELETE CASCADE
+);
+
+-- Create indexes for better query performance
+CREATE INDEX IF NOT EXISTS idx_scripts_genre ON scripts(genre);
+CREATE INDEX IF NOT EXISTS idx_scripts_created ON scripts(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_scripts_genre_created ON scripts(genre, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_product_placements_script ON product_placements(script_id);
+CREATE INDEX IF NOT EXISTS idx_actors_tmdb ON actors(tmdb_id);
+CREATE INDEX IF NOT EXISTS idx_script_casting_script ON script_casting(script_id);
+CREATE INDEX IF NOT EXISTS idx_script_casting_actor ON script_casting(actor_id);
+CREATE INDEX IF NOT EXISTS idx_revenue_forecasts_script ON revenue_forecasts(script_id);
+
+-- Row counts maintained by triggers so dashboard statistics are O(1) reads
+CREATE TABLE IF NOT EXISTS table_stats (
+    table_name TEXT PRIMARY KEY,
+    row_count INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS genre_counts (
+    genre TEXT PRIMARY KEY,
+    script_count INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS scripts_stats_insert AFTER INSERT ON scripts BEGIN
+    UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = 'scripts';
+    INSERT INTO genre_counts (genre, script_count) VALUES (new.genre, 1)
+        ON CONFLICT(genre) DO UPDATE SET script_count = script_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS scripts_stats_delete AFTER DELETE ON scripts BEGIN
+    UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = 'scripts';
+    UPDATE genre_counts SET script_count = script_count - 1 WHERE genre = old.genre;
+    DELETE FROM genre_counts WHERE genre = old.genre AND script_count <= 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS scripts_stats_genre_update AFTER UPDATE OF genre ON scripts
+WHEN old.genre IS NOT new.genre BEGIN
+    UPDATE genre_counts SET script_count = script_count - 1 WHERE genre = old.genre;
+    DELETE FROM genre_counts WHERE genre = old.genre AND script_count <= 0;
+    INSERT INTO genre_counts (genre, script_count) VALUES (new.genre, 1)
+        ON CONFLICT(genre) DO UPDATE SET script_count = script_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS product_placements_stats_insert AFTER INSERT ON product_placements BEGIN
+    UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = 'product_placements';
+END;
+
+CREATE TRIGGER IF NOT EXISTS product_placements_stats_delete AFTER DELETE ON product_placements BEGIN
+    UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = 'product_placements';
+END;
+
+CREATE TRIGGER IF NOT EXISTS actors_stats_insert AFTER INSERT ON actors BEGIN
+    UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = 'actors';
+END;
+
+CREATE TRIGGER IF NOT EXISTS actors_stats_delete AFTER DELETE ON actors BEGIN
+    UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = 'actors';
+END;
+
+CREATE TRIGGER IF NOT EXISTS script_casting_stats_insert AFTER INSERT ON script_casting BEGIN
+    UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = 'script_casting';
+END;
+
+CREATE TRIGGER IF NOT EXISTS script_casting_stats_delete AFTER DELETE ON script_casting BEGIN
+    UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = 'script_casting';
+END;
+
+CREATE TRIGGER IF NOT EXISTS revenue_forecasts_stats_insert AFTER INSERT ON revenue_forecasts BEGIN
+    UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = 'revenue_forecasts';
+END;
+
+CREATE TRIGGER IF NOT EXISTS revenue_forecasts_stats_delete AFTER DELETE ON revenue_forecasts BEGIN
+    UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = 'revenue_forecasts';
+END;
+
+-- Populate the counts for rows that already exist
+DELETE FROM table_stats;
+INSERT INTO table_stats (table_name, row_count)
+    SELECT 'scripts', COUNT(*) FROM scripts
+    UNION ALL SELECT 'product_placements', COUNT(*) FROM product_placements
+    UNION ALL SELECT 'actors', COUNT(*) FROM actors
+    UNION ALL SELECT 'script_casting', COUNT(*) FROM script_casting
+    UNION ALL SELECT 'revenue_forecasts', COUNT(*) FROM revenue_forecasts;
+
+DELETE FROM genre_counts;
+INSERT INTO genre_counts (genre, script_count)
+    SELECT genre, COUNT(*) FROM scripts GROUP BY genre;
+
+INSERT OR IGNORE INTO schema_version (version, name) VALUES (1, 'baseline');
@@ -0,0 +1,12 @@
+-- Migration 002: drop indexes duplicated by other indexes
+--
+-- idx_scripts_genre: genre lookups are served by idx_scripts_genre_created
+-- (genre, created_at, id), which has genre as its leading column.
+-- idx_actors_tmdb: actors.tmdb_id is UNIQUE, so SQLite already maintains an
+-- index on it.
+-- Each redundant index only adds write cost to every insert and update.
+
+DROP INDEX IF EXISTS idx_scripts_genre;
+DROP INDEX IF EXISTS idx_actors_tmdb;
+
+INSERT OR IGNORE INTO schema_version (version, name) VALUES (2, 'drop_redundant_indexes');
@@ -0,0 +1,49 @@
+-- Migration 003: full-text search index maintained with built-in SQL only
+--
+-- The index used to read decompressed text through script_text(), a Python
+-- function registered by utils/db_util.py, so writing to scripts from any
+-- other SQLite client failed with "no such function". The index now keeps its
+-- own copy of each script's text. Triggers index plain-text rows; rows stored
+-- compressed are indexed by db_util inside the same transaction (and by
+-- init_database() after this migration), since SQL cannot decompress them.
+
+DROP TRIGGER IF EXISTS scripts_fts_insert;
+DROP TRIGGER IF EXISTS scripts_fts_delete;
+DROP TRIGGER IF EXISTS scripts_fts_update;
+DROP TRIGGER IF EXISTS scripts_fts_reindex;
+DROP TABLE IF EXISTS scripts_fts;
+DROP VIEW IF EXISTS scripts_text;
+
+CREATE VIRTUAL TABLE scripts_fts USING fts5(
+    title,
+    genre,
+    content,
+    tokenize='porter unicode61'
+);
+
+CREATE TRIGGER scripts_fts_insert AFTER INSERT ON scripts
+WHEN new.content_format = 'text' BEGIN
+    INSERT INTO scripts_fts (rowid, title, genre, content)
+    VALUES (new.id, new.title, new.genre, new.content);
+END;
+
+CREATE TRIGGER scripts_fts_delete AFTER DELETE ON scripts BEGIN
+    DELETE FROM scripts_fts WHERE rowid = old.id;
+END;
+
+CREATE TRIGGER scripts_fts_update AFTER UPDATE OF title, genre ON scripts BEGIN
+    UPDATE scripts_fts SET title = new.title, genre = new.genre WHERE rowid = new.id;
+END;
+
+-- Recompressing plain text keeps its index entry; new plain text replaces it
+CREATE TRIGGER scripts_fts_reindex AFTER UPDATE OF content, content_format ON scripts
+WHEN new.content_format = 'text' BEGIN
+    DELETE FROM scripts_fts WHERE rowid = new.id;
+    INSERT INTO scripts_fts (rowid, title, genre, content)
+    VALUES (new.id, new.title, new.genre, new.content);
+END;
+
+INSERT INTO scripts_fts (rowid, title, genre, content)
+    SELECT id, title, genre, content FROM scripts WHERE content_format = 'text';
+
+INSERT OR IGNORE INTO schema_version (version, name) VALUES (3, 'plain_sql_search_index');
@@ -0,0 +1,42 @@
+-- Migration 004: actors are no longer deleted out from under their castings
+--
+-- The baseline declares script_casting.actor_id with ON DELETE CASCADE, so
+-- deleting an actor would silently remove every casting naming them.
+-- Castings now cascade only from their script; deleting an actor who is
+-- still cast fails with a foreign key error instead.
+-- SQLite cannot alter a constraint, so the table is rebuilt. Its indexes and
+-- triggers are dropped with the old table and recreated below, and its
+-- AUTOINCREMENT counter is carried over so casting ids are never reused.
+
+CREATE TABLE script_casting_new (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    script_id INTEGER,
+    actor_id INTEGER,
+    role_name TEXT,
+    match_score REAL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (script_id) REFERENCES scripts(id) ON DELETE CASCADE,
+    FOREIGN KEY (actor_id) REFERENCES actors(id)
+);
+
+INSERT INTO script_casting_new (id, script_id, actor_id, role_name, match_score, created_at)
+    SELECT id, script_id, actor_id, role_name, match_score, created_at FROM script_casting;
+
+DELETE FROM sqlite_sequence WHERE name = 'script_casting_new';
+UPDATE sqlite_sequence SET name = 'script_casting_new' WHERE name = 'script_casting';
+
+DROP TABLE script_casting;
+ALTER TABLE script_casting_new RENAME TO script_casting;
+
+CREATE INDEX IF NOT EXISTS idx_script_casting_script ON script_casting(script_id);
+CREATE INDEX IF NOT EXISTS idx_script_casting_actor ON script_casting(actor_id);
+
+CREATE TRIGGER IF NOT EXISTS script_casting_stats_insert AFTER INSERT ON script_casting BEGIN
+    UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = 'script_casting';
+END;
+
+CREATE TRIGGER IF NOT EXISTS script_casting_stats_delete AFTER DELETE ON script_casting BEGIN
+    UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = 'script_casting';
+END;
+
+INSERT OR IGNORE INTO schema_version (version, name) VALUES (4, 'casting_keeps_actors');
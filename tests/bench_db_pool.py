@@ -0,0 +1,133 @@
+"""
+Benchmark: pooled vs. per-call SQLite connections
+Measures ops/sec of the CRUD helpers in utils/db_util.py before (a fresh
+sqlite3.connect per call, as the helpers used to do) and after pooling.
+
+Usage: python tests/bench_db_pool.py [iterations]
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import db_util
+
+
+def _legacy_connection():
+    conn = sqlite3.connect(db_util.DB_PATH)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def legacy_create_script(title, genre, content):
+    conn = _legacy_connection()
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO scripts (title, genre, content, created_at, modified_at)
+        VALUES (?, ?, ?, ?, ?)
+    """, (title, genre, content, datetime.now(), datetime.now()))
+    script_id = cursor.lastrowid
+    conn.commit()
+    conn.close()
+    return script_id
+
+
+def legacy_get_script(script_id):
+    conn = _legacy_connection()
+    row = conn.execute("SELECT * FROM scripts WHERE id = ?", (script_id,)).fetchone()
+    conn.close()
+    return dict(row) if row else None
+
+
+def legacy_get_casting_by_script(script_id):
+    conn = _legacy_connection()
+    rows = conn.execute("""
+        SELECT sc.*, a.name, a.tmdb_id, a.country, a.popularity, a.profile_path
+        FROM script_casting sc
+        JOIN actors a ON sc.actor_id = a.id
+        WHERE sc.script_id = ?
+        ORDER BY sc.match_score DESC
+    """, (script_id,)).fetchall()
+    conn.close()
+    return [dict(r) for r in rows]
+
+
+def _ops_per_sec(fn, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed if elapsed else float("inf")
+
+
+def run_benchmark(iterations: int = 2000):
+    results = {}
+    content = "INT. KITCHEN - DAY\nA coffee machine hums.\n" * 50
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_util.DB_PATH = os.path.join(tmp, "bench.db")
+        db_util.close_pool()
+        db_util.init_database()
+
+        seed_id = db_util.create_script("Seed", "Drama", content)
+        actor_id = db_util.create_actor(1, "Seed Actor")
+        for i in range(5):
+            db_util.create_script_casting(seed_id, actor_id, f"Role {i}", i / 10)
+
+        cases = {
+            "create_script": (
+                lambda i: legacy_create_script(f"S{i}", "Drama", content),
+                lambda i: db_util.create_script(f"S{i}", "Drama", content),
+            ),
+            "get_script": (
+                lambda i: legacy_get_script(seed_id),
+                lambda i: db_util.get_script(seed_id),
+            ),
+            "get_casting_by_script": (
+                lambda i: legacy_get_casting_by_script(seed_id),
+                lambda i: db_util.get_casting_by_script(seed_id),
+            ),
+        }
+
+        for name, (before, after) in cases.items():
+            before_ops = _ops_per_sec(before, iterations)
+            after_ops = _ops_per_sec(after, iterations)
+            results[name] = {
+                "before_ops_per_sec": round(before_ops, 1),
+                "after_ops_per_sec": round(after_ops, 1),
+                "speedup": round(after_ops / before_ops, 2),
+            }
+
+        results["pool_stats"] = db_util.get_pool_stats()
+        db_util.close_pool()
+
+    return results
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    results = run_benchmark(iterations)
+
+    print("=" * 80)
+    print(f"SQLite connection pool benchmark ({iterations} ops per case)")
+    print("=" * 80)
+    for name, r in results.items():
+        if name == "pool_stats":
+            continue
+        print(f"{name:<24} before: {r['before_ops_per_sec']:>10,.1f} ops/s   "
+              f"after: {r['after_ops_per_sec']:>10,.1f} ops/s   x{r['speedup']}")
+    print(f"Pool: {results['pool_stats']}")
+
+    os.makedirs("test-results", exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output = os.path.join("test-results", f"bench_db_pool_{timestamp}.json")
+    with open(output, "w") as f:
+        json.dump({"iterations": iterations, "results": results}, f, indent=2)
+    print(f"\n📊 Results saved to: {output}")
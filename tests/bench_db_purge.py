@@ -0,0 +1,99 @@
+"""
+Benchmark: purging scripts with their placements, castings and forecasts
+Compares the original per-script delete (four DELETEs and a commit on a
+new connection per script) with delete_scripts() and ON DELETE CASCADE.
+
+Usage: python tests/bench_db_purge.py [num_scripts]
+"""
+
+import os
+import sys
+import json
+import tempfile
+import time
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import db_util
+
+
+def legacy_delete_script(script_id):
+    conn = db_util.get_connection()
+    cursor = conn.cursor()
+    cursor.execute("BEGIN")
+    cursor.execute("DELETE FROM product_placements WHERE script_id = ?", (script_id,))
+    cursor.execute("DELETE FROM script_casting WHERE script_id = ?", (script_id,))
+    cursor.execute("DELETE FROM revenue_forecasts WHERE script_id = ?", (script_id,))
+    cursor.execute("DELETE FROM scripts WHERE id = ?", (script_id,))
+    conn.commit()
+    conn.close()
+
+
+def seed(num_scripts):
+    """Create scripts with 3 placements, 2 castings and 1 forecast each"""
+    actor_ids = db_util.bulk_create_actors([{"tmdb_id": i, "name": f"Actor {i}"} for i in range(50)])
+    script_ids = []
+    with db_util.transaction():
+        for i in range(num_scripts):
+            sid = db_util.create_script(f"Script {i}", "Drama", "INT. ROOM - DAY\n" * 20)
+            script_ids.append(sid)
+            db_util.bulk_create_product_placements(
+                [{"script_id": sid, "product_name": f"P{j}", "brand": "Acme"} for j in range(3)])
+            db_util.bulk_create_script_castings(
+                [{"script_id": sid, "actor_id": actor_ids[(i + j) % 50], "role_name": "Role"} for j in range(2)])
+            db_util.create_revenue_forecast(sid, "Drama", "Food", 1000.0, 1.2)
+    return script_ids
+
+
+def run_benchmark(num_scripts: int = 10000):
+    results = {"num_scripts": num_scripts}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("before", "after"):
+            db_util.DB_PATH = os.path.join(tmp, f"purge_{mode}.db")
+            db_util.close_pool()
+            db_util.init_database()
+            script_ids = seed(num_scripts)
+
+            start = time.perf_counter()
+            if mode == "before":
+                for sid in script_ids:
+                    legacy_delete_script(sid)
+            else:
+                db_util.delete_scripts(script_ids)
+            elapsed = time.perf_counter() - start
+
+            db_util.rebuild_stats()
+            remaining = db_util.get_database_stats()
+            results[mode] = {
+                "seconds": round(elapsed, 3),
+                "scripts_per_sec": round(num_scripts / elapsed, 1),
+                "remaining": remaining,
+            }
+            db_util.close_pool()
+
+    results["speedup"] = round(results["before"]["seconds"] / results["after"]["seconds"], 1)
+    return results
+
+
+if __name__ == "__main__":
+    num_scripts = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    results = run_benchmark(num_scripts)
+
+    print("=" * 80)
+    print(f"Purge benchmark: {num_scripts} scripts (+3 placements, 2 castings, 1 forecast each)")
+    print("=" * 80)
+    for mode in ("before", "after"):
+        r = results[mode]
+        print(f"{mode:<7} {r['seconds']:>8.3f} s   {r['scripts_per_sec']:>10,.1f} scripts/s   "
+              f"remaining: {r['remaining']}")
+    print(f"Speedup: x{results['speedup']}")
+
+    os.makedirs("test-results", exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output = os.path.join("test-results", f"bench_db_purge_{timestamp}.json")
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📊 Results saved to: {output}")
@@ -0,0 +1,144 @@
+"""
+Benchmark: end-to-end LLM pipeline throughput, offline
+Runs the analysis, comparison and casting flows against the deterministic
+'local' provider (utils/local_llm.py), so pipeline overhead, concurrency and
+streaming latency can be measured without API keys, network or quota.
+The response cache is bypassed so every call pays the simulated latency.
+
+Usage: python tests/bench_llm_pipeline.py [iterations] [workers] [latency_s] [tokens_per_sec]
+"""
+
+import os
+import sys
+import json
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.langchain_util import (
+    analyze_script,
+    analyze_script_chunked,
+    analyze_script_stream,
+    compare_scripts,
+    compare_scripts_json,
+    get_llm_client_stats,
+)
+from utils.ai_casting_util import generate_recommendations, score_actor_for_script, score_actors_for_script
+from utils.rate_limit import get_rate_limit_stats
+
+PROMPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prompts")
+NO_TOOLS = {"tmdb": False, "omdb": False, "tavily": False}
+
+
+def _screenplay(rng, scenes):
+    parts = ["FADE IN:\n\n"]
+    for i in range(scenes):
+        heading = f"{rng.choice(['INT.', 'EXT.'])} LOCATION {i} - {rng.choice(['DAY', 'NIGHT'])}\n\n"
+        beats = "".join(
+            f"{rng.choice(['MAYA', 'JONAH', 'DR. REYES'])}\nLine {j} of scene {i}.\n\nShe crosses to the window.\n\n"
+            for j in range(rng.randint(5, 25))
+        )
+        parts.append(heading + beats)
+    return "".join(parts)
+
+
+def _read_prompt(name):
+    with open(os.path.join(PROMPTS_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _run(fn, iterations, workers):
+    """Run fn(i) `iterations` times on `workers` threads; return throughput and latency percentiles."""
+    latencies = []
+
+    def timed(i):
+        start = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(timed, range(iterations)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "runs_per_sec": round(iterations / elapsed, 2),
+        "p50_s": round(statistics.median(latencies), 3),
+        "p95_s": round(latencies[int(0.95 * (len(latencies) - 1))], 3),
+    }
+
+
+def run_benchmark(iterations=20, workers=4, latency_s=0.05, tokens_per_sec=2000.0):
+    rng = random.Random(7)
+    model = {"provider": "local", "model": "local-bench", "latency_s": latency_s, "tokens_per_sec": tokens_per_sec}
+    analysis_template = _read_prompt("standardized_analysis_template.md")
+    comparison_template = _read_prompt("script_comparison_template.md")
+    comparison_json_template = _read_prompt("script_comparison_json_template.md")
+    short_script = _screenplay(rng, 12)
+    long_script = _screenplay(rng, 150)
+    modified_script = short_script.replace("She crosses to the window.", "She sips a Nespresso by the window.")
+
+    def stream_analysis(i):
+        metrics = {}
+        for _ in analyze_script_stream(f"Bench {i}", short_script, model, 0.5, 2000, analysis_template,
+                                       use_cache=False, metrics=metrics):
+            pass
+        ttfts.append(metrics["ttft_s"])
+
+    ttfts = []
+    cases = {
+        "analyze_script": lambda i: analyze_script(
+            f"Bench {i}", short_script, model, 0.5, 2000, analysis_template, use_cache=False),
+        "analyze_script_stream": stream_analysis,
+        "analyze_script_chunked": lambda i: analyze_script_chunked(
+            f"Bench {i}", long_script, model, 0.5, 2000, analysis_template, use_cache=False),
+        "compare_scripts": lambda i: compare_scripts(
+            short_script, modified_script, comparison_template, model="local-bench", provider="local", use_cache=False),
+        "compare_scripts_json": lambda i: compare_scripts_json(
+            short_script, modified_script, comparison_json_template, provider="local", model="local-bench", use_cache=False),
+        "score_actor_for_script": lambda i: score_actor_for_script(
+            f"Actor {i}", short_script, model, use_cache=False),
+        "score_actors_for_script": lambda i: score_actors_for_script(
+            [f"Actor {i}-{n}" for n in range(6)], short_script, model, use_cache=False),
+        "generate_recommendations": lambda i: generate_recommendations(
+            short_script, model, enabled_tools=NO_TOOLS, use_cache=False),
+    }
+
+    results = {name: _run(fn, iterations, workers) for name, fn in cases.items()}
+    results["analyze_script_stream"]["ttft_p50_s"] = round(statistics.median(ttfts), 3)
+    return {
+        "results": results,
+        "llm_clients": get_llm_client_stats(),
+        "rate_limit": get_rate_limit_stats().get("local", {}),
+    }
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    latency_s = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+    tokens_per_sec = float(sys.argv[4]) if len(sys.argv) > 4 else 2000.0
+    report = run_benchmark(iterations, workers, latency_s, tokens_per_sec)
+
+    print("=" * 80)
+    print(f"Offline LLM pipeline benchmark ({iterations} runs x {workers} workers, "
+          f"latency {latency_s}s, {tokens_per_sec:g} tok/s)")
+    print("=" * 80)
+    for name, r in report["results"].items():
+        extra = f"   ttft p50: {r['ttft_p50_s']}s" if "ttft_p50_s" in r else ""
+        print(f"{name:<26} {r['runs_per_sec']:>8,.2f} runs/s   p50: {r['p50_s']}s   p95: {r['p95_s']}s{extra}")
+    print(f"LLM clients: {report['llm_clients']}")
+    print(f"Rate limiter: {report['rate_limit']}")
+
+    os.makedirs("test-results", exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output = os.path.join("test-results", f"bench_llm_pipeline_{timestamp}.json")
+    with open(output, "w") as f:
+        json.dump({"iterations": iterations, "workers": workers, "latency_s": latency_s,
+                   "tokens_per_sec": tokens_per_sec, **report}, f, indent=2)
+    print(f"\n📊 Results saved to: {output}")
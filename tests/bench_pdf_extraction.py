@@ -0,0 +1,98 @@
+"""
+Benchmark: sequential vs. page-parallel PDF text extraction
+Extracts the first N pages of a screenplay PDF with 1..K worker processes and
+reports wall time per page count and worker count. With method 'ocr' it also
+reports pages/sec and peak RSS of the streaming OCR pipeline; with 'hybrid' it also
+reports how many pages needed OCR.
+
+Usage: python tests/bench_pdf_extraction.py <script.pdf> [max_workers] [repeats] [pypdf2|ocr|hybrid]
+"""
+
+import os
+import sys
+import json
+import tempfile
+import time
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import PyPDF2
+
+from utils.pdf_script_extractor import PDFScriptExtractor
+
+
+def _truncated_copy(pdf_path, pages, directory):
+    """Write the first `pages` pages of pdf_path to a new file"""
+    reader = PyPDF2.PdfReader(pdf_path)
+    writer = PyPDF2.PdfWriter()
+    for page in reader.pages[:pages]:
+        writer.add_page(page)
+    output = os.path.join(directory, f"first_{pages}.pdf")
+    with open(output, "wb") as f:
+        writer.write(f)
+    return output
+
+
+def run_benchmark(pdf_path, max_workers=8, repeats=3, method="pypdf2"):
+    total_pages = len(PyPDF2.PdfReader(pdf_path).pages)
+    page_counts = sorted({n for n in (10, 25, 50, 100, total_pages) if n <= total_pages})
+    worker_counts = [w for w in (1, 2, 4, 8, 16) if w <= max_workers]
+    extractor = PDFScriptExtractor(max_workers=max_workers, ocr_workers=max_workers)
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in page_counts:
+            path = pdf_path if pages == total_pages else _truncated_copy(pdf_path, pages, tmp)
+            baseline = None
+            for workers in worker_counts:
+                timings = []
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    result = extractor.extract_text(path, method=method, workers=workers)
+                    timings.append(time.perf_counter() - start)
+                best = min(timings)
+                baseline = baseline or best
+                page_times = result["metadata"].get("page_timings", [])
+                results.append({
+                    "pages": pages,
+                    "workers": workers,
+                    "wall_s": round(best, 3),
+                    "speedup": round(baseline / best, 2),
+                    "slowest_page_s": round(max(page_times), 4) if page_times else None,
+                    "chars": result["metadata"].get("char_count", 0),
+                    "pages_per_sec": round(pages / best, 2),
+                    "peak_rss_mb": result["metadata"].get("peak_rss_mb"),
+                    "peak_worker_rss_mb": result["metadata"].get("peak_worker_rss_mb"),
+                    "ocr_pages": len(result["metadata"].get("ocr_pages", [])),
+                })
+    return {"pdf": os.path.basename(pdf_path), "method": method, "total_pages": total_pages,
+            "cpus": os.cpu_count(), "results": results}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    pdf_path = sys.argv[1]
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else min(8, os.cpu_count() or 1)
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    method = sys.argv[4] if len(sys.argv) > 4 else "pypdf2"
+    report = run_benchmark(pdf_path, max_workers, repeats, method)
+
+    print("=" * 80)
+    print(f"PDF extraction benchmark ({report['method']}): {report['pdf']} "
+          f"({report['total_pages']} pages, {report['cpus']} CPUs)")
+    print("=" * 80)
+    for r in report["results"]:
+        rss = f"  peak RSS: {r['peak_rss_mb']} MB (worker {r['peak_worker_rss_mb']} MB)" if r["peak_rss_mb"] else ""
+        print(f"{r['pages']:>5} pages  {r['workers']:>2} workers  {r['wall_s']:>8.3f}s  x{r['speedup']:<5}  "
+              f"{r['pages_per_sec']:>7.1f} pages/s  slowest page: {r['slowest_page_s']}s{rss}")
+
+    os.makedirs("test-results", exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output = os.path.join("test-results", f"bench_pdf_extraction_{method}_{timestamp}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📊 Results saved to: {output}")
@@ -0,0 +1,112 @@
+"""
+Benchmark: screenplay content compression at rest
+Stores the same synthetic screenplay corpus with each storage format and
+reports database size and get_script() read latency.
+
+Usage: python tests/bench_script_compression.py [num_scripts]
+"""
+
+import os
+import sys
+import json
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import db_util
+
+LOCATIONS = ["KITCHEN", "OFFICE", "DINER", "HIGHWAY", "ROOFTOP", "PRECINCT", "BEACH", "GARAGE"]
+CHARACTERS = ["SARAH", "MIKE", "DETECTIVE HALE", "JUNO", "MR. BLACK", "ELENA", "TOMMY"]
+WORDS = ("the a coffee phone car door night rain gun money look back away slowly never "
+         "always want know think tell listen wait run stop here there now then").split()
+
+
+def make_screenplay(rng: random.Random, scenes: int = 60) -> str:
+    """Generate a screenplay-shaped text of roughly 30-40 KB"""
+    lines = []
+    for _ in range(scenes):
+        lines.append(f"{rng.choice(['INT.', 'EXT.'])} {rng.choice(LOCATIONS)} - {rng.choice(['DAY', 'NIGHT'])}")
+        lines.append("")
+        lines.append(" ".join(rng.choice(WORDS) for _ in range(rng.randint(15, 40))).capitalize() + ".")
+        for _ in range(rng.randint(3, 6)):
+            lines.append("")
+            lines.append(f"                    {rng.choice(CHARACTERS)}")
+            lines.append("          " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 20))).capitalize() + ".")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _db_size(path: str) -> int:
+    with db_util.pooled_connection() as conn:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return os.path.getsize(path)
+
+
+def run_benchmark(num_scripts: int = 2000, reads: int = 1000):
+    rng = random.Random(42)
+    corpus = [make_screenplay(rng) for _ in range(num_scripts)]
+    raw_bytes = sum(len(c.encode("utf-8")) for c in corpus)
+
+    formats = ["none", "zlib"] + (["zstd"] if db_util.ZSTD_AVAILABLE else [])
+    results = {"num_scripts": num_scripts, "raw_content_mb": round(raw_bytes / 1e6, 2), "formats": {}}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for compression in formats:
+            db_util.DB_PATH = os.path.join(tmp, f"bench_{compression}.db")
+            db_util.close_pool()
+            db_util.init_database()
+
+            start = time.perf_counter()
+            with db_util.transaction():
+                ids = [db_util.create_script(f"Script {i}", "Drama", text, compression=compression)
+                       for i, text in enumerate(corpus)]
+            write_s = time.perf_counter() - start
+
+            size = _db_size(db_util.DB_PATH)
+
+            sample = [rng.choice(ids) for _ in range(reads)]
+            latencies = []
+            for script_id in sample:
+                t0 = time.perf_counter()
+                db_util.get_script(script_id)
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+            results["formats"][compression] = {
+                "db_size_mb": round(size / 1e6, 2),
+                "ratio_vs_none": None,
+                "write_s": round(write_s, 2),
+                "read_ms_p50": round(statistics.median(latencies), 3),
+                "read_ms_p95": round(sorted(latencies)[int(len(latencies) * 0.95)], 3),
+            }
+            db_util.close_pool()
+
+    base = results["formats"]["none"]["db_size_mb"]
+    for r in results["formats"].values():
+        r["ratio_vs_none"] = round(base / r["db_size_mb"], 2)
+    return results
+
+
+if __name__ == "__main__":
+    num_scripts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    results = run_benchmark(num_scripts)
+
+    print("=" * 80)
+    print(f"Script compression benchmark: {num_scripts} scripts, "
+          f"{results['raw_content_mb']} MB raw content")
+    print("=" * 80)
+    for name, r in results["formats"].items():
+        print(f"{name:<6} size: {r['db_size_mb']:>8.2f} MB (x{r['ratio_vs_none']})   "
+              f"write: {r['write_s']:>6.2f} s   read p50: {r['read_ms_p50']:.3f} ms   "
+              f"p95: {r['read_ms_p95']:.3f} ms")
+
+    os.makedirs("test-results", exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output = os.path.join("test-results", f"bench_script_compression_{timestamp}.json")
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📊 Results saved to: {output}")
@@ -0,0 +1,121 @@
+"""
+Test Batch Actor Scoring
+Checks score_actors_for_script() ranking, prefix sharing and multi-actor parsing offline
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("langchain_core")
+pytest.importorskip("langgraph")
+pytest.importorskip("tmdbv3api")
+pytest.importorskip("tavily")
+
+from utils import ai_casting_util, token_budget
+
+LOCAL = {"provider": "local", "model": "local-test", "latency_s": 0, "tokens_per_sec": 0}
+SCRIPT = "".join(f"INT. ROOM {i} - DAY\n\nMAYA\nLine {i}.\n\n" for i in range(30))
+
+
+@pytest.fixture
+def prompts(monkeypatch):
+    """Record prompts and answer with a score derived from the actor name"""
+    seen = []
+    lock = threading.Lock()
+
+    def fake_invoke(llm, prompt, selected_model, temperature, max_tokens, use_cache=True):
+        with lock:
+            seen.append(prompt)
+        actor = prompt.rsplit("Actor: ", 1)[-1].split("\n", 1)[0]
+        if actor == "Broken":
+            raise RuntimeError("provider error")
+        return f"- fits the role\nScore: {len(actor) * 10}/100"
+
+    monkeypatch.setattr(ai_casting_util, "create_llm", lambda *args, **kwargs: object())
+    monkeypatch.setattr(ai_casting_util, "invoke_llm", fake_invoke)
+    return seen
+
+
+def test_actors_are_ranked_with_latency(prompts):
+    """Rows come back best first; failures are reported, not raised"""
+    rows = ai_casting_util.score_actors_for_script(["Ann", "Broken", "Cassandra", "Bo", "Ann"], SCRIPT, LOCAL)
+    assert [r["actor"] for r in rows] == ["Cassandra", "Ann", "Bo", "Broken"]
+    assert [r["rank"] for r in rows] == [1, 2, 3, 4]
+    assert rows[0]["score"] == 90 and rows[-1]["score"] is None
+    assert rows[-1]["error"] == "provider error"
+    assert all(r["latency_s"] >= 0 for r in rows)
+
+
+def test_every_call_shares_the_script_prefix(prompts):
+    """Only the trailing actor section differs between calls"""
+    ai_casting_util.score_actors_for_script(["Ann", "Bo", "Cassandra"], SCRIPT, LOCAL)
+    prefixes = {p.rsplit("Actor: ", 1)[0] for p in prompts}
+    assert len(prompts) == 3 and len(prefixes) == 1
+    assert prefixes.pop().rstrip().endswith("Line 29.")
+
+
+def test_single_prompt_mode_splits_sections(monkeypatch):
+    """One multi-actor call is parsed back into per-actor rows; an actor left out gets their own call"""
+    calls = []
+
+    def fake_invoke(llm, prompt, selected_model, temperature, max_tokens, use_cache=True):
+        calls.append(max_tokens)
+        if "Actor: " in prompt:
+            return "- solid\nScore: 60/100"
+        return "### 1. Ann\n- ok\nScore: 40/100\n\n### **Bo**:\n- great\nScore: 85/100\n"
+
+    monkeypatch.setattr(ai_casting_util, "create_llm", lambda *args, **kwargs: object())
+    monkeypatch.setattr(ai_casting_util, "invoke_llm", fake_invoke)
+    rows = ai_casting_util.score_actors_for_script(["Ann", "Bo", "Cy"], SCRIPT, LOCAL, max_tokens=500, single_prompt=True)
+    assert calls == [1500, 500]
+    assert [(r["actor"], r["score"]) for r in rows] == [("Bo", 85), ("Cy", 60), ("Ann", 40)]
+    assert all(r["error"] is None for r in rows)
+
+
+def test_single_prompt_mode_matches_whole_names_only(monkeypatch):
+    """A heading for a longer name is not taken as another actor's section"""
+    scored_alone = []
+
+    def fake_invoke(llm, prompt, selected_model, temperature, max_tokens, use_cache=True):
+        if "Actor: " in prompt:
+            scored_alone.append(prompt.rsplit("Actor: ", 1)[-1].split("\n", 1)[0])
+            return "Score: 55/100"
+        return "### Chris Evans-Smith\nScore: 90/100\n\n### - Ann Lee\nScore: 70/100\n"
+
+    monkeypatch.setattr(ai_casting_util, "create_llm", lambda *args, **kwargs: object())
+    monkeypatch.setattr(ai_casting_util, "invoke_llm", fake_invoke)
+    rows = ai_casting_util.score_actors_for_script(["Chris Evans", "Ann Lee"], SCRIPT, LOCAL, single_prompt=True)
+    assert scored_alone == ["Chris Evans"]
+    assert {r["actor"]: r["score"] for r in rows} == {"Chris Evans": 55, "Ann Lee": 70}
+
+
+def test_single_prompt_mode_batches_to_the_output_limit(monkeypatch):
+    """A cast whose per-actor budget exceeds the model's output limit is split into batches that fit"""
+    calls = []
+    lock = threading.Lock()
+
+    def fake_invoke(llm, prompt, selected_model, temperature, max_tokens, use_cache=True):
+        cast = [line[2:] for line in prompt.rsplit("Actors:\n", 1)[-1].split("\n\n", 1)[0].splitlines()]
+        with lock:
+            calls.append((max_tokens, cast, prompt.rsplit("Actors:\n", 1)[0]))
+        return "".join(f"### {name}\nScore: {10 * len(name)}/100\n\n" for name in cast)
+
+    monkeypatch.setattr(ai_casting_util, "create_llm", lambda *args, **kwargs: object())
+    monkeypatch.setattr(ai_casting_util, "invoke_llm", fake_invoke)
+    monkeypatch.setitem(token_budget.OUTPUT_TOKEN_LIMITS, "local-test", 1000)
+    names = ["Ann", "Bo", "Cy", "Dee", "Eve"]
+    rows = ai_casting_util.score_actors_for_script(names, SCRIPT, LOCAL, max_tokens=400, single_prompt=True)
+    assert sorted(cast for _, cast, _ in calls) == [["Ann", "Bo"], ["Cy", "Dee"], ["Eve"]]
+    assert {tokens for tokens, _, _ in calls} == {800}
+    assert len({prefix for _, _, prefix in calls}) == 1
+    assert all(r["error"] is None for r in rows) and len(rows) == 5
+
+    calls.clear()
+    ai_casting_util.score_actors_for_script(["Ann"], SCRIPT, LOCAL, max_tokens=5000, single_prompt=True)
+    assert calls[0][0] == 1000
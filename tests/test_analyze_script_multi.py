@@ -0,0 +1,92 @@
+"""
+Test Multi-Model Fan-Out
+Checks analyze_script_multi() timeouts, per-provider concurrency and completion ordering
+using LocalChatModel instances with controlled delays
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("langchain_core")
+
+from utils import langchain_util
+from utils.langchain_util import analyze_script_multi
+from utils.local_llm import LocalChatModel
+
+SCRIPT = "INT. CAFE - DAY\n\nMAYA\nOne coffee, please.\n"
+TEMPLATE = "# Analysis of {SCRIPT_TITLE}\n\n## Summary\n"
+
+
+@pytest.fixture
+def in_flight(monkeypatch):
+    """Serve every provider with LocalChatModel and record peak concurrent calls per provider"""
+    lock = threading.Lock()
+    current, peak = {}, {}
+    generate = LocalChatModel._generate
+
+    def counted_generate(self, messages, *args, **kwargs):
+        provider = self.model.split(":")[0]
+        with lock:
+            current[provider] = current.get(provider, 0) + 1
+            peak[provider] = max(peak.get(provider, 0), current[provider])
+        try:
+            return generate(self, messages, *args, **kwargs)
+        finally:
+            with lock:
+                current[provider] -= 1
+
+    def local_llm_for(selected_model, temperature=0.5, max_tokens=2000, **kwargs):
+        return LocalChatModel(model=f"{selected_model['provider']}:{selected_model['model']}",
+                              max_tokens=max_tokens, latency_s=selected_model["latency_s"], tokens_per_sec=0)
+
+    monkeypatch.setattr(LocalChatModel, "_generate", counted_generate)
+    monkeypatch.setattr(langchain_util, "create_llm", local_llm_for)
+    return peak
+
+
+def _collect(models, **kwargs):
+    async def main():
+        return [r async for r in analyze_script_multi("Cafe", SCRIPT, models, 0.5, 300, TEMPLATE, use_cache=False, **kwargs)]
+    start = time.perf_counter()
+    results = asyncio.run(main())
+    return results, time.perf_counter() - start
+
+
+def test_concurrency_is_capped_per_provider(in_flight):
+    """No provider ever has more calls in flight than its limit, while providers overlap"""
+    models = ([{"provider": "local", "model": f"l{i}", "latency_s": 0.1} for i in range(6)]
+              + [{"provider": "xai", "model": f"x{i}", "latency_s": 0.1} for i in range(3)])
+    results, elapsed = _collect(models, provider_limits={"local": 2, "xai": 1})
+    assert all(r["success"] for r in results) and len(results) == 9
+    assert in_flight == {"local": 2, "xai": 1}
+    # local needs 3 rounds, xai 3 rounds; they run side by side rather than one after another
+    assert elapsed < 0.55
+
+
+def test_results_arrive_in_completion_order(in_flight):
+    """Faster models are yielded first, regardless of their position in the input"""
+    models = [{"provider": "local", "model": name, "latency_s": delay}
+              for name, delay in (("slow", 0.3), ("fast", 0.05), ("medium", 0.15))]
+    results, _ = _collect(models)
+    assert [r["selected_model"]["model"] for r in results] == ["fast", "medium", "slow"]
+    assert results[0]["elapsed_s"] < results[1]["elapsed_s"] < results[2]["elapsed_s"]
+
+
+def test_slow_models_time_out_without_holding_up_the_rest(in_flight):
+    """A model slower than the timeout fails with a timeout error; the others still succeed"""
+    models = [{"provider": "local", "model": "stuck", "latency_s": 1.0},
+              {"provider": "local", "model": "quick", "latency_s": 0.05}]
+    results, elapsed = _collect(models, timeout=0.3)
+    by_model = {r["selected_model"]["model"]: r for r in results}
+    assert by_model["quick"]["success"]
+    assert not by_model["stuck"]["success"] and "Timed out" in by_model["stuck"]["error"]
+    assert [r["selected_model"]["model"] for r in results] == ["quick", "stuck"]
+    assert elapsed < 0.9
@@ -0,0 +1,174 @@
+"""
+Test Async Database Utilities
+Exercises utils/async_db_util.py against a temporary SQLite database
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import time
+
+import pytest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import db_util
+from utils.async_db_util import AsyncDatabase
+
+
+@pytest.fixture
+def adb(tmp_path, monkeypatch):
+    """AsyncDatabase over a fresh database file"""
+    monkeypatch.setattr(db_util, "DB_PATH", str(tmp_path / "test.db"))
+    db_util.close_pool()
+    assert db_util.init_database()
+    facade = AsyncDatabase(readers=4)
+    yield facade
+    facade.close()
+    db_util.close_pool()
+
+
+def test_concurrent_writes_are_group_committed(adb):
+    """Concurrent creates all succeed and share fewer commits than writes"""
+    async def main():
+        return await asyncio.gather(*(
+            adb.create_script(f"Script {i}", "Drama", "INT. ROOM - DAY") for i in range(200)
+        ))
+
+    ids = asyncio.run(main())
+    assert len(set(ids)) == 200
+    assert adb.stats["writes"] == 200
+    assert adb.stats["commits"] < 200
+    assert db_util.get_database_stats()["scripts"] == 200
+
+
+def test_reads_see_committed_writes(adb):
+    """A write's awaitable resolves only after its batch is visible to readers"""
+    async def main():
+        script_id = await adb.create_script("Title", "Comedy", "EXT. PARK - DAY")
+        script, placements = await asyncio.gather(
+            adb.get_script(script_id),
+            adb.get_placements_by_script(script_id),
+        )
+        return script, placements
+
+    script, placements = asyncio.run(main())
+    assert script["title"] == "Title"
+    assert placements == []
+
+
+def test_failed_write_does_not_abort_its_batch(adb):
+    """An exception in one queued write rolls back only that write"""
+    def boom():
+        with db_util.pooled_connection() as conn:
+            conn.execute("INSERT INTO scripts (title, genre, content) VALUES ('Lost', 'X', 'x')")
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(
+            adb.create_script("Kept 1", "Drama", "x"),
+            adb.run_write(boom),
+            adb.create_script("Kept 2", "Drama", "x"),
+            return_exceptions=True,
+        )
+
+    first, error, second = asyncio.run(main())
+    assert isinstance(error, ValueError)
+    titles = {s["title"] for s in db_util.get_all_scripts(include_content=False)}
+    assert titles == {"Kept 1", "Kept 2"}
+    assert adb.stats["failed_writes"] == 1
+
+
+def test_swallowed_helper_errors_fail_their_future(adb):
+    """db_util helpers that return None/False/[] on error are counted as failed, not committed"""
+    async def main():
+        return await asyncio.gather(
+            adb.create_script("Kept", "Drama", "x"),
+            adb.create_product_placement(999999, "Phone", "Acme"),
+            adb.bulk_create_actors([{"name": "No TMDb id"}]),
+            adb.bulk_create_actors([]),
+            adb.delete_scripts([424242]),
+            return_exceptions=True,
+        )
+
+    kept, placement, actors, no_actors, deleted = asyncio.run(main())
+    assert isinstance(kept, int)
+    assert isinstance(placement, sqlite3.IntegrityError)
+    assert isinstance(actors, RuntimeError)
+    assert no_actors == [] and deleted == 0
+    assert adb.stats["writes"] == 3 and adb.stats["failed_writes"] == 2
+
+
+def test_locked_database_fails_the_whole_batch(adb, monkeypatch):
+    """If the batch transaction cannot start, every awaiter gets the error instead of hanging"""
+    monkeypatch.setitem(db_util.DB_PRAGMAS, "busy_timeout", 50)
+    db_util.close_pool()
+    blocker = db_util.get_connection()
+    blocker.execute("BEGIN IMMEDIATE")
+
+    async def main():
+        return await asyncio.wait_for(asyncio.gather(
+            adb.create_script("Locked 1", "Drama", "x"),
+            adb.create_script("Locked 2", "Drama", "x"),
+            return_exceptions=True,
+        ), timeout=5)
+
+    try:
+        results = asyncio.run(main())
+    finally:
+        blocker.rollback()
+        blocker.close()
+    assert all(isinstance(r, Exception) and "locked" in str(r) for r in results)
+    assert adb.stats["failed_writes"] == 2
+    assert asyncio.run(adb.create_script("Unlocked", "Drama", "x"))
+
+
+def test_init_database_runs_outside_batch_transactions(adb, tmp_path, monkeypatch):
+    """Migrations run alone on the writer thread, so each one controls its own transaction"""
+    monkeypatch.setattr(db_util, "DB_PATH", str(tmp_path / "fresh.db"))
+    db_util.close_pool()
+    states = []
+    apply_migration = db_util._apply_migration
+
+    def spy(conn, *args):
+        states.append(conn.in_transaction)
+        return apply_migration(conn, *args)
+
+    monkeypatch.setattr(db_util, "_apply_migration", spy)
+
+    async def main():
+        return await asyncio.gather(adb.init_database(), adb.create_script("After", "Drama", "x"))
+
+    ok, script_id = asyncio.run(main())
+    assert ok and script_id
+    assert states and not any(states)
+    assert db_util.get_schema_version() == db_util._load_migrations(db_util.MIGRATIONS_DIR)[-1][0]
+
+
+def test_reads_overlap_with_other_work(adb):
+    """Blocking reads run on the reader pool instead of the event loop"""
+    def slow_read():
+        time.sleep(0.2)
+        return db_util.get_database_stats()
+
+    async def main():
+        start = time.perf_counter()
+        await asyncio.gather(*(adb.run_read(slow_read) for _ in range(4)))
+        return time.perf_counter() - start
+
+    assert asyncio.run(main()) < 0.6
+
+
+def test_close_flushes_pending_writes(adb):
+    """close() commits writes queued before it was called"""
+    async def main():
+        tasks = [asyncio.ensure_future(adb.create_script(f"S{i}", "Drama", "x")) for i in range(20)]
+        await asyncio.sleep(0)
+        adb.close()
+        return await asyncio.gather(*tasks)
+
+    assert len(asyncio.run(main())) == 20
+    with pytest.raises(RuntimeError):
+        asyncio.run(adb.get_script(1))
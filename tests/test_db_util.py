@@ -0,0 +1,749 @@
+"""
+Test Database Utilities
+Exercises utils/db_util.py against a temporary SQLite database
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import db_util
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Point db_util at a fresh database file and initialize the schema"""
+    monkeypatch.setattr(db_util, "DB_PATH", str(tmp_path / "test.db"))
+    db_util.close_pool()
+    assert db_util.init_database()
+    yield db_util
+    db_util.close_pool()
+
+
+def test_pragmas_applied_once_per_connection(db):
+    """Pooled connections are configured with WAL and busy_timeout"""
+    with db.pooled_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+
+def test_connections_are_reused(db):
+    """Sequential CRUD calls reuse a single pooled connection"""
+    script_id = db.create_script("Title", "Drama", "INT. ROOM - DAY")
+    for _ in range(20):
+        assert db.get_script(script_id)["title"] == "Title"
+    stats = db.get_pool_stats()
+    assert stats["opened"] == 1
+    assert stats["reused"] >= 20
+
+
+def test_transaction_commits_and_rolls_back(db):
+    """transaction() commits on success and rolls back on error"""
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO scripts (title, genre, content) VALUES ('A', 'Drama', 'x')")
+
+    with pytest.raises(RuntimeError):
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO scripts (title, genre, content) VALUES ('B', 'Drama', 'x')")
+            raise RuntimeError("boom")
+
+    titles = [s["title"] for s in db.get_all_scripts()]
+    assert titles == ["A"]
+
+
+def test_nested_transaction_uses_savepoint(db):
+    """A failing nested block only undoes its own work"""
+    with db.transaction():
+        outer_id = db.create_script("Outer", "Drama", "x")
+        with pytest.raises(ValueError):
+            with db.transaction() as conn:
+                conn.execute("INSERT INTO scripts (title, genre, content) VALUES ('Inner', 'Drama', 'x')")
+                raise ValueError("inner failure")
+
+    titles = [s["title"] for s in db.get_all_scripts()]
+    assert titles == ["Outer"]
+    assert db.get_script(outer_id) is not None
+
+
+def test_concurrent_writers(db):
+    """Writes from many threads all land without 'database is locked' errors"""
+    errors = []
+
+    def worker(n):
+        for i in range(25):
+            if db.create_script(f"T{n}-{i}", "Action", "content") is None:
+                errors.append((n, i))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert db.get_database_stats()["scripts"] == 200
+    assert db.get_pool_stats()["opened"] <= 8
+
+
+def test_pool_bounds_checked_out_connections(db):
+    """acquire() blocks once max_size connections are out and times out if none come back"""
+    pool = db_util.ConnectionPool(db.DB_PATH, max_size=2, timeout=0.1)
+    first, second = pool.acquire(), pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    pool.timeout = 5
+    waiter.start()
+    waiter.join(0.2)
+    assert waiter.is_alive() and not got
+    pool.release(first)
+    waiter.join(5)
+    assert got == [first]
+    assert pool.stats["opened"] == 2 and pool.stats["waits"] == 2 and pool.stats["in_use"] == 2
+
+    pool.release(second)
+    pool.release(got[0])
+    assert pool.stats["in_use"] == 0
+    pool.close()
+
+
+def test_crud_roundtrip(db):
+    """Existing CRUD helpers keep their behavior on top of the pool"""
+    script_id = db.create_script("Heist", "Crime", "EXT. BANK - NIGHT")
+    assert db.update_script(script_id, genre="Thriller")
+    assert db.get_scripts_by_genre("Thriller")[0]["id"] == script_id
+
+    actor_id = db.create_actor(101, "Jane Doe", popularity=12.5)
+    assert db.create_actor(101, "Jane Doe", popularity=20.0) == actor_id
+    db.create_script_casting(script_id, actor_id, "Lead", 0.9)
+    db.create_product_placement(script_id, "Phone", "Acme")
+    db.create_revenue_forecast(script_id, "Thriller", "Tech", 1000.0, 2.5)
+
+    assert db.get_casting_by_script(script_id)[0]["name"] == "Jane Doe"
+    assert db.get_actor_by_tmdb_id(101)["popularity"] == 20.0
+    assert len(db.get_placements_by_script(script_id)) == 1
+    assert len(db.get_forecasts_by_script(script_id)) == 1
+
+    assert db.delete_script(script_id)
+    assert db.get_script(script_id) is None
+    assert db.get_placements_by_script(script_id) == []
+
+
+def test_bulk_inserts_return_ids_in_order(db):
+    """bulk_* helpers insert in one transaction and return ids in input order"""
+    script_id = db.create_script("Bulk", "Comedy", "x")
+    db.create_product_placement(script_id, "Existing", "Brand")
+
+    placement_ids = db.bulk_create_product_placements([
+        {"script_id": script_id, "product_name": f"P{i}", "brand": "Acme", "estimated_cost": i}
+        for i in range(50)
+    ])
+    assert len(placement_ids) == 50
+    by_id = {p["id"]: p for p in db.get_placements_by_script(script_id)}
+    assert [by_id[pid]["product_name"] for pid in placement_ids] == [f"P{i}" for i in range(50)]
+
+    forecast_ids = db.bulk_create_revenue_forecasts([
+        {"script_id": script_id, "genre": "Comedy", "product_category": f"C{i}",
+         "estimated_revenue": 100.0 * i, "estimated_roi": 1.5}
+        for i in range(10)
+    ])
+    assert len(set(forecast_ids)) == 10
+
+    assert db.bulk_create_product_placements([]) == []
+
+
+def test_bulk_actors_without_tmdb_id_write_nothing(db):
+    """A missing tmdb_id fails the whole batch before anything is written"""
+    before = db.get_database_stats()["actors"]
+    assert db.bulk_create_actors([
+        {"tmdb_id": 11, "name": "Valid"},
+        {"tmdb_id": None, "name": "Unknown"},
+        {"tmdb_id": 11, "name": "Valid Again"},
+    ]) == []
+    assert db.get_database_stats()["actors"] == before
+    assert db.get_actor_by_tmdb_id(11) is None
+
+
+def test_bulk_actor_upsert_and_castings(db):
+    """bulk_create_actors upserts on tmdb_id and keeps existing ids"""
+    existing_id = db.create_actor(7, "Old Name", popularity=1.0)
+
+    actor_ids = db.bulk_create_actors([
+        {"tmdb_id": 7, "name": "New Name", "popularity": 9.0},
+        {"tmdb_id": 8, "name": "Second"},
+        {"tmdb_id": 9, "name": "Third"},
+        {"tmdb_id": 8, "name": "Second Again"},
+    ])
+    assert actor_ids[0] == existing_id
+    assert actor_ids[1] == actor_ids[3]
+    assert len(set(actor_ids)) == 3
+    assert db.get_actor_by_tmdb_id(7)["name"] == "New Name"
+    assert db.get_actor_by_tmdb_id(8)["name"] == "Second Again"
+
+    script_id = db.create_script("Cast", "Drama", "x")
+    casting_ids = db.bulk_create_script_castings([
+        {"script_id": script_id, "actor_id": aid, "role_name": f"Role {i}", "match_score": i}
+        for i, aid in enumerate(actor_ids[:3])
+    ])
+    assert len(casting_ids) == 3
+    assert [c["role_name"] for c in db.get_casting_by_script(script_id)] == ["Role 2", "Role 1", "Role 0"]
+
+
+def test_bulk_insert_is_atomic(db):
+    """A bad row rolls back the whole batch"""
+    script_id = db.create_script("Atomic", "Drama", "x")
+    ids = db.bulk_create_product_placements([
+        {"script_id": script_id, "product_name": "Ok", "brand": "Acme"},
+        {"script_id": script_id, "product_name": None, "brand": "Acme"},
+    ])
+    assert ids == []
+    assert db.get_placements_by_script(script_id) == []
+
+
+def test_search_scripts_ranks_and_snippets(db):
+    """search_scripts finds scripts by content and ranks title matches first"""
+    db.create_script("Morning Coffee", "Drama", "INT. DINER - DAY\nSARAH orders a coffee.")
+    db.create_script("Night Drive", "Thriller", "EXT. HIGHWAY - NIGHT\nA Tesla speeds past the diner.")
+    db.create_script("Space", "Sci-Fi", "INT. SHIP - NIGHT\nNothing here.")
+
+    results = db.search_scripts("diner")
+    assert {r["title"] for r in results} == {"Morning Coffee", "Night Drive"}
+    assert "content" not in results[0]
+    assert "**" in results[0]["snippet"]
+
+    assert [r["title"] for r in db.search_scripts("coffee")][0] == "Morning Coffee"
+    assert [r["title"] for r in db.search_scripts("tesla")] == ["Night Drive"]
+    assert len(db.search_scripts("diner", limit=1, offset=1)) == 1
+    assert db.search_scripts('"unbalanced (query -') == []
+
+
+def test_search_index_follows_updates_and_deletes(db):
+    """Triggers keep the search index in sync with the scripts table"""
+    script_id = db.create_script("Heist", "Crime", "They rob the casino.")
+    assert db.search_scripts("casino")
+
+    db.update_script(script_id, content="They rob the museum.")
+    assert db.search_scripts("casino") == []
+    assert db.search_scripts("museum")[0]["id"] == script_id
+
+    db.delete_script(script_id)
+    assert db.search_scripts("museum") == []
+
+
+def test_search_index_backfilled_for_existing_rows(db):
+    """Scripts stored before the index existed are indexed when the database is adopted"""
+    db.create_script("Old", "Drama", "A vintage Rolex on the table.")
+    with db.pooled_connection() as conn:
+        conn.executescript("""
+            DROP TRIGGER scripts_fts_insert;
+            DROP TRIGGER scripts_fts_delete;
+            DROP TRIGGER scripts_fts_update;
+            DROP TRIGGER scripts_fts_reindex;
+            DROP TABLE scripts_fts;
+            DROP TABLE schema_version;
+        """)
+    assert db.init_database()
+    assert db.search_scripts("rolex")[0]["title"] == "Old"
+
+
+def test_list_scripts_keyset_pagination(db):
+    """list_scripts pages through every script exactly once, newest first"""
+    with db.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO scripts (title, genre, content, created_at) VALUES (?, ?, ?, ?)",
+            [(f"S{i}", "Drama" if i % 2 else "Comedy", "x" * 1000, f"2025-01-01 00:00:{i % 7:02d}")
+             for i in range(103)]
+        )
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = db.list_scripts(limit=10, after=cursor)
+        assert all("content" not in row for row in page)
+        seen.extend(page)
+        if cursor is None:
+            break
+
+    assert len(seen) == 103
+    assert len({row["id"] for row in seen}) == 103
+    keys = [(row["created_at"], row["id"]) for row in seen]
+    assert keys == sorted(keys, reverse=True)
+
+    dramas = list(db.iter_scripts(page_size=7, genre="Drama"))
+    assert len(dramas) == 51
+    assert all(row["genre"] == "Drama" for row in dramas)
+
+    first = db.list_scripts(limit=1, include_content=True)[0][0]
+    assert first["content"] == "x" * 1000
+    assert db.get_script_content(first["id"]) == "x" * 1000
+    assert db.get_script_content(-1) is None
+
+
+def test_list_scripts_uses_index(db):
+    """Keyset queries are served by the (created_at, id) indexes"""
+    with db.pooled_connection() as conn:
+        plan = " ".join(row["detail"] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM scripts WHERE (created_at, id) < (?, ?) "
+            "ORDER BY created_at DESC, id DESC LIMIT 10", ("2025", 1)))
+        assert "idx_scripts_created" in plan
+        assert "TEMP B-TREE" not in plan
+        plan = " ".join(row["detail"] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM scripts WHERE genre = ? AND (created_at, id) < (?, ?) "
+            "ORDER BY created_at DESC, id DESC LIMIT 10", ("Drama", "2025", 1)))
+        assert "idx_scripts_genre_created" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+def test_compressed_content_roundtrip(db):
+    """Compressed rows decode transparently and stay searchable"""
+    content = "INT. CAFE - DAY\nSARAH sips a Starbucks latte.\n" * 200
+    plain_id = db.create_script("Plain", "Drama", content)
+    packed_id = db.create_script("Packed", "Drama", content, compression="zlib")
+
+    with db.pooled_connection() as conn:
+        rows = {r["id"]: r for r in conn.execute("SELECT id, content, content_format FROM scripts")}
+    assert rows[plain_id]["content_format"] == "text"
+    assert rows[packed_id]["content_format"] == "zlib"
+    assert len(rows[packed_id]["content"]) < len(content) / 10
+
+    assert db.get_script(packed_id)["content"] == content
+    assert "content_format" not in db.get_script(packed_id)
+    assert db.get_script_content(packed_id) == content
+    assert {s["content"] for s in db.get_all_scripts()} == {content}
+    assert {r["id"] for r in db.search_scripts("starbucks")} == {plain_id, packed_id}
+
+    assert db.update_script(plain_id, content="EXT. BEACH - DAY\nA Corona bottle.", compression="zlib")
+    assert db.get_script(plain_id)["content"].startswith("EXT. BEACH")
+    assert [r["id"] for r in db.search_scripts("corona")] == [plain_id]
+    assert [r["id"] for r in db.search_scripts("starbucks")] == [packed_id]
+
+    db.delete_script(packed_id)
+    assert db.search_scripts("starbucks") == []
+
+
+def test_bare_sqlite_connections_can_write_scripts(db):
+    """Writes through a plain sqlite3 connection (CLI, DB browser) need no Python functions"""
+    import sqlite3
+
+    packed_id = db.create_script("Packed", "Drama", "A Heineken on the bar.", compression="zlib")
+    conn = sqlite3.connect(db.DB_PATH, isolation_level=None)
+    try:
+        conn.execute("PRAGMA foreign_keys = ON")
+        plain_id = conn.execute(
+            "INSERT INTO scripts (title, genre, content) VALUES ('Raw', 'Drama', 'A Pepsi can.')").lastrowid
+        assert [r["id"] for r in db.search_scripts("pepsi")] == [plain_id]
+
+        conn.execute("UPDATE scripts SET content = 'A Fanta can.', title = 'Renamed' WHERE id = ?", (plain_id,))
+        conn.execute("UPDATE scripts SET title = 'Repacked' WHERE id = ?", (packed_id,))
+        assert db.search_scripts("pepsi") == []
+        assert db.search_scripts("fanta")[0]["title"] == "Renamed"
+        assert db.search_scripts("heineken")[0]["title"] == "Repacked"
+
+        conn.execute("DELETE FROM scripts WHERE id IN (?, ?)", (plain_id, packed_id))
+    finally:
+        conn.close()
+    assert db.search_scripts("fanta") == [] and db.search_scripts("heineken") == []
+    assert db.get_database_stats()["scripts"] == 0
+
+
+def test_search_index_survives_recompression_and_rebuild(db):
+    """Compressed rows stay indexed through recompression and a full index rebuild"""
+    plain_id = db.create_script("Plain", "Drama", "A Nike shoe.")
+    packed_id = db.create_script("Packed", "Drama", "An Adidas shoe.", compression="zlib")
+    assert db.recompress_scripts("zlib") == 1
+    assert db.rebuild_search_index()
+    assert {r["id"] for r in db.search_scripts("shoe")} == {plain_id, packed_id}
+    assert db.recompress_scripts("none") == 2
+    assert [r["id"] for r in db.search_scripts("adidas")] == [packed_id]
+
+
+def test_recompress_scripts(db):
+    """recompress_scripts converts rows in place and back"""
+    ids = [db.create_script(f"S{i}", "Drama", f"Scene {i} " * 100) for i in range(5)]
+    assert db.recompress_scripts("zlib", batch_size=2) == 5
+    assert db.recompress_scripts("zlib") == 0
+    assert [db.get_script_content(i) for i in ids] == [f"Scene {i} " * 100 for i in range(5)]
+    assert db.recompress_scripts("none") == 5
+    assert db.search_scripts("scene")
+
+
+def test_init_database_migrates_pre_compression_schema(tmp_path, monkeypatch):
+    """Databases created before content_format existed keep working"""
+    import sqlite3
+
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE scripts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            genre TEXT NOT NULL,
+            content TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO scripts (title, genre, content) VALUES ('Legacy', 'Drama', 'A Nike shoe.');
+    """)
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(db_util, "DB_PATH", str(path))
+    db_util.close_pool()
+    try:
+        assert db_util.init_database()
+        legacy = db_util.get_all_scripts()[0]
+        assert legacy["content"] == "A Nike shoe."
+        assert db_util.search_scripts("nike")[0]["title"] == "Legacy"
+        assert db_util.get_database_stats()["scripts"] == 1
+        assert db_util.get_genre_distribution() == [("Drama", 1)]
+        new_id = db_util.create_script("New", "Drama", "A Nike hat.", compression="zlib")
+        assert db_util.get_script_content(new_id) == "A Nike hat."
+        assert db_util.init_database()
+    finally:
+        db_util.close_pool()
+
+
+def _actual_counts(db):
+    with db.pooled_connection() as conn:
+        stats = {key: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                 for table, key in db.STATS_TABLES.items()}
+        genres = sorted((r[0], r[1]) for r in conn.execute(
+            "SELECT genre, COUNT(*) FROM scripts GROUP BY genre"))
+    return stats, genres
+
+
+def test_stats_consistent_under_random_workload(db):
+    """Trigger-maintained counts match COUNT(*) after random inserts/updates/deletes"""
+    import random
+
+    rng = random.Random(1234)
+    genres = ["Action", "Comedy", "Drama", "Horror"]
+    script_ids, actor_ids = [], []
+
+    for step in range(400):
+        op = rng.random()
+        if op < 0.35 or not script_ids:
+            script_ids.append(db.create_script(f"S{step}", rng.choice(genres), "x"))
+        elif op < 0.5:
+            sid = rng.choice(script_ids)
+            db.bulk_create_product_placements([
+                {"script_id": sid, "product_name": "P", "brand": "B"} for _ in range(rng.randint(1, 4))
+            ])
+            db.create_revenue_forecast(sid, "Action", "Tech", 1.0, 1.0)
+        elif op < 0.6:
+            actor_ids.append(db.create_actor(rng.randint(1, 40), f"A{step}"))
+            db.create_script_casting(rng.choice(script_ids), actor_ids[-1], "Role")
+        elif op < 0.75:
+            db.update_script(rng.choice(script_ids), genre=rng.choice(genres))
+        else:
+            sid = script_ids.pop(rng.randrange(len(script_ids)))
+            db.delete_script(sid)
+
+    stats, genre_rows = _actual_counts(db)
+    assert db.get_database_stats() == stats
+    assert sorted(db.get_genre_distribution()) == genre_rows
+
+    dist = db.get_genre_distribution()
+    assert [count for _, count in dist] == sorted((count for _, count in dist), reverse=True)
+
+
+def test_rebuild_stats_repairs_drift(db):
+    """rebuild_stats recomputes counts that were changed behind the triggers' back"""
+    db.create_script("A", "Drama", "x")
+    db.create_script("B", "Comedy", "x")
+    with db.transaction() as conn:
+        conn.execute("UPDATE table_stats SET row_count = 99")
+        conn.execute("DELETE FROM genre_counts")
+
+    assert db.get_database_stats()["scripts"] == 99
+    assert db.rebuild_stats()
+    assert db.get_database_stats()["scripts"] == 2
+    assert sorted(db.get_genre_distribution()) == [("Comedy", 1), ("Drama", 1)]
+
+
+def test_delete_scripts_cascades(db):
+    """delete_scripts removes scripts and their children in one transaction"""
+    actor_id = db.create_actor(1, "Lead")
+    ids = []
+    for i in range(30):
+        sid = db.create_script(f"S{i}", "Drama", "x")
+        db.bulk_create_product_placements([{"script_id": sid, "product_name": "P", "brand": "B"}] * 2)
+        db.create_script_casting(sid, actor_id, "Role")
+        db.create_revenue_forecast(sid, "Drama", "Food", 1.0, 1.0)
+        ids.append(sid)
+
+    assert db.delete_scripts(ids[:20] + [ids[0], -1], chunk_size=7) == 20
+    stats = db.get_database_stats()
+    assert stats == {"scripts": 10, "placements": 20, "actors": 1, "castings": 10, "forecasts": 10}
+    assert db.get_placements_by_script(ids[0]) == []
+
+    assert db.delete_script(ids[20])
+    assert db.get_database_stats()["castings"] == 9
+
+
+def test_foreign_keys_enforced(db):
+    """Child rows must reference an existing script"""
+    assert db.create_product_placement(12345, "Phone", "Acme") is None
+    assert db.create_script_casting(12345, 1, "Role") is None
+
+
+def test_deleting_a_cast_actor_is_refused(db):
+    """Castings cascade from their script, never from their actor"""
+    import sqlite3
+
+    sid = db.create_script("S", "Drama", "x")
+    actor_id = db.create_actor(1, "Lead")
+    db.create_script_casting(sid, actor_id, "Role")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        with db.transaction() as conn:
+            conn.execute("DELETE FROM actors WHERE id = ?", (actor_id,))
+    assert len(db.get_casting_by_script(sid)) == 1
+
+    assert db.delete_script(sid)
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM actors WHERE id = ?", (actor_id,))
+    assert db.get_database_stats()["actors"] == 0
+
+
+def test_init_database_migrates_foreign_keys(tmp_path, monkeypatch, capsys):
+    """Child tables from the original schema are rebuilt with ON DELETE CASCADE from scripts"""
+    import sqlite3
+
+    original_schema = """
+        CREATE TABLE scripts (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL,
+            genre TEXT NOT NULL, content TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP, modified_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE product_placements (id INTEGER PRIMARY KEY AUTOINCREMENT, script_id INTEGER,
+            product_name TEXT NOT NULL, brand TEXT NOT NULL, placement_type TEXT, scene_description TEXT,
+            estimated_cost REAL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (script_id) REFERENCES scripts(id));
+        CREATE TABLE actors (id INTEGER PRIMARY KEY AUTOINCREMENT, tmdb_id INTEGER UNIQUE, name TEXT NOT NULL,
+            country TEXT, popularity REAL, profile_path TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP);
+        CREATE TABLE script_casting (id INTEGER PRIMARY KEY AUTOINCREMENT, script_id INTEGER, actor_id INTEGER,
+            role_name TEXT, match_score REAL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (script_id) REFERENCES scripts(id), FOREIGN KEY (actor_id) REFERENCES actors(id));
+        CREATE TABLE revenue_forecasts (id INTEGER PRIMARY KEY AUTOINCREMENT, script_id INTEGER,
+            genre TEXT NOT NULL, product_category TEXT, estimated_revenue REAL, estimated_roi REAL,
+            market_reach TEXT, forecast_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (script_id) REFERENCES scripts(id));
+        CREATE INDEX idx_product_placements_script ON product_placements(script_id);
+        INSERT INTO scripts (title, genre, content) VALUES ('Keep', 'Drama', 'x'), ('Drop', 'Drama', 'y');
+        INSERT INTO actors (tmdb_id, name) VALUES (1, 'Lead');
+        INSERT INTO product_placements (script_id, product_name, brand) VALUES (1, 'P', 'B'), (2, 'P', 'B'), (99, 'Orphan', 'B');
+        INSERT INTO script_casting (script_id, actor_id, role_name) VALUES (1, 1, 'Role'), (2, 1, 'Role');
+        INSERT INTO revenue_forecasts (script_id, genre) VALUES (2, 'Drama');
+    """
+    path = tmp_path / "original.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(original_schema)
+    conn.close()
+
+    monkeypatch.setattr(db_util, "DB_PATH", str(path))
+    db_util.close_pool()
+    try:
+        assert db_util.init_database()
+        assert "Dropped 1 orphaned row(s) from product_placements" in capsys.readouterr().out
+        with db_util.pooled_connection() as conn:
+            for table in db_util.CASCADE_TABLES:
+                on_delete = {fk["table"]: fk["on_delete"] for fk in conn.execute(f"PRAGMA foreign_key_list({table})")}
+                assert on_delete["scripts"] == "CASCADE"
+                assert on_delete.get("actors", "NO ACTION") == "NO ACTION"
+            indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            assert "idx_product_placements_script" in indexes
+
+        assert db_util.get_database_stats() == {
+            "scripts": 2, "placements": 2, "actors": 1, "castings": 2, "forecasts": 1
+        }
+        assert db_util.delete_script(2)
+        assert db_util.get_database_stats() == {
+            "scripts": 1, "placements": 1, "actors": 1, "castings": 1, "forecasts": 0
+        }
+        assert db_util.init_database()
+    finally:
+        db_util.close_pool()
+
+
+def test_castings_stop_cascading_from_actors(tmp_path, monkeypatch):
+    """Migration 004 rebuilds a casting table created with the old actor cascade, keeping rows and ids"""
+    import sqlite3
+
+    sql = ""
+    for version, _, migration in db_util._load_migrations(db_util.MIGRATIONS_DIR):
+        if version < 4:
+            with open(migration) as f:
+                sql += f.read()
+    sql = sql.replace("REFERENCES actors(id)\n", "REFERENCES actors(id) ON DELETE CASCADE\n")
+    path = tmp_path / "v3.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(sql)
+    conn.executescript("""
+        INSERT INTO scripts (title, genre, content) VALUES ('S', 'Drama', 'x');
+        INSERT INTO actors (tmdb_id, name) VALUES (1, 'Lead');
+        INSERT INTO script_casting (script_id, actor_id, role_name) VALUES (1, 1, 'A'), (1, 1, 'B'), (1, 1, 'C');
+        DELETE FROM script_casting WHERE role_name = 'C';
+    """)
+    conn.close()
+
+    monkeypatch.setattr(db_util, "DB_PATH", str(path))
+    db_util.close_pool()
+    try:
+        assert db_util.get_schema_version() == 3
+        assert db_util.init_database()
+        with db_util.pooled_connection() as conn:
+            on_delete = {fk["table"]: fk["on_delete"] for fk in conn.execute("PRAGMA foreign_key_list(script_casting)")}
+            assert on_delete == {"scripts": "CASCADE", "actors": "NO ACTION"}
+            triggers = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE tbl_name = 'script_casting'")}
+            assert {"idx_script_casting_script", "idx_script_casting_actor",
+                    "script_casting_stats_insert", "script_casting_stats_delete"} <= triggers
+        assert sorted(c["role_name"] for c in db_util.get_casting_by_script(1)) == ["A", "B"]
+        assert db_util.create_script_casting(1, 1, "D") == 4
+        assert db_util.get_database_stats()["castings"] == 3
+    finally:
+        db_util.close_pool()
+
+
+def test_migrations_run_as_plain_sql(tmp_path, monkeypatch):
+    """The migration files build a working, versioned database without Python (as the sqlite3 CLI would)"""
+    import sqlite3
+
+    import shutil
+    import subprocess
+
+    path = tmp_path / "cli.db"
+    sql = ""
+    for _, _, migration in db_util._load_migrations(db_util.MIGRATIONS_DIR):
+        with open(migration) as f:
+            sql += f.read()
+    conn = sqlite3.connect(path)
+    if shutil.which("sqlite3"):
+        subprocess.run(["sqlite3", "-bail", str(path)], input=sql, text=True, check=True, capture_output=True)
+    else:
+        conn.executescript(sql)
+    conn.execute("INSERT INTO scripts (title, genre, content) VALUES ('Shell', 'Drama', 'A Coke bottle.')")
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(db_util, "DB_PATH", str(path))
+    db_util.close_pool()
+    try:
+        latest = db_util._load_migrations(db_util.MIGRATIONS_DIR)[-1][0]
+        assert db_util.get_schema_version() == latest
+        assert db_util.init_database()
+        assert db_util.create_script("Packed", "Drama", "A Coke can.", compression="zlib")
+        assert {r["title"] for r in db_util.search_scripts("coke")} == {"Shell", "Packed"}
+        assert db_util.get_database_stats()["scripts"] == 2
+    finally:
+        db_util.close_pool()
+
+
+def test_init_database_fast_path(db):
+    """A current database is checked with a single query and nothing else"""
+    assert db.get_schema_version() == db._load_migrations(db.MIGRATIONS_DIR)[-1][0]
+
+    statements = []
+    with db.pooled_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            assert db.init_database()
+        finally:
+            conn.set_trace_callback(None)
+    assert statements == ["SELECT MAX(version) FROM schema_version"]
+
+
+def test_migrations_applied_in_order_once(db, tmp_path, monkeypatch):
+    """New migration files are applied on the next init and recorded"""
+    import shutil
+
+    migrations_dir = tmp_path / "migrations"
+    shutil.copytree(db.MIGRATIONS_DIR, migrations_dir)
+    (migrations_dir / "900_add_rating.sql").write_text(
+        "-- Migration 900: ratings\nALTER TABLE scripts ADD COLUMN rating REAL;\n"
+        "CREATE INDEX IF NOT EXISTS idx_scripts_rating ON scripts(rating);\n"
+    )
+    monkeypatch.setattr(db, "MIGRATIONS_DIR", str(migrations_dir))
+
+    script_id = db.create_script("Rated", "Drama", "x")
+    assert db.init_database()
+    assert db.init_database()
+    assert db.get_schema_version() == 900
+    with db.pooled_connection() as conn:
+        conn.execute("UPDATE scripts SET rating = 4.5 WHERE id = ?", (script_id,))
+        names = [r["name"] for r in conn.execute("SELECT name FROM schema_version ORDER BY version")]
+    assert names[-1] == "add_rating"
+    assert db.get_script(script_id)["rating"] == 4.5
+
+
+def test_failed_migration_rolls_back(db, tmp_path, monkeypatch):
+    """A failing migration leaves the schema and version untouched"""
+    import shutil
+
+    migrations_dir = tmp_path / "migrations"
+    shutil.copytree(db.MIGRATIONS_DIR, migrations_dir)
+    (migrations_dir / "900_broken.sql").write_text(
+        "CREATE TABLE half_done (id INTEGER);\nSELECT * FROM no_such_table;\n"
+    )
+    monkeypatch.setattr(db, "MIGRATIONS_DIR", str(migrations_dir))
+    version = db.get_schema_version()
+
+    assert not db.init_database()
+    assert db.get_schema_version() == version
+    with db.pooled_connection() as conn:
+        assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'half_done'").fetchone() is None
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+
+def test_redundant_indexes_dropped(db):
+    """Migration 002 removes indexes covered by other indexes"""
+    with db.pooled_connection() as conn:
+        indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert "idx_scripts_genre" not in indexes
+    assert "idx_actors_tmdb" not in indexes
+    assert "idx_scripts_genre_created" in indexes
+
+
+def test_script_bundles_use_fixed_query_count(db):
+    """get_script_bundles() loads any number of scripts with the same four queries"""
+    actor_id = db.create_actor(7, "Actor Seven")
+    ids = []
+    for i in range(30):
+        sid = db.create_script(f"Script {i}", "Drama", f"INT. ROOM {i} - DAY")
+        db.create_product_placement(sid, "Cola", "Acme")
+        db.create_script_casting(sid, actor_id, "Lead", 0.5)
+        db.create_revenue_forecast(sid, "Drama", "Beverage", 1000.0, 1.1)
+        ids.append(sid)
+    bare_id = db.create_script("Bare", "Comedy", "EXT. PARK - DAY")
+
+    counts = {}
+    for batch in (ids[:1], ids):
+        statements = []
+        with db.pooled_connection() as conn:
+            conn.set_trace_callback(statements.append)
+            try:
+                bundles = db.get_script_bundles(list(reversed(batch)) + [bare_id, 99999])
+            finally:
+                conn.set_trace_callback(None)
+        counts[len(batch)] = len([s for s in statements if s.lstrip().startswith("SELECT")])
+        assert list(bundles) == list(reversed(batch)) + [bare_id]
+    assert counts[1] == counts[30] == 4
+
+    bundle = bundles[ids[3]]
+    assert bundle.script["content"] == "INT. ROOM 3 - DAY"
+    assert [p["product_name"] for p in bundle.placements] == ["Cola"]
+    assert bundle.castings[0]["name"] == "Actor Seven"
+    assert len(bundle.forecasts) == 1
+    assert bundles[bare_id].placements == [] and bundles[bare_id].castings == []
+
+    single = db.get_script_bundle(ids[0], include_content=False)
+    assert "content" not in single.script
+    assert single == (single.script, db.get_placements_by_script(ids[0]),
+                      db.get_casting_by_script(ids[0]), db.get_forecasts_by_script(ids[0]))
+    assert db.get_script_bundle(99999) is None
@@ -0,0 +1,144 @@
+"""
+Test PDF Extraction Cache
+Exercises utils/extraction_cache.py and its use by utils/pdf_script_extractor.py
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import extraction_cache, pdf_script_extractor
+from utils.pdf_script_extractor import PDFScriptExtractor, extract_pdf_text
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Point extraction_cache at a fresh file and reset its counters"""
+    monkeypatch.setattr(extraction_cache, "EXTRACTION_CACHE_PATH", str(tmp_path / "extraction_cache.db"))
+    monkeypatch.setattr(extraction_cache, "EXTRACTION_CACHE_ENABLED", True)
+    monkeypatch.setattr(extraction_cache, "_stats", {k: 0 for k in extraction_cache._stats})
+    extraction_cache.close_cache()
+    yield extraction_cache
+    extraction_cache.close_cache()
+
+
+@pytest.fixture
+def extractions(monkeypatch):
+    """Replace real extraction with a fake that echoes the file bytes and records each call"""
+    calls = []
+
+    def fake_extract(self, pdf_path, method, workers, page_range=None):
+        calls.append((os.path.basename(pdf_path), method))
+        with open(pdf_path, "rb") as f:
+            data = f.read().decode()
+        if "broken" in data:
+            return {'success': False, 'error': 'broken', 'text': '', 'metadata': {}}
+        return {'success': True, 'error': None, 'text': f"INT. {data} - DAY",
+                'metadata': {'method': method, 'num_pages': 1, 'page_timings': [0.1],
+                             'file_name': os.path.basename(pdf_path), 'file_size': len(data)}}
+
+    monkeypatch.setattr(pdf_script_extractor, "PYPDF2_AVAILABLE", True)
+    monkeypatch.setattr(pdf_script_extractor, "OCR_AVAILABLE", False)
+    monkeypatch.setattr(PDFScriptExtractor, "_extract", fake_extract)
+    return calls
+
+
+def test_key_covers_content_method_version_and_options(cache):
+    """Changing the bytes, method, extractor version or an option changes the key"""
+    base = cache.make_key("abc", "ocr", 1, dpi=200, grayscale=True)
+    assert base == cache.make_key("abc", "ocr", 1, grayscale=True, dpi=200)
+    variants = [
+        cache.make_key("abd", "ocr", 1, dpi=200, grayscale=True),
+        cache.make_key("abc", "pypdf2", 1, dpi=200, grayscale=True),
+        cache.make_key("abc", "ocr", 2, dpi=200, grayscale=True),
+        cache.make_key("abc", "ocr", 1, dpi=300, grayscale=True),
+        cache.make_key("abc", "ocr", 1),
+    ]
+    assert len({base, *variants}) == len(variants) + 1
+
+
+def test_round_trip_is_compressed_and_evicts_lru(cache, monkeypatch):
+    """Text and metadata survive a round trip; the oldest entry goes once the size bound is hit"""
+    text = "FADE IN:\n" + "INT. KITCHEN - NIGHT\nMAYA pours coffee.\n" * 2000
+    result = {'success': True, 'text': text, 'metadata': {'num_pages': 3, 'page_timings': [0.1, 0.2]}}
+    assert cache.put("k1", "sha1", result)
+    assert cache.get("k1") == {'success': True, 'text': text, 'metadata': result['metadata'], 'error': None}
+    stats = cache.get_cache_stats()
+    assert stats["bytes"] < len(text) / 10 and stats["documents"] == 1
+
+    monkeypatch.setattr(cache, "EXTRACTION_CACHE_MAX_BYTES", int(stats["bytes"] * 2.5))
+    cache.put("k2", "sha2", result)
+    cache.get("k1")
+    cache.put("k3", "sha3", result)
+    assert cache.get("k2") is None
+    assert cache.get("k1") is not None and cache.get("k3") is not None
+    assert cache.get_cache_stats()["evictions"] == 1
+
+
+def test_identical_bytes_hit_under_any_name(cache, extractions, tmp_path):
+    """A renamed copy is served from the cache; changed bytes and failures are not"""
+    first = tmp_path / "script_20240101.pdf"
+    first.write_bytes(b"ROOM")
+    copy = tmp_path / "script_20240102.pdf"
+    copy.write_bytes(b"ROOM")
+    edited = tmp_path / "edited.pdf"
+    edited.write_bytes(b"HALL")
+
+    miss = extract_pdf_text(str(first))
+    hit = extract_pdf_text(str(copy))
+    assert miss["metadata"]["cached"] is False and hit["metadata"]["cached"] is True
+    assert hit["text"] == miss["text"] == "INT. ROOM - DAY"
+    assert hit["metadata"]["sha256"] == miss["metadata"]["sha256"]
+    assert miss["metadata"]["file_name"] == "script_20240101.pdf"
+    assert hit["metadata"]["file_name"] == "script_20240102.pdf" and hit["metadata"]["file_size"] == 4
+    assert extract_pdf_text(str(edited))["text"] == "INT. HALL - DAY"
+    assert extractions == [("script_20240101.pdf", "pypdf2"), ("edited.pdf", "pypdf2")]
+
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"broken")
+    assert not extract_pdf_text(str(broken))["success"]
+    assert not extract_pdf_text(str(broken))["success"]
+    assert extractions[-2:] == [("broken.pdf", "pypdf2")] * 2
+
+    PDFScriptExtractor().extract_text(str(first))
+    assert len(extractions) == 5
+
+
+def test_ocr_options_are_part_of_the_key(cache, extractions, tmp_path):
+    """Re-running OCR at another resolution is not served the old text"""
+    pdf = tmp_path / "scan.pdf"
+    pdf.write_bytes(b"SCAN")
+    for dpi in (200, 200, 300):
+        PDFScriptExtractor(ocr_dpi=dpi).extract_text(str(pdf), method="ocr", use_cache=True)
+    assert len(extractions) == 2
+
+
+def test_warm_directory_extracts_only_new_pdfs(cache, extractions, tmp_path):
+    """Pre-warming skips PDFs already cached and non-PDF files"""
+    (tmp_path / "a.pdf").write_bytes(b"A")
+    (tmp_path / "b.PDF").write_bytes(b"B")
+    (tmp_path / "notes.txt").write_bytes(b"C")
+    extract_pdf_text(str(tmp_path / "a.pdf"))
+    summary = cache.warm_directory(str(tmp_path))
+    assert summary == {'pdfs': 2, 'cached': 1, 'extracted': 1, 'failed': 0}
+    assert cache.warm_directory(str(tmp_path))["cached"] == 2
+
+
+def test_hits_do_not_store_or_mutate_file_fields(cache, extractions, tmp_path, monkeypatch):
+    """Path-derived metadata stays out of the cache and cache lookups are not modified in place"""
+    pdf = tmp_path / "first.pdf"
+    pdf.write_bytes(b"ROOM")
+    extract_pdf_text(str(pdf))
+    key = cache.make_key(cache.file_sha256(str(pdf)), "pypdf2", pdf_script_extractor.EXTRACTOR_VERSION)
+    stored = cache.get(key)
+    assert not set(pdf_script_extractor.FILE_METADATA_KEYS) & set(stored["metadata"])
+
+    monkeypatch.setattr(cache, "get", lambda k: stored)
+    renamed = tmp_path / "renamed.pdf"
+    renamed.write_bytes(b"ROOM")
+    assert extract_pdf_text(str(renamed))["metadata"]["file_name"] == "renamed.pdf"
+    assert "file_name" not in stored["metadata"] and "cached" not in stored["metadata"]
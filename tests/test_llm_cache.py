@@ -0,0 +1,105 @@
+"""
+Test LLM Response Cache
+Exercises utils/llm_cache.py against a temporary cache file
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import llm_cache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Point llm_cache at a fresh file and reset its counters"""
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_PATH", str(tmp_path / "llm_cache.db"))
+    monkeypatch.setattr(llm_cache, "_stats", {k: 0 for k in llm_cache._stats})
+    llm_cache.close_cache()
+    yield llm_cache
+    llm_cache.close_cache()
+
+
+def test_key_covers_every_parameter(cache):
+    """Changing provider, model, sampling params or prompt changes the key"""
+    base = cache.make_key("openai", "gpt-4.1-mini", 0.5, 2000, "prompt")
+    assert base == cache.make_key("openai", "gpt-4.1-mini", 0.5, 2000, "prompt")
+    variants = [
+        cache.make_key("xai", "gpt-4.1-mini", 0.5, 2000, "prompt"),
+        cache.make_key("openai", "gpt-4.1", 0.5, 2000, "prompt"),
+        cache.make_key("openai", "gpt-4.1-mini", 0.4, 2000, "prompt"),
+        cache.make_key("openai", "gpt-4.1-mini", 0.5, 1000, "prompt"),
+        cache.make_key("openai", "gpt-4.1-mini", 0.5, 2000, "prompt!"),
+        cache.make_key("openai", "gpt-4.1-mini", 0.5, 2000, "prompt", json_mode=True),
+    ]
+    assert len({base, *variants}) == len(variants) + 1
+
+
+def test_hit_and_miss_counters(cache):
+    """get() misses until put(), then hits with the stored text"""
+    key = cache.make_key("google", "gemini-2.5-flash", 0.5, 2000, "analyze")
+    assert cache.get(key) is None
+    assert cache.put(key, "## Analysis ☕")
+    assert cache.get(key) == "## Analysis ☕"
+
+    stats = cache.get_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["writes"]) == (1, 1, 1)
+    assert stats["entries"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_expired_entries_are_misses(cache, monkeypatch):
+    """Entries older than the TTL are removed on lookup"""
+    key = cache.make_key("openai", "m", 0.0, 10, "p")
+    cache.put(key, "old")
+    monkeypatch.setattr(cache, "LLM_CACHE_TTL", 60)
+    now = cache.time.time()
+    monkeypatch.setattr(cache.time, "time", lambda: now + 120)
+    assert cache.get(key) is None
+    assert cache.get_cache_stats()["expired"] == 1
+    assert cache.get_cache_stats()["entries"] == 0
+
+
+def test_lru_eviction_by_size(cache, monkeypatch):
+    """Least recently used entries are evicted once the size bound is exceeded"""
+    payload = os.urandom(4000).hex()  # ~4 KB once compressed
+    monkeypatch.setattr(cache, "LLM_CACHE_MAX_BYTES", 14000)
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(cache.time, "time", lambda: next(clock))
+
+    keys = [cache.make_key("openai", "m", 0.0, 10, f"p{i}") for i in range(4)]
+    for key in keys[:3]:
+        cache.put(key, payload)
+    assert cache.get(keys[0]) == payload  # keys[1] is now least recently used
+    cache.put(keys[3], payload)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == payload
+    assert cache.get(keys[3]) == payload
+    stats = cache.get_cache_stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= 14000
+
+
+def test_clear_cache(cache):
+    """clear_cache() removes every entry"""
+    for i in range(5):
+        cache.put(cache.make_key("openai", "m", 0.0, 10, str(i)), "x")
+    assert cache.clear_cache()
+    assert cache.get_cache_stats()["entries"] == 0
+
+
+def test_put_does_not_scan_the_table(cache):
+    """Eviction reads the running size total instead of summing every row"""
+    for i in range(20):
+        cache.put(cache.make_key("openai", "m", 0.0, 10, str(i)), "x" * 100)
+    statements = []
+    with cache._store.lock:
+        cache._store.connection().set_trace_callback(statements.append)
+    cache.put(cache.make_key("openai", "m", 0.0, 10, "new"), "y" * 100)
+    assert statements and not any("SUM(" in s.upper() for s in statements)
+    assert cache.get_cache_stats()["entries"] == 21
@@ -0,0 +1,68 @@
+"""
+Test Offline Local LLM
+Checks the deterministic 'local' provider used for offline benchmarks
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("langchain_core")
+
+from utils import local_llm
+from utils.langchain_util import create_llm
+
+SCRIPT = "INT. CAFE - DAY\n\nMAYA\nOne coffee, please.\n\nEXT. STREET - NIGHT\n\nJONAH\nRun!\n"
+
+
+@pytest.fixture
+def fast():
+    """A local model with no simulated delay"""
+    return {"provider": "local", "model": "local-test", "latency_s": 0, "tokens_per_sec": 0}
+
+
+def test_create_llm_local_needs_no_key_and_is_memoized(fast, monkeypatch):
+    """The local provider works without API keys; options are part of the client key"""
+    for var in ("OPENAI_API_KEY", "GOOGLE_API_KEY", "XAI_API_KEY"):
+        monkeypatch.delenv(var, raising=False)
+    llm = create_llm(fast, temperature=0.5, max_tokens=500)
+    assert isinstance(llm, local_llm.LocalChatModel)
+    assert create_llm(fast, temperature=0.5, max_tokens=500) is llm
+    assert create_llm({**fast, "latency_s": 0.5}, temperature=0.5, max_tokens=500) is not llm
+
+
+def test_responses_are_deterministic_and_stream_matches_invoke(fast):
+    """Same prompt gives the same text; the stream concatenates to the invoke result"""
+    llm = create_llm(fast, max_tokens=2000)
+    prompt = "## Summary\n## Brand Fit\n\n" + SCRIPT
+    text = llm.invoke(prompt).content
+    assert text == llm.invoke(prompt).content
+    assert "## Brand Fit" in text
+    assert "".join(chunk.content for chunk in llm.stream(prompt)) == text
+    assert text != llm.invoke(prompt + "!").content
+
+
+def test_templates_match_what_callers_parse(fast):
+    """JSON prompts get valid JSON; scoring prompts end with a parsable score"""
+    llm = create_llm(fast, max_tokens=4000)
+    candidates = json.loads(llm.invoke("Return STRICT JSON with field 'candidates'\n\n" + SCRIPT).content)
+    assert len(candidates["candidates"]) == 5
+    comparison = json.loads(llm.invoke("Output STRICT JSON only. changes summary\n\n" + SCRIPT).content)
+    assert {"summary", "changes"} <= comparison.keys()
+    scored = llm.invoke("Output a final line: 'Score: NN/100'\n\n" + SCRIPT).content
+    assert scored.splitlines()[-1].startswith("Score: ")
+
+
+def test_latency_and_token_rate_are_simulated(fast, monkeypatch):
+    """invoke() waits first-token latency plus tokens / tokens_per_sec, and max_tokens caps output"""
+    sleeps = []
+    monkeypatch.setattr(local_llm, "_sleep", sleeps.append)
+    llm = local_llm.LocalChatModel(latency_s=1.0, tokens_per_sec=10.0, max_tokens=20)
+    text = llm.invoke(SCRIPT).content
+    assert len(local_llm._TOKEN.findall(text)) == 20
+    assert sleeps and sleeps[0] == pytest.approx(3.0, abs=0.1)
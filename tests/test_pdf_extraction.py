@@ -0,0 +1,259 @@
+"""
+Test PDF Extraction Internals
+Exercises utils/pdf_script_extractor.py on small generated PDFs
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import pdf_script_extractor
+from utils.pdf_script_extractor import PDFScriptExtractor, _needs_ocr, _page_shards
+
+
+def write_pdf(path, page_texts):
+    """Write a minimal PDF with one line of Helvetica text per page (empty string = blank page)"""
+    n = len(page_texts)
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(n))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {n} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode() if text else b""
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+    return str(path)
+
+
+def test_page_shards_cover_every_page_in_order():
+    """Shards are contiguous, ordered and near-equal"""
+    for pages, shards in [(150, 16), (7, 3), (3, 8), (1, 1)]:
+        ranges = _page_shards(pages, shards)
+        covered = [p for first, last in ranges for p in range(first, last + 1)]
+        assert covered == list(range(1, pages + 1))
+        sizes = [last - first + 1 for first, last in ranges]
+        assert max(sizes) - min(sizes) <= 1
+
+
+@pytest.fixture
+def screenplay_pdf(tmp_path):
+    pytest.importorskip("PyPDF2")
+    return write_pdf(tmp_path / "script.pdf", [f"INT. ROOM {i} - DAY" for i in range(1, 31)])
+
+
+def test_parallel_extraction_matches_sequential(screenplay_pdf):
+    """Page-parallel extraction returns the same text, in page order, with per-page timings"""
+    extractor = PDFScriptExtractor()
+    sequential = extractor.extract_text(screenplay_pdf, method="pypdf2", workers=1)
+    parallel = extractor.extract_text(screenplay_pdf, method="pypdf2", workers=3)
+    assert sequential["success"] and parallel["success"]
+    assert parallel["text"] == sequential["text"]
+    assert parallel["text"].index("ROOM 2 ") < parallel["text"].index("ROOM 30")
+    assert parallel["metadata"]["workers"] == 3
+    assert len(parallel["metadata"]["page_timings"]) == 30
+
+
+def test_small_documents_stay_sequential(screenplay_pdf, monkeypatch):
+    """Below parallel_min_pages no process pool is started"""
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool used")
+
+    monkeypatch.setattr(pdf_script_extractor, "ProcessPoolExecutor", no_pool)
+    result = PDFScriptExtractor(max_workers=4, parallel_min_pages=100).extract_text(screenplay_pdf, method="pypdf2")
+    assert result["success"] and result["metadata"]["workers"] == 1
+
+
+def test_worker_defaults_never_exceed_the_cpu_count(screenplay_pdf, monkeypatch):
+    """On a single-CPU host every default path runs in-process, however many workers are configured"""
+    def no_pool(*args, **kwargs):
+        raise AssertionError("process pool used")
+
+    monkeypatch.setattr(pdf_script_extractor, "ProcessPoolExecutor", no_pool)
+    monkeypatch.setattr(pdf_script_extractor, "CPU_COUNT", 1)
+    extractor = PDFScriptExtractor(max_workers=8, parallel_min_pages=1, ocr_workers=8)
+    assert extractor.max_workers == 1 and extractor.ocr_workers == 1
+    result = extractor.extract_text(screenplay_pdf, method="pypdf2")
+    assert result["success"] and result["metadata"]["workers"] == 1
+
+    monkeypatch.setattr(pdf_script_extractor, "CPU_COUNT", 4)
+    assert PDFScriptExtractor(max_workers=8, ocr_workers=8).max_workers == 4
+    assert PDFScriptExtractor().max_workers == pdf_script_extractor.PDF_MAX_WORKERS
+
+
+class _FakePool:
+    """In-process stand-in for ProcessPoolExecutor that records how many tasks are outstanding"""
+
+    max_outstanding = 0
+
+    def __init__(self, max_workers):
+        self.outstanding = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        pool = self
+        pool.outstanding += 1
+        _FakePool.max_outstanding = max(_FakePool.max_outstanding, pool.outstanding)
+
+        class _Future:
+            def result(self):
+                pool.outstanding -= 1
+                return fn(*args)
+
+        return _Future()
+
+
+@pytest.fixture
+def fake_ocr(monkeypatch):
+    """Pretend OCR is installed: 9 pages, page 4 fails"""
+    def fake_ocr_page(pdf_path, page_num, dpi, grayscale):
+        error = "tesseract failed" if page_num == 4 else None
+        return {"page": page_num, "text": "" if error else f"EXT. PAGE {page_num} {dpi} {grayscale}",
+                "seconds": 0.01, "rasterize_seconds": 0.005, "ocr_seconds": 0.005, "error": error}
+
+    monkeypatch.setattr(pdf_script_extractor, "OCR_AVAILABLE", True)
+    monkeypatch.setattr(pdf_script_extractor, "pdfinfo_from_path", lambda path: {"Pages": 9}, raising=False)
+    monkeypatch.setattr(pdf_script_extractor, "_ocr_page", fake_ocr_page)
+    monkeypatch.setattr(pdf_script_extractor, "ProcessPoolExecutor", _FakePool)
+    monkeypatch.setattr(pdf_script_extractor, "CPU_COUNT", 8)
+    _FakePool.max_outstanding = 0
+
+
+def test_ocr_keeps_at_most_workers_pages_in_flight(fake_ocr, tmp_path):
+    """OCR streams pages through a window no wider than the worker count, in page order"""
+    pdf = tmp_path / "scan.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    extractor = PDFScriptExtractor(ocr_dpi=150, ocr_grayscale=True, ocr_workers=3)
+    result = extractor.extract_text(str(pdf), method="ocr")
+    assert result["success"]
+    assert _FakePool.max_outstanding == 3
+    texts = result["text"].split("\n\n")
+    assert texts[0] == "EXT. PAGE 1 150 True" and len(texts) == 8
+    assert "PAGE 4" not in result["text"]
+    metadata = result["metadata"]
+    assert (metadata["dpi"], metadata["grayscale"], metadata["workers"]) == (150, True, 3)
+    assert metadata["pages_per_sec"] > 0 and len(metadata["page_timings"]) == 9
+    assert "peak_rss_mb" in metadata
+
+
+def test_iter_pages_yields_before_later_pages_are_submitted(fake_ocr, tmp_path):
+    """Page 1 is available while later pages are still unsubmitted; closing early stops submission"""
+    pdf = tmp_path / "scan.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    submitted = []
+    original_submit = _FakePool.submit
+
+    def recording_submit(self, fn, *args):
+        submitted.append(args[1])
+        return original_submit(self, fn, *args)
+
+    _FakePool.submit = recording_submit
+    try:
+        pages = PDFScriptExtractor(ocr_workers=2).iter_pages(str(pdf), method="ocr")
+        page_no, text, timings = next(pages)
+        assert (page_no, text) == (1, "EXT. PAGE 1 200 True")
+        assert set(timings) == {"seconds", "rasterize_seconds", "ocr_seconds"}
+        assert submitted == [1, 2]
+        assert [p for p, _, _ in pages][:3] == [2, 3, 4]
+    finally:
+        _FakePool.submit = original_submit
+
+
+def test_page_range_limits_extraction(fake_ocr, tmp_path):
+    """Only pages inside page_range are OCRed; the end is clamped and bad ranges fail"""
+    pdf = tmp_path / "scan.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    extractor = PDFScriptExtractor(ocr_workers=2)
+    result = extractor.extract_text(str(pdf), method="ocr", page_range=(7, 50))
+    assert result["success"]
+    assert result["text"].split("\n\n") == [f"EXT. PAGE {n} 200 True" for n in (7, 8, 9)]
+    assert result["metadata"]["page_range"] == [7, 9] and len(result["metadata"]["page_timings"]) == 3
+    assert [p for p, _, _ in extractor.iter_pages(str(pdf), "ocr", page_range=(2, 3))] == [2, 3]
+    assert not extractor.extract_text(str(pdf), method="ocr", page_range=(10, 12))["success"]
+    with pytest.raises(ValueError):
+        list(extractor.iter_pages(str(pdf), "ocr", page_range=(3, 2)))
+
+
+def test_iter_pages_text_layer_in_parallel_can_stop_early(screenplay_pdf):
+    """Text-layer pages stream in order from the pool and the generator can be closed mid-document"""
+    extractor = PDFScriptExtractor(max_workers=3)
+    pages = extractor.iter_pages(screenplay_pdf, page_range=(5, 30), workers=3)
+    first = [next(pages) for _ in range(4)]
+    pages.close()
+    assert [p for p, _, _ in first] == [5, 6, 7, 8]
+    assert "ROOM 5" in first[0][1] and "seconds" in first[0][2]
+
+
+def test_needs_ocr_flags_missing_and_garbage_text_layers():
+    """Empty, near-empty and mis-encoded pages need OCR; ordinary screenplay pages do not"""
+    assert _needs_ocr("")
+    assert _needs_ocr("  12.  ")
+    assert _needs_ocr("\ufffd\ufffd\ufffd \ue000\ue001\ue002" * 5)
+    assert not _needs_ocr("INT. KITCHEN - NIGHT\n\nMAYA pours coffee \u2014 \u201cNot again.\u201d")
+    assert not _needs_ocr("INT. CAF\u00c9 DU MONDE - JOUR\n\n\u00c9LODIE entre.")
+
+
+@pytest.fixture
+def fake_text_layer(fake_ocr, monkeypatch):
+    """Pretend PyPDF2 is installed: 9 pages with scanned (3, 4), garbage (5), broken (6) and short (7) pages"""
+    layer = {3: "", 4: "", 5: "\ufffd\ue000" * 30, 7: "THE END"}
+
+    def fake_iter_page_range(pdf_path, first_page, last_page):
+        for n in range(first_page, last_page + 1):
+            yield {"page": n, "text": layer.get(n, f"INT. ROOM {n} - DAY\nMAYA waits by the door."),
+                   "seconds": 0.001, "error": "bad xref" if n == 6 else None}
+
+    monkeypatch.setattr(pdf_script_extractor, "PYPDF2_AVAILABLE", True)
+    monkeypatch.setattr(pdf_script_extractor, "_iter_page_range", fake_iter_page_range)
+    monkeypatch.setattr(PDFScriptExtractor, "_page_count", lambda self, path, method: 9)
+
+
+def test_hybrid_ocrs_only_pages_without_a_usable_text_layer(fake_text_layer, tmp_path):
+    """'auto' reads the text layer, OCRs only bad pages in a bounded window and records provenance"""
+    pdf = tmp_path / "mixed.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    result = PDFScriptExtractor(ocr_workers=2).extract_text(str(pdf))
+    assert result["success"]
+    metadata = result["metadata"]
+    assert metadata["method"] == "hybrid"
+    assert metadata["page_methods"] == ["pypdf2", "pypdf2", "ocr", "none", "ocr", "ocr", "ocr", "pypdf2", "pypdf2"]
+    assert metadata["ocr_pages"] == [3, 4, 5, 6, 7]
+    assert _FakePool.max_outstanding == 2
+    texts = result["text"].split("\n\n")
+    assert texts[2] == "EXT. PAGE 3 200 True" and texts[1].startswith("INT. ROOM 2 ")
+    assert "\ufffd" not in result["text"] and len(metadata["page_timings"]) == 9
+
+
+def test_hybrid_iter_pages_streams_in_order(fake_text_layer, tmp_path):
+    """Hybrid pages are yielded in page order, with OCR timings only on OCRed pages"""
+    pdf = tmp_path / "mixed.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    pages = list(PDFScriptExtractor(ocr_workers=3).iter_pages(str(pdf), "hybrid", page_range=(2, 5)))
+    assert [p for p, _, _ in pages] == [2, 3, 4, 5]
+    assert "ocr_seconds" not in pages[0][2] and "ocr_seconds" in pages[1][2]
+    assert pages[2][1] == ""
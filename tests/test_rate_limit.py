@@ -0,0 +1,119 @@
+"""
+Test Rate Limiting and Retry
+Exercises utils/rate_limit.py with fake requests and a fake sleep
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import rate_limit
+
+
+class RateLimitError(Exception):
+    """Shaped like the OpenAI SDK error: carries status_code and response"""
+
+    def __init__(self, retry_after=None):
+        super().__init__("Error code: 429 - rate limit exceeded")
+        self.status_code = 429
+        headers = {"retry-after": retry_after} if retry_after is not None else {}
+        self.response = SimpleNamespace(status_code=429, headers=headers)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record requested sleeps instead of sleeping"""
+    calls = []
+    monkeypatch.setattr(rate_limit, "_sleep", calls.append)
+    rate_limit.reset_rate_limits()
+    yield calls
+    rate_limit.reset_rate_limits()
+
+
+def test_token_bucket_allows_burst_then_throttles(sleeps):
+    """A full bucket serves `capacity` calls immediately, then waits ~1/rate each"""
+    bucket = rate_limit.TokenBucket(rate=10.0, capacity=3)
+    waits = [bucket.acquire() for _ in range(5)]
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.1, abs=0.02)
+    assert waits[4] == pytest.approx(0.2, abs=0.02)
+
+
+def test_retry_honors_retry_after(sleeps):
+    """A 429 with Retry-After waits that long, then succeeds"""
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimitError(retry_after="2")
+        return "ok"
+
+    assert rate_limit.call_with_retry("openai", flaky, api_key="k") == "ok"
+    assert len(attempts) == 3
+    assert sleeps.count(2.0) == 2
+    stats = rate_limit.get_rate_limit_stats()["openai"]
+    assert stats["retries"] == 2 and stats["failures"] == 0 and stats["calls"] == 3
+
+
+def test_backoff_is_jittered_and_bounded(sleeps, monkeypatch):
+    """Without Retry-After, delays use full-jitter exponential backoff"""
+    monkeypatch.setattr(rate_limit.random, "uniform", lambda low, high: high)
+
+    def always_throttled():
+        raise RateLimitError()
+
+    with pytest.raises(RateLimitError):
+        rate_limit.call_with_retry("google", always_throttled, api_key="k", max_retries=3)
+    assert sleeps == [1.0, 2.0, 4.0]
+    assert rate_limit.get_rate_limit_stats()["google"]["failures"] == 1
+
+
+def test_non_retryable_errors_raise_immediately(sleeps):
+    """Client errors such as 401 or bad input are not retried"""
+    def bad_request():
+        raise ValueError("invalid prompt")
+
+    with pytest.raises(ValueError):
+        rate_limit.call_with_retry("xai", bad_request, api_key="k")
+    assert sleeps == []
+    assert rate_limit.get_rate_limit_stats()["xai"]["retries"] == 0
+
+
+def test_rate_limited_get_retries_http_status(sleeps, monkeypatch):
+    """HTTP 503 responses are retried and the final response is returned"""
+    statuses = iter([503, 429, 200])
+
+    def fake_get(url, **kwargs):
+        return SimpleNamespace(status_code=next(statuses), headers={})
+
+    monkeypatch.setattr(rate_limit, "requests", SimpleNamespace(get=fake_get))
+    response = rate_limit.rate_limited_get("tmdb", "https://example.test", api_key="k", timeout=5)
+    assert response.status_code == 200
+    assert rate_limit.get_rate_limit_stats()["tmdb"]["retries"] == 2
+
+    statuses = iter([503] * 10)
+    response = rate_limit.rate_limited_get("omdb", "https://example.test", api_key="k", max_retries=1)
+    assert response.status_code == 503
+
+
+def test_limiters_are_per_provider_and_key(sleeps):
+    """Each provider/API key pair gets its own bucket"""
+    assert rate_limit.get_limiter("openai", "a") is rate_limit.get_limiter("openai", "a")
+    assert rate_limit.get_limiter("openai", "a") is not rate_limit.get_limiter("openai", "b")
+    assert rate_limit.get_limiter("openai", "a") is not rate_limit.get_limiter("tmdb", "a")
+
+
+def test_retry_after_http_date():
+    """Retry-After may be an HTTP date"""
+    from email.utils import formatdate
+    import time
+
+    seconds = rate_limit.retry_after_seconds({"Retry-After": formatdate(time.time() + 30, usegmt=True)})
+    assert 25 <= seconds <= 31
+    assert rate_limit.retry_after_seconds({}) is None
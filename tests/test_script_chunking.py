@@ -0,0 +1,102 @@
+"""
+Test Screenplay Chunking
+Checks the scene-aligned chunking used by analyze_script_chunked()
+"""
+
+import os
+import random
+import re
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("langchain_core")
+
+from utils import langchain_util
+from utils.langchain_util import build_chunked_analysis_prompt, chunk_script, split_scenes
+
+
+def _screenplay(rng, scenes=150):
+    parts = ["TITLE PAGE\nWritten by Someone\n\n"]
+    for i in range(scenes):
+        heading = f"{rng.choice(['INT.', 'EXT.', '12 INT.', 'INT./EXT.'])} PLACE {i} - {rng.choice(['DAY', 'NIGHT'])}\n"
+        parts.append(heading + "Action line.\n\nBOB\nHello there.\n\n" * rng.randint(5, 40))
+    return parts
+
+
+def test_split_scenes_keeps_preamble_and_headings():
+    """Every scene starts at its heading and nothing is lost"""
+    text = "FADE IN:\n\nINT. KITCHEN - DAY\nCoffee.\n\nEXT. STREET - NIGHT\nRain.\n"
+    scenes = split_scenes(text)
+    assert scenes[0] == "FADE IN:\n\n"
+    assert scenes[1].startswith("INT. KITCHEN") and scenes[2].startswith("EXT. STREET")
+    assert "".join(scenes) == text
+
+
+def test_chunks_cover_script_within_size_bound():
+    """Chunks reassemble to the original text and respect max_chars"""
+    text = "".join(_screenplay(random.Random(1)))
+    chunks = chunk_script(text, max_chars=12000)
+    assert "".join(chunks) == text
+    assert len(chunks) > 5
+    assert all(len(c) <= 12000 for c in chunks)
+
+
+def test_editing_one_scene_changes_one_chunk():
+    """Chunk boundaries depend on headings, so a body edit invalidates one chunk"""
+    parts = _screenplay(random.Random(2))
+    before = chunk_script("".join(parts), max_chars=12000)
+    parts[70] += "A brand new line of action.\n" * 10
+    after = chunk_script("".join(parts), max_chars=12000)
+    assert len(set(after) - set(before)) == 1
+
+
+def test_map_prompts_survive_a_change_in_chunk_count(monkeypatch):
+    """Map prompts (and so cache keys) do not depend on chunk position or count"""
+    prompts = []
+    monkeypatch.setattr(langchain_util, "create_llm", lambda *args, **kwargs: None)
+    monkeypatch.setattr(langchain_util, "invoke_llm", lambda llm, prompt, *args, **kwargs: prompts.append(prompt) or "notes")
+
+    def map_prompts(parts):
+        prompts.clear()
+        chunks = chunk_script("".join(parts), max_chars=12000)
+        reduce_prompt = build_chunked_analysis_prompt("Title", chunks, {"provider": "local", "model": "local"}, 0.5, "TEMPLATE", max_workers=1)
+        assert f"### Part {len(chunks)}/{len(chunks)}" in reduce_prompt
+        return len(chunks), set(prompts)
+
+    parts = _screenplay(random.Random(2))
+    count_before, before = map_prompts(parts)
+    parts[70] += "A brand new line of action that goes on.\n\n" * 300
+    count_after, after = map_prompts(parts)
+    assert count_after != count_before
+    assert len(after - before) <= 3
+    assert len(before - after) == 1
+
+
+def test_reduce_prompt_fits_a_small_context_model(monkeypatch):
+    """Notes too long for the reduce model are merged in rounds instead of overflowing its window"""
+    from utils import token_budget
+
+    small = {"provider": "local", "model": "small-test"}
+    monkeypatch.setitem(token_budget.CONTEXT_WINDOWS, "small-test", 8192)
+    merges = []
+    monkeypatch.setattr(langchain_util, "create_llm", lambda *args, **kwargs: None)
+
+    def fake_invoke(llm, prompt, selected_model, temperature, max_tokens, use_cache=True):
+        if prompt.startswith(langchain_util.NOTES_MERGE_PROMPT.split("{title}")[0]):
+            merges.append(prompt)
+            return "- " + " ".join(re.findall(r"MARK\d+", prompt))
+        scene = re.search(r"PLACE (\d+)", prompt).group(1)
+        return f"- MARK{scene} " + "placement opportunity with a long justification. " * 60
+
+    monkeypatch.setattr(langchain_util, "invoke_llm", fake_invoke)
+    chunks = chunk_script("".join(_screenplay(random.Random(3))), max_chars=6000)
+    reduce_prompt = build_chunked_analysis_prompt("Title", chunks, small, 0.5, "TEMPLATE", max_workers=4,
+                                                  reduce_max_tokens=2000)
+    assert len(chunks) > 20 and merges
+    assert token_budget.count_tokens(reduce_prompt, small) <= token_budget.prompt_budget(small, 2000)
+    first_scenes = [re.search(r"PLACE (\d+)", chunk).group(1) for chunk in chunks]
+    assert set(re.findall(r"MARK(\d+)", reduce_prompt)) == set(first_scenes)
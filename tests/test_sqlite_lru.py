@@ -0,0 +1,102 @@
+"""
+Test Shared SQLite LRU Store
+Exercises utils/sqlite_lru.py directly; the caches built on it have their own tests
+"""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.sqlite_lru import SQLiteLRUStore
+
+
+@pytest.fixture
+def paths(tmp_path):
+    """Mutable path setting, like a cache module's *_CACHE_PATH"""
+    return {'current': str(tmp_path / "a.db")}
+
+
+@pytest.fixture
+def store(paths):
+    """Store over a fresh file"""
+    lru = SQLiteLRUStore('items', 'payload TEXT NOT NULL', lambda: paths['current'])
+    yield lru
+    lru.close()
+
+
+def _put(store, key, size, now):
+    with store.lock:
+        store.connection().execute(
+            "INSERT OR REPLACE INTO items (key, payload, size, created_at, last_used) VALUES (?, 'x', ?, ?, ?)",
+            (key, size, now, now))
+
+
+def test_evicts_least_recently_used_until_under_bound(store):
+    """Eviction follows last_used order and stops once the total fits"""
+    for i, key in enumerate("abcd"):
+        _put(store, key, 100, i)
+    with store.lock:
+        conn = store.connection()
+        store.touch(conn, "a", 10)
+        assert store.evict(conn, 250) == 2
+        assert [k for (k,) in conn.execute("SELECT key FROM items ORDER BY key")] == ["a", "d"]
+        assert store.total_size(conn) == 200
+        assert store.evict(conn, 250) == 0
+
+
+def test_follows_path_changes_and_reopens_after_close(store, paths, tmp_path):
+    """A new path opens a new file; close() drops the connection until next use"""
+    _put(store, "a", 1, 0)
+    paths['current'] = str(tmp_path / "b.db")
+    with store.lock:
+        assert store.total_size(store.connection()) == 0
+    store.close()
+    paths['current'] = str(tmp_path / "a.db")
+    with store.lock:
+        assert store.total_size(store.connection()) == 1
+    store.clear()
+    with store.lock:
+        assert store.total_size(store.connection()) == 0
+
+
+def test_running_total_tracks_every_change(store, paths, tmp_path):
+    """Inserts, replaces, size updates, deletes and clears keep the total equal to SUM(size)"""
+    def check(expected):
+        with store.lock:
+            conn = store.connection()
+            assert store.total_size(conn) == expected
+            assert conn.execute("SELECT COALESCE(SUM(size), 0) FROM items").fetchone()[0] == expected
+
+    _put(store, "a", 100, 0)
+    _put(store, "b", 50, 1)
+    check(150)
+    _put(store, "a", 30, 2)
+    check(80)
+    with store.lock:
+        conn = store.connection()
+        conn.execute("UPDATE items SET size = 70 WHERE key = 'b'")
+        store.delete(conn, "a")
+    check(70)
+    store.clear()
+    check(0)
+
+
+def test_running_total_starts_from_existing_rows(store, paths, tmp_path):
+    """A cache file written before the total was kept is summed once when opened"""
+    legacy = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(legacy)
+    conn.execute("CREATE TABLE items (key TEXT PRIMARY KEY, payload TEXT NOT NULL, size INTEGER NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)")
+    conn.executemany("INSERT INTO items VALUES (?, 'x', ?, 0, 0)", [("a", 10), ("b", 20)])
+    conn.commit()
+    conn.close()
+    paths['current'] = legacy
+    with store.lock:
+        assert store.total_size(store.connection()) == 30
+    _put(store, "c", 5, 1)
+    with store.lock:
+        assert store.total_size(store.connection()) == 35
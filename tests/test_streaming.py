@@ -0,0 +1,107 @@
+"""
+Test Streaming Responses
+Checks stream_llm() and the *_stream helpers in utils/langchain_util.py against the local model
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("langchain_core")
+
+from utils import llm_cache, local_llm
+from utils.langchain_util import (
+    analyze_script,
+    analyze_script_stream,
+    compare_scripts,
+    compare_scripts_stream,
+    create_llm,
+    get_streaming_stats,
+    stream_llm,
+)
+
+SCRIPT = "INT. CAFE - DAY\n\nMAYA\nOne coffee, please.\n\nEXT. STREET - NIGHT\n\nJONAH\nRun!\n"
+TEMPLATE = "# Analysis of {SCRIPT_TITLE}\n\n## Summary\n\n## Product Placement Opportunities\n"
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    """Point llm_cache at a fresh file"""
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_PATH", str(tmp_path / "llm_cache.db"))
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", True)
+    llm_cache.close_cache()
+    yield
+    llm_cache.close_cache()
+
+
+@pytest.fixture
+def model():
+    """A local model with a measurable first-token delay and fast streaming"""
+    return {"provider": "local", "model": "local-stream", "latency_s": 0.05, "tokens_per_sec": 5000}
+
+
+def _stream(selected, prompt, use_cache=True):
+    llm = create_llm(selected, temperature=0.2, max_tokens=300)
+    metrics = {}
+    text = "".join(stream_llm(llm, prompt, selected, 0.2, 300, use_cache=use_cache, metrics=metrics))
+    return text, metrics
+
+
+def test_metrics_record_time_to_first_token(model):
+    """A fresh stream reports TTFT after the simulated latency and before completion"""
+    streams = get_streaming_stats()["streams"]
+    text, metrics = _stream(model, "## Summary\nDescribe the scene.", use_cache=False)
+    assert metrics["cached"] is False
+    assert 0.05 <= metrics["ttft_s"] < metrics["total_s"]
+    assert metrics["chunks"] > 1 and metrics["chars"] == len(text)
+    assert get_streaming_stats()["streams"] == streams + 1
+
+
+def test_cached_stream_is_replayed_in_one_piece(model):
+    """The second identical stream comes from the cache as a single chunk with the same text"""
+    first, first_metrics = _stream(model, "## Summary\nReplay me.")
+    second, second_metrics = _stream(model, "## Summary\nReplay me.")
+    assert second == first
+    assert first_metrics["cached"] is False and second_metrics["cached"] is True
+    assert second_metrics["chunks"] == 1 and second_metrics["ttft_s"] < model["latency_s"]
+
+
+def test_only_complete_streams_are_cached(model, monkeypatch):
+    """Abandoned or failed streams leave nothing in the cache"""
+    llm = create_llm(model, temperature=0.2, max_tokens=300)
+    prompt = "## Summary\nStop early."
+    stream = stream_llm(llm, prompt, model, 0.2, 300)
+    next(stream)
+    stream.close()
+    assert _stream(model, prompt)[1]["cached"] is False
+
+    original_stream = local_llm.LocalChatModel._stream
+
+    def broken_stream(self, messages, *args, **kwargs):
+        yield from list(original_stream(self, messages, *args, **kwargs))[:3]
+        raise ConnectionError("stream dropped")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(local_llm.LocalChatModel, "_stream", broken_stream)
+        with pytest.raises(ConnectionError):
+            _stream(model, "## Summary\nDrop mid-way.")
+    assert _stream(model, "## Summary\nDrop mid-way.")[1]["cached"] is False
+
+
+def test_stream_helpers_match_their_blocking_versions(monkeypatch):
+    """analyze_script_stream / compare_scripts_stream concatenate to the non-streaming results"""
+    monkeypatch.setattr(local_llm, "_sleep", lambda seconds: None)
+    selected = {"provider": "local", "model": "local-helpers"}
+    streamed = "".join(analyze_script_stream("Cafe", SCRIPT, selected, 0.5, 400, TEMPLATE, use_cache=False))
+    assert streamed == analyze_script("Cafe", SCRIPT, selected, 0.5, 400, TEMPLATE, use_cache=False)
+
+    template = "## Changes\n\nORIGINAL:\n{original_script}\n\nMODIFIED:\n{modified_script}\n"
+    modified = SCRIPT.replace("coffee", "Nespresso")
+    streamed = "".join(compare_scripts_stream(SCRIPT, modified, template, model="local-helpers", provider="local",
+                                              max_tokens=400, use_cache=False))
+    assert streamed == compare_scripts(SCRIPT, modified, template, model="local-helpers", provider="local",
+                                       max_tokens=400, use_cache=False)
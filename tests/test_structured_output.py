@@ -0,0 +1,99 @@
+"""
+Test Structured Output
+Checks JSON parsing, the one-shot repair call and parse-failure counters in utils/langchain_util.py
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("langchain_core")
+
+from utils import langchain_util, llm_cache
+from utils.langchain_util import get_json_parse_stats, invoke_llm, invoke_llm_json, parse_json_response
+
+
+def test_parse_plain_fenced_and_wrapped_json():
+    """JSON-mode output parses directly; fences and prose around it are skipped"""
+    assert parse_json_response('{"changes": []}') == {"changes": []}
+    assert parse_json_response('Here you go:\n```json\n{"a": {"b": [1, 2]}}\n```\nThanks!') == {"a": {"b": [1, 2]}}
+    assert parse_json_response('Sure! {"candidates": [{"name": "X"}]} Hope this helps {x}') == {"candidates": [{"name": "X"}]}
+    assert parse_json_response('[1, 2] then {"k": 1}', expect=list) == [1, 2]
+
+
+def test_json_before_a_code_fence_is_found():
+    """An answer followed by a fenced example, or containing a fence in a string, still parses"""
+    answer = '{"changes": [{"id": "chg-001"}]}\n\nExample format:\n```json\n{"id": "chg-xxx"}\n```'
+    assert parse_json_response(answer, required=("changes",)) == {"changes": [{"id": "chg-001"}]}
+    snippet = 'Result: {"code": "```python\\nprint(1)\\n```", "ok": true} done'
+    assert parse_json_response(snippet) == {"code": "```python\nprint(1)\n```", "ok": True}
+
+
+def test_truncated_object_is_not_mistaken_for_a_nested_one():
+    """A cut-off outer object fails instead of returning one of its inner objects"""
+    truncated = '{"summary": {"newPlacementsCount": 1}, "changes": [{"id": "chg-001"}, {"id": "chg-'
+    with pytest.raises(ValueError):
+        parse_json_response(truncated, required=("changes",))
+    assert parse_json_response(truncated) == {"newPlacementsCount": 1}
+
+
+@pytest.fixture
+def responses(monkeypatch):
+    """Feed canned responses to invoke_llm_json and record the models used"""
+    queue, models = [], []
+    monkeypatch.setattr(langchain_util, "_json_stats", {})
+    monkeypatch.setattr(langchain_util, "create_llm", lambda selected_model, **kwargs: selected_model["model"])
+    monkeypatch.setattr(langchain_util, "invoke_llm", lambda llm, *args, **kwargs: (models.append(llm), queue.pop(0))[1])
+    return queue, models
+
+
+def test_repair_call_fixes_broken_output(responses):
+    """Broken JSON triggers exactly one repair call on the provider's cheap model"""
+    queue, models = responses
+    queue.extend(['{"changes": [1, 2,', '{"changes": [1, 2]}'])
+    selected = {"provider": "openai", "model": "gpt-4.1-mini"}
+    assert invoke_llm_json(selected, "p", 0.2, 500, purpose="t", required=("changes",)) == {"changes": [1, 2]}
+    assert models == ["gpt-4.1-mini", langchain_util.JSON_REPAIR_MODELS["openai"]]
+    stats = get_json_parse_stats()["t"]
+    assert (stats["calls"], stats["parse_failures"], stats["repaired"], stats["failed"]) == (1, 1, 1, 0)
+    assert stats["failure_rate"] == 1.0
+
+
+def test_failed_repair_raises_and_counts(responses):
+    """If the repair is also unparsable the call raises and is counted as wasted"""
+    queue, models = responses
+    queue.extend(['{"ok": true}', "still not json", '{"changes": []}'])
+    selected = {"provider": "google", "model": "gemini-2.5-flash"}
+    with pytest.raises(ValueError):
+        invoke_llm_json(selected, "p", 0.2, 500, purpose="t", required=("changes",))
+    assert invoke_llm_json(selected, "p", 0.2, 500, purpose="t", required=("changes",)) == {"changes": []}
+    stats = get_json_parse_stats()["t"]
+    assert (stats["calls"], stats["parse_failures"], stats["failed"]) == (2, 1, 1)
+    assert stats["failure_rate"] == 0.5
+
+
+def test_json_mode_is_part_of_the_response_cache_key(tmp_path, monkeypatch):
+    """A plain-mode response is never served to a JSON-mode call for the same prompt, or vice versa"""
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_PATH", str(tmp_path / "llm_cache.db"))
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_ENABLED", True)
+    llm_cache.close_cache()
+
+    class Echo:
+        def __init__(self, text):
+            self.text = text
+
+        def invoke(self, prompt):
+            return self.text
+
+    selected = {"provider": "local", "model": "local"}
+    try:
+        assert invoke_llm(Echo("Sure, here it is"), "p", selected, 0.2, 100) == "Sure, here it is"
+        assert invoke_llm(Echo('{"ok": true}'), "p", selected, 0.2, 100, json_mode=True) == '{"ok": true}'
+        assert invoke_llm(Echo("other"), "p", selected, 0.2, 100) == "Sure, here it is"
+        assert invoke_llm(Echo("other"), "p", selected, 0.2, 100, json_mode=True) == '{"ok": true}'
+    finally:
+        llm_cache.close_cache()
@@ -0,0 +1,85 @@
+"""
+Test Token Budgeting
+Checks utils/token_budget.py: budgets per model, allocation and scene-aligned trimming
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import token_budget
+from utils.token_budget import allocate_budget, count_tokens, fit_sections, output_token_limit, prompt_budget, trim_to_budget
+
+GEMINI = {"provider": "google", "model": "gemini-2.5-flash"}
+GPT4 = {"provider": "openai", "model": "gpt-4"}
+
+
+def _screenplay(scenes=200):
+    return "".join(f"INT. ROOM {i} - DAY\n\nMAYA\nLine {i}, and some more words to pad it out.\n\n" for i in range(scenes))
+
+
+def test_budget_depends_on_model_window():
+    """Large-window models get the cap; small-window models get window minus completion"""
+    assert prompt_budget(GEMINI, 2000) == token_budget.PROMPT_TOKEN_CAP
+    assert prompt_budget(GPT4, 2000) == 8192 - 2000 - token_budget.SAFETY_MARGIN
+    assert prompt_budget({"provider": "xai", "model": "grok-4-fast"}, 2000) == token_budget.PROMPT_TOKEN_CAP
+    assert prompt_budget(GPT4, 9000) == 0
+
+
+def test_output_limit_by_model_prefix():
+    """The longest matching prefix wins; unknown models get the conservative default"""
+    assert output_token_limit(GPT4) == 8192
+    assert output_token_limit({"provider": "openai", "model": "gpt-4o-mini"}) == 16384
+    assert output_token_limit(GEMINI) == 65536
+    assert output_token_limit({"provider": "local", "model": "local"}) == token_budget.DEFAULT_OUTPUT_TOKEN_LIMIT
+
+
+def test_allocation_redistributes_unused_share():
+    """A short section takes what it needs; the rest goes to the others"""
+    allotted = allocate_budget(1000, {"script": (5000, 0.5), "evidence": (100, 0.5)})
+    assert allotted == {"evidence": 100, "script": 900}
+    assert allocate_budget(1000, {"a": (10, 1.0), "b": (20, 1.0)}) == {"a": 10, "b": 20}
+
+
+def test_trim_keeps_whole_scenes():
+    """Trimming cuts at a scene heading and notes how much was kept"""
+    script = _screenplay()
+    trimmed = trim_to_budget(script, 500, GEMINI)
+    assert count_tokens(trimmed, GEMINI) <= 500
+    body, note = trimmed.split("\n\n[... truncated", 1)
+    assert script.startswith(body)
+    assert script[len(body):].startswith("INT. ROOM")
+    assert "of 200 scenes included" in note
+    assert trim_to_budget("short", 500, GEMINI) == "short"
+
+
+def test_fit_sections_respects_total_budget(monkeypatch):
+    """Fixed text plus trimmed sections stay within the prompt budget"""
+    monkeypatch.setattr(token_budget, "PROMPT_TOKEN_CAP", 3000)
+    fixed = "Instructions. " * 100
+    fitted = fit_sections(fixed, {"script": (_screenplay(), 0.6), "evidence": ("x\n" * 5000, 0.4)}, GEMINI, 1000)
+    total = sum(count_tokens(text, GEMINI) for text in [fixed, *fitted.values()])
+    assert total <= 3000
+    assert count_tokens(fitted["script"], GEMINI) > count_tokens(fitted["evidence"], GEMINI)
+
+
+def test_counts_are_memoized():
+    """Counting the same text again is a cache hit"""
+    text = _screenplay(50) + "unique-marker"
+    count_tokens(text, GEMINI)
+    hits = token_budget.get_token_count_stats()["hits"]
+    count_tokens(text, GEMINI)
+    assert token_budget.get_token_count_stats()["hits"] == hits + 1
+
+
+def test_memo_is_keyed_by_digest_not_text():
+    """An equal text built separately is a hit, and the memo holds digests rather than scripts"""
+    text = _screenplay(50) + "digest-marker"
+    count_tokens(text, GEMINI)
+    hits = token_budget.get_token_count_stats()["hits"]
+    assert count_tokens("".join(list(text)), GEMINI) == count_tokens(text, GEMINI)
+    assert token_budget.get_token_count_stats()["hits"] == hits + 2
+    assert all(len(digest) == 32 for _, digest in token_budget._counts)
+    assert count_tokens(text, {"provider": "openai", "model": "gpt-4o"}) != count_tokens(text, GEMINI)
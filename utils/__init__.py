@@ -10,23 +10,50 @@ from .pdf_script_extractor import (
 
 from .db_util import (
     get_connection,
+    pooled_connection,
+    transaction,
+    last_transaction_error,
+    close_pool,
+    get_pool_stats,
     init_database,
+    get_schema_version,
     create_script,
     get_script,
     get_all_scripts,
     get_scripts_by_genre,
+    list_scripts,
+    iter_scripts,
+    get_script_content,
     update_script,
+    recompress_scripts,
     delete_script,
+    delete_scripts,
+    search_scripts,
+    rebuild_search_index,
     create_product_placement,
+    bulk_create_product_placements,
     get_placements_by_script,
     create_actor,
+    bulk_create_actors,
     get_actor_by_tmdb_id,
     create_script_casting,
+    bulk_create_script_castings,
     get_casting_by_script,
     create_revenue_forecast,
+    bulk_create_revenue_forecasts,
     get_forecasts_by_script,
+    ScriptBundle,
+    get_script_bundle,
+    get_script_bundles,
     get_database_stats,
-    get_genre_distribution
+    get_genre_distribution,
+    rebuild_stats
+)
+
+from .async_db_util import (
+    AsyncDatabase,
+    get_async_db,
+    close_async_db
 )
 
 __all__ = [
@@ -34,21 +61,45 @@ __all__ = [
     'extract_pdf_text',
     'extract_pdf_text_simple',
     'get_connection',
+    'pooled_connection',
+    'transaction',
+    'last_transaction_error',
+    'close_pool',
+    'get_pool_stats',
     'init_database',
+    'get_schema_version',
     'create_script',
     'get_script',
     'get_all_scripts',
     'get_scripts_by_genre',
+    'list_scripts',
+    'iter_scripts',
+    'get_script_content',
     'update_script',
+    'recompress_scripts',
     'delete_script',
+    'delete_scripts',
+    'search_scripts',
+    'rebuild_search_index',
     'create_product_placement',
+    'bulk_create_product_placements',
     'get_placements_by_script',
     'create_actor',
+    'bulk_create_actors',
     'get_actor_by_tmdb_id',
     'create_script_casting',
+    'bulk_create_script_castings',
     'get_casting_by_script',
     'create_revenue_forecast',
+    'bulk_create_revenue_forecasts',
     'get_forecasts_by_script',
+    'ScriptBundle',
+    'get_script_bundle',
+    'get_script_bundles',
     'get_database_stats',
-    'get_genre_distribution'
+    'get_genre_distribution',
+    'rebuild_stats',
+    'AsyncDatabase',
+    'get_async_db',
+    'close_async_db'
 ]
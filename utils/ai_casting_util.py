@@ -1,9 +1,12 @@
 import os
 import re
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from langchain_core.prompts import PromptTemplate
-from utils.langchain_util import create_llm
+from utils.langchain_util import create_llm, invoke_llm, invoke_llm_json
+from utils.rate_limit import call_with_retry, rate_limited_get
+from utils.token_budget import fit_sections, output_token_limit
 from tmdbv3api import TMDb, Person
 from tavily import TavilyClient
 from langgraph.graph import StateGraph, START, END
@@ -36,7 +39,7 @@ def _tmdb_search_person(name: str) -> Dict[str, Any]:
         tmdb.api_key = api_key
         tmdb.language = "en"
         person_api = Person()
-        results = person_api.search(name)
+        results = call_with_retry("tmdb", person_api.search, name, api_key=api_key)
         if not results:
             return {}
         p = results[0]
@@ -52,7 +55,7 @@ def _tmdb_person_roles(person_id: int, max_roles: int = 3) -> List[Dict[str, Any
         if not api_key or not person_id:
             return []
         person_api = Person()
-        credits = person_api.movie_credits(person_id)
+        credits = call_with_retry("tmdb", person_api.movie_credits, person_id, api_key=api_key)
         cast = credits.get("cast", []) if isinstance(credits, dict) else getattr(credits, "cast", [])
         # Sort by popularity/vote_count descending
         cast_sorted = sorted(cast, key=lambda c: (c.get("vote_count", 0) or 0, c.get("popularity", 0) or 0), reverse=True)
@@ -76,7 +79,7 @@ def _omdb_lookup_title(title: str, year: str = "") -> Dict[str, Any]:
         params = {"apikey": key, "t": title}
         if year and year.isdigit():
             params["y"] = year
-        r = requests.get("http://www.omdbapi.com/", params=params, timeout=15)
+        r = rate_limited_get("omdb", "http://www.omdbapi.com/", api_key=key, params=params, timeout=15)
         if r.status_code == 200:
             return r.json()
         return {}
@@ -91,7 +94,7 @@ def _tavily_search_roles(actor_name: str, max_results: int = 3) -> List[Dict[str
             return []
         client = TavilyClient(api_key=api_key)
         q = f"best roles of {actor_name} filmography notable performances"
-        res = client.search(q, include_answer=False)
+        res = call_with_retry("tavily", client.search, q, api_key=api_key, include_answer=False)
         out = []
         for item in res.get("results", [])[:max_results]:
             out.append({"title": item.get("title", ""), "url": item.get("url", "")})
@@ -105,7 +108,8 @@ def generate_recommendations(
     selected_model: Dict[str, str],
     temperature: float = 0.4,
     max_tokens: int = 1200,
-    enabled_tools: Optional[Dict[str, bool]] = None
+    enabled_tools: Optional[Dict[str, bool]] = None,
+    use_cache: bool = True
 ) -> str:
     """
     Uses a simple LangGraph pipeline:
@@ -122,15 +126,12 @@ def generate_recommendations(
             "[{ 'name': 'Actor', 'target_role': 'short role desc in this script' }, ...]. "
             "Do not include prose."
         )
-        prompt = f"{sys_prompt}\n\nSCRIPT:\n{state['script_text'][:8000]}"
-        resp = llm.invoke(prompt)
-        text = resp.content if hasattr(resp, "content") else str(resp)
-        # Extract JSON
-        import json as _json
+        header = f"{sys_prompt}\n\nSCRIPT:\n"
+        fitted = fit_sections(header, {"script": (state["script_text"], 1.0)}, selected_model, max_tokens)
+        prompt = header + fitted["script"]
         try:
-            start = text.find("{")
-            end = text.rfind("}")
-            obj = _json.loads(text[start:end+1])
+            obj = invoke_llm_json(selected_model, prompt, temperature, max_tokens, purpose="casting_propose",
+                                  required=("candidates",), use_cache=use_cache)
             return {"candidates": obj.get("candidates", [])}
         except Exception:
             # fallback: single candidate list empty
@@ -176,12 +177,14 @@ def generate_recommendations(
                 "If mismatch is detected, exclude or flag and replace with a better fit.\n"
             )
         )
-        formatted = comp_template.format(
-            script_text=state.get("script_text", "")[:8000],
-            enriched=str(state.get("enriched", ""))[:8000]
+        # Script and tool evidence split what the template leaves of the budget, 60/40
+        fitted = fit_sections(
+            comp_template.format(script_text="", enriched=""),
+            {"script": (state.get("script_text", ""), 0.6), "evidence": (str(state.get("enriched", "")), 0.4)},
+            selected_model, max_tokens
         )
-        resp = llm.invoke(formatted)
-        text = resp.content if hasattr(resp, "content") else str(resp)
+        formatted = comp_template.format(script_text=fitted["script"], enriched=fitted["evidence"])
+        text = invoke_llm(llm, formatted, selected_model, temperature, max_tokens, use_cache=use_cache)
         return {"markdown": text}
 
     # Build and run graph
@@ -198,30 +201,153 @@ def generate_recommendations(
     return result.get("markdown", "No recommendations generated.")
 
 
-def score_actor_for_script(actor_name: str, script_text: str, selected_model: Dict[str, str], temperature: float = 0.2, max_tokens: int = 600) -> Dict[str, Any]:
+# Scoring prompts put the (long) script first and the actor last, so every actor scored
+# against the same script shares one prompt prefix that providers can cache server-side
+SCORE_PREFIX = "You are evaluating casting suitability for the SCRIPT.\n\nSCRIPT:\n{script_text}\n\n"
+SCORE_TASK = (
+    "Actor: {actor_name}\n\n"
+    "Task:\n"
+    "- Provide a 3-5 bullet justification referencing the script's roles, tone, and era/age consistency\n"
+    "- Output a final line: 'Score: NN/100' (integer 0-100)\n"
+)
+SCORE_BATCH_TASK = (
+    "Actors:\n{actor_list}\n\n"
+    "Task: for EACH actor above, in the same order:\n"
+    "- Start a section with the line '### <actor name>'\n"
+    "- Provide a 3-5 bullet justification referencing the script's roles, tone, and era/age consistency\n"
+    "- End the section with the line 'Score: NN/100' (integer 0-100)\n"
+)
+
+# Concurrent scoring calls made by score_actors_for_script()
+SCORING_MAX_WORKERS = int(os.getenv("SCORING_MAX_WORKERS", "4"))
+
+
+def _parse_score(text: str) -> Optional[int]:
+    m = re.search(r"Score:\s*(\d{1,3})\s*/\s*100", text)
+    if not m:
+        return None
+    score = int(m.group(1))
+    return score if 0 <= score <= 100 else None
+
+
+def _score_prefix(script_text: str, task_text: str, selected_model: Dict[str, str], max_tokens: int) -> str:
+    """
+    Shared script prefix, trimmed to the model's token budget (counts are memoized per script).
+    task_text is the task template, not the formatted task, so the prefix is identical for every actor.
+    """
+    fitted = fit_sections(SCORE_PREFIX.format(script_text="") + task_text, {"script": (script_text, 1.0)}, selected_model, max_tokens)
+    return SCORE_PREFIX.format(script_text=fitted["script"])
+
+
+def score_actor_for_script(actor_name: str, script_text: str, selected_model: Dict[str, str], temperature: float = 0.2, max_tokens: int = 600, use_cache: bool = True) -> Dict[str, Any]:
     llm = create_llm(selected_model, temperature=temperature, max_tokens=max_tokens)
-    template = (
-        "You are evaluating casting suitability for the SCRIPT.\n"
-        "Actor: {actor_name}\n\n"
-        "SCRIPT:\n{script_text}\n\n"
-        "Task:\n"
-        "- Provide a 3-5 bullet justification referencing the script's roles, tone, and era/age consistency\n"
-        "- Output a final line: 'Score: NN/100' (integer 0-100)\n"
-    )
     prompt = PromptTemplate(
-        input_variables=["actor_name", "script_text"],
-        template=template
+        input_variables=["actor_name"],
+        template=SCORE_TASK
     )
-    formatted = prompt.format(actor_name=actor_name, script_text=script_text[:20000])
-    resp = llm.invoke(formatted)
-    text = resp.content if hasattr(resp, "content") else str(resp)
-    m = re.search(r"Score:\s*(\d{1,3})\s*/\s*100", text)
-    score = None
-    if m:
+    formatted = _score_prefix(script_text, SCORE_TASK, selected_model, max_tokens) + prompt.format(actor_name=actor_name)
+    text = invoke_llm(llm, formatted, selected_model, temperature, max_tokens, use_cache=use_cache)
+    return {"analysis": text, "score": _parse_score(text)}
+
+
+def _normalize_heading(heading: str) -> str:
+    """Reduce a section heading or actor name to a comparable form ('1. **Ann Lee**:' -> 'ann lee')"""
+    heading = re.sub(r"^\s*(?:\d+[.)]|[-*\u2022])\s+", "", heading)
+    heading = heading.replace("**", "").replace("__", "").strip(" \t:.-")
+    return " ".join(heading.split()).casefold()
+
+
+def _split_batch_scores(text: str, actor_names: List[str]) -> Dict[str, str]:
+    """Map each actor to the '### <name>' section whose heading is exactly their name (numbering and bullets aside)."""
+    wanted = {_normalize_heading(name): name for name in actor_names}
+    sections = {}
+    parts = re.split(r"^#{2,4}\s*(.+?)\s*$", text, flags=re.MULTILINE)
+    for heading, body in zip(parts[1::2], parts[2::2]):
+        name = wanted.get(_normalize_heading(heading))
+        if name and name not in sections:
+            sections[name] = body.strip()
+    return sections
+
+
+def score_actors_for_script(
+    actor_names: List[str],
+    script_text: str,
+    selected_model: Dict[str, str],
+    temperature: float = 0.2,
+    max_tokens: int = 600,
+    max_workers: int = SCORING_MAX_WORKERS,
+    single_prompt: bool = False,
+    use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Score several actors against one script and rank them.
+
+    By default each actor is a separate call made concurrently (at most max_workers at a time).
+    Every call starts with the same script prefix: the first actor is scored alone to warm the
+    provider's prompt cache, then the rest fan out. With single_prompt=True all actors are scored
+    in one multi-actor call (max_tokens per actor), which suits models with large outputs. A cast that would
+    need more than the model's output limit is split into batches that each fit (first batch alone, then the rest);
+    an actor whose section heading isn't found by exact name in the response is scored with a call of their own.
+
+    Returns rows sorted by score (unscored last): rank, actor, score, latency_s, analysis, error.
+    """
+    names = list(dict.fromkeys(n for n in actor_names if n))
+    if not names:
+        return []
+
+    def score_one(name: str) -> Dict[str, Any]:
+        start = time.perf_counter()
         try:
-            score = int(m.group(1))
-        except Exception:
-            score = None
-    return {"analysis": text, "score": score}
+            result = score_actor_for_script(name, script_text, selected_model, temperature, max_tokens, use_cache=use_cache)
+            row = {"actor": name, "score": result["score"], "analysis": result["analysis"], "error": None}
+        except Exception as e:
+            row = {"actor": name, "score": None, "analysis": "", "error": str(e)}
+        row["latency_s"] = time.perf_counter() - start
+        return row
+
+    rows: Dict[str, Dict[str, Any]] = {}
+    if single_prompt:
+        # max_tokens per actor, but never more than the model can return: split the cast instead
+        limit = output_token_limit(selected_model)
+        per_batch = max(1, min(len(names), limit // max(1, max_tokens)))
+        batch_tokens = min(max_tokens * per_batch, limit)
+        batches = [names[i:i + per_batch] for i in range(0, len(names), per_batch)]
+        tasks = [SCORE_BATCH_TASK.format(actor_list="\n".join(f"- {n}" for n in batch)) for batch in batches]
+        prefix = _score_prefix(script_text, max(tasks, key=len), selected_model, batch_tokens)
+
+        def score_batch(i: int) -> Dict[str, Dict[str, Any]]:
+            start = time.perf_counter()
+            try:
+                llm = create_llm(selected_model, temperature=temperature, max_tokens=batch_tokens)
+                text = invoke_llm(llm, prefix + tasks[i], selected_model, temperature, batch_tokens, use_cache=use_cache)
+                sections, error = _split_batch_scores(text, batches[i]), None
+            except Exception as e:
+                sections, error = {}, str(e)
+            elapsed = time.perf_counter() - start
+            batch_rows = {}
+            for name in batches[i]:
+                analysis = sections.get(name, "")
+                batch_rows[name] = {"actor": name, "score": _parse_score(analysis), "latency_s": elapsed, "analysis": analysis,
+                                    "error": error or (None if analysis else "Actor missing from response")}
+            return batch_rows
+
+        rows.update(score_batch(0))
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            for batch_rows in pool.map(score_batch, range(1, len(batches))):
+                rows.update(batch_rows)
 
+        # Actors the response had no exactly matching section for get their own call
+        missing = [name for name, row in rows.items() if row["error"] == "Actor missing from response"]
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            for row in pool.map(score_one, missing):
+                rows[row["actor"]] = row
+    else:
+        rows[names[0]] = score_one(names[0])
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            for row in pool.map(score_one, names[1:]):
+                rows[row["actor"]] = row
 
+    ranked = sorted(rows.values(), key=lambda r: (r["score"] is None, -(r["score"] or 0), names.index(r["actor"])))
+    for rank, row in enumerate(ranked, 1):
+        row["rank"] = rank
+    return ranked
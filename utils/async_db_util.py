@@ -0,0 +1,334 @@
+"""
+Async database access layer for Movie Analytics Platform
+Exposes the utils/db_util.py operations as awaitables so pages can overlap
+database work with TMDb/LLM calls instead of blocking the script thread.
+
+Reads run on a small thread pool, each thread borrowing a pooled connection.
+Writes go through a single writer thread that drains whatever is queued and
+commits it as one transaction (group commit); each queued operation runs in
+its own SAVEPOINT, so one failing write does not undo the others. Operations
+that manage their own transactions (init_database) run alone on the writer
+thread, between batches.
+
+Example:
+    db = get_async_db()
+
+    async def load(script_id):
+        script, recs = await asyncio.gather(
+            db.get_script(script_id),
+            asyncio.to_thread(generate_recommendations, text, model),
+        )
+"""
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils import db_util
+
+# db_util operations exposed as awaitables on AsyncDatabase
+READ_OPERATIONS = (
+    'get_script',
+    'get_all_scripts',
+    'get_scripts_by_genre',
+    'list_scripts',
+    'get_script_content',
+    'search_scripts',
+    'get_placements_by_script',
+    'get_actor_by_tmdb_id',
+    'get_casting_by_script',
+    'get_forecasts_by_script',
+    'get_script_bundle',
+    'get_script_bundles',
+    'get_database_stats',
+    'get_genre_distribution',
+    'get_schema_version',
+)
+
+WRITE_OPERATIONS = (
+    'create_script',
+    'update_script',
+    'recompress_scripts',
+    'delete_script',
+    'delete_scripts',
+    'create_product_placement',
+    'bulk_create_product_placements',
+    'create_actor',
+    'bulk_create_actors',
+    'create_script_casting',
+    'bulk_create_script_castings',
+    'create_revenue_forecast',
+    'bulk_create_revenue_forecasts',
+    'rebuild_search_index',
+    'rebuild_stats',
+)
+
+# db_util operations run on the writer thread outside any batch transaction
+# (migrations toggle PRAGMA foreign_keys and commit each version on their own)
+EXCLUSIVE_OPERATIONS = (
+    'init_database',
+)
+
+# (fn, args, kwargs, future, exclusive)
+_WriteRequest = Tuple[Callable[..., Any], tuple, dict, Future, bool]
+
+
+class AsyncDatabase:
+    """
+    asyncio facade over db_util with a reader pool and a group-committing writer
+    """
+
+    def __init__(self, readers: int = 4, max_batch: int = 64):
+        """
+        Initialize the reader pool and start the writer thread
+
+        Args:
+            readers: Number of reader threads
+            max_batch: Maximum number of writes committed together
+        """
+        self.max_batch = max_batch
+        self.stats = {'reads': 0, 'writes': 0, 'commits': 0, 'failed_writes': 0}
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="db-reader")
+        self._writes: "queue.Queue[Optional[_WriteRequest]]" = queue.Queue()
+        self._closed = False
+        self._writer = threading.Thread(target=self._writer_loop, name="db-writer", daemon=True)
+        self._writer.start()
+
+    async def run_read(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a read-only callable on the reader pool
+
+        Args:
+            fn: Function using db_util connections (e.g. db_util.get_script)
+
+        Returns:
+            Any: The function's return value
+        """
+        if self._closed:
+            raise RuntimeError("AsyncDatabase is closed")
+        self.stats['reads'] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, partial(fn, *args, **kwargs))
+
+    async def run_write(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Queue a write for the writer thread and wait until it is committed
+
+        Args:
+            fn: Function performing writes through db_util (e.g. db_util.create_script)
+
+        Returns:
+            Any: The function's return value, available once its batch commits
+        """
+        return await self._queue_write(fn, args, kwargs, exclusive=False)
+
+    async def run_exclusive(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a callable on the writer thread by itself, outside any batch transaction
+
+        For operations that manage their own transactions or connection state
+        (e.g. db_util.init_database). Writes queued before it are committed first.
+
+        Args:
+            fn: Function to run on the writer thread
+
+        Returns:
+            Any: The function's return value
+        """
+        return await self._queue_write(fn, args, kwargs, exclusive=True)
+
+    async def _queue_write(self, fn: Callable[..., Any], args: tuple, kwargs: dict, exclusive: bool) -> Any:
+        """Queue a request for the writer thread and wait for its future"""
+        if self._closed:
+            raise RuntimeError("AsyncDatabase is closed")
+        future: Future = Future()
+        self._writes.put((fn, args, kwargs, future, exclusive))
+        return await asyncio.wrap_future(future)
+
+    def _writer_loop(self) -> None:
+        """Drain the write queue in batches until close() is called"""
+        while True:
+            request = self._writes.get()
+            if request is None:
+                return
+
+            if request[4]:
+                self._run_exclusive(request)
+                continue
+
+            batch = [request]
+            exclusive = None
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    request = self._writes.get_nowait()
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                if request[4]:
+                    # Runs after the writes queued before it are committed
+                    exclusive = request
+                    break
+                batch.append(request)
+
+            self._commit_batch(batch)
+            if exclusive is not None:
+                self._run_exclusive(exclusive)
+            if stop:
+                return
+
+    def _commit_batch(self, batch: List[_WriteRequest]) -> None:
+        """Run a batch of writes in one transaction and resolve their futures"""
+        outcomes = []
+        try:
+            with db_util.transaction():
+                for fn, args, kwargs, future, _ in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with db_util.transaction():
+                            outcomes.append((future, fn(*args, **kwargs), None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+        except Exception as e:
+            # BEGIN or COMMIT failed: nothing in the batch was persisted, including
+            # writes that never got to run (e.g. the database was locked)
+            for _, _, _, future, _ in batch:
+                if not future.done():
+                    self.stats['failed_writes'] += 1
+                    future.set_exception(e)
+            return
+
+        self.stats['commits'] += 1
+        for future, value, error in outcomes:
+            if error is None:
+                self.stats['writes'] += 1
+                future.set_result(value)
+            else:
+                self.stats['failed_writes'] += 1
+                future.set_exception(error)
+
+    def _run_exclusive(self, request: _WriteRequest) -> None:
+        """Run one request with no enclosing transaction and resolve its future"""
+        fn, args, kwargs, future, _ = request
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            value = fn(*args, **kwargs)
+        except Exception as e:
+            future.set_exception(e)
+            return
+        future.set_result(value)
+
+    def close(self) -> None:
+        """Flush queued writes and stop the writer thread and reader pool"""
+        if self._closed:
+            return
+        self._closed = True
+        self._writes.put(None)
+        self._writer.join()
+        self._readers.shutdown(wait=True)
+
+
+def _read_operation(name: str) -> Callable[..., Any]:
+    fn = getattr(db_util, name)
+
+    async def operation(self: AsyncDatabase, *args, **kwargs) -> Any:
+        return await self.run_read(fn, *args, **kwargs)
+
+    operation.__name__ = name
+    operation.__doc__ = f"Awaitable db_util.{name}() (runs on the reader pool)"
+    return operation
+
+
+def _write_failed(name: str, args: tuple, result: Any, error: Optional[BaseException]) -> bool:
+    """Whether a db_util write helper reported failure through its return value"""
+    if result is None or result is False:
+        return True
+    if error is not None and not result:
+        return True
+    # bulk_* helpers return [] on failure, including bad input rejected before any SQL ran
+    return name.startswith('bulk_') and result == [] and bool(args and args[0])
+
+
+def _write_operation(name: str) -> Callable[..., Any]:
+    fn = getattr(db_util, name)
+
+    def checked(*args, **kwargs) -> Any:
+        # db_util helpers print and return a falsy value instead of raising; raise instead,
+        # so the write is counted as failed and its awaiter sees the error
+        before = db_util.last_transaction_error()
+        result = fn(*args, **kwargs)
+        error = db_util.last_transaction_error()
+        error = error if error is not before else None
+        if _write_failed(name, args, result, error):
+            if isinstance(error, Exception):
+                raise error
+            raise RuntimeError(f"db_util.{name}() failed")
+        return result
+
+    async def operation(self: AsyncDatabase, *args, **kwargs) -> Any:
+        return await self.run_write(checked, *args, **kwargs)
+
+    operation.__name__ = name
+    operation.__doc__ = f"Awaitable db_util.{name}() (group-committed by the writer thread)"
+    return operation
+
+
+def _exclusive_operation(name: str) -> Callable[..., Any]:
+    fn = getattr(db_util, name)
+
+    async def operation(self: AsyncDatabase, *args, **kwargs) -> Any:
+        return await self.run_exclusive(fn, *args, **kwargs)
+
+    operation.__name__ = name
+    operation.__doc__ = f"Awaitable db_util.{name}() (runs alone on the writer thread, outside any batch)"
+    return operation
+
+
+for _name in READ_OPERATIONS:
+    setattr(AsyncDatabase, _name, _read_operation(_name))
+for _name in WRITE_OPERATIONS:
+    setattr(AsyncDatabase, _name, _write_operation(_name))
+for _name in EXCLUSIVE_OPERATIONS:
+    setattr(AsyncDatabase, _name, _exclusive_operation(_name))
+
+
+_async_db: Optional[AsyncDatabase] = None
+_async_db_lock = threading.Lock()
+
+
+def get_async_db() -> AsyncDatabase:
+    """
+    Get the shared AsyncDatabase instance (created on first use)
+
+    Returns:
+        AsyncDatabase: Process-wide async database facade
+    """
+    global _async_db
+    with _async_db_lock:
+        if _async_db is None or _async_db._closed:
+            _async_db = AsyncDatabase()
+        return _async_db
+
+
+def close_async_db() -> Dict[str, int]:
+    """
+    Close the shared AsyncDatabase instance
+
+    Returns:
+        dict: Final read/write/commit counters
+    """
+    global _async_db
+    with _async_db_lock:
+        if _async_db is None:
+            return {}
+        _async_db.close()
+        stats = dict(_async_db.stats)
+        _async_db = None
+        return stats
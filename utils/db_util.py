@@ -4,48 +4,559 @@ Provides reusable database operations for scripts, actors, placements, and forec
 """
 
 import sqlite3
+import json
 import os
+import re
+import queue
+import threading
+import zlib
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Optional, Tuple, Any, Iterator, NamedTuple
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
 
 # Database configuration
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'db', 'movie_analytics.db')
 
+# Maximum number of connections the pool has open (checked out plus idle)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
 
-def get_connection() -> sqlite3.Connection:
+# Seconds acquire() waits for a connection to be released once all are checked out
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# PRAGMAs applied once when a connection is opened
+DB_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 268435456,   # 256 MB
+    'cache_size': -16000,     # ~16 MB page cache (negative = KiB)
+    'busy_timeout': 5000,     # ms to wait on a locked database
+    'temp_store': 'MEMORY',
+    'foreign_keys': 'ON',
+}
+
+# Default storage format for new script content: 'none', 'zlib' or 'zstd'
+SCRIPT_COMPRESSION = os.getenv("SCRIPT_COMPRESSION", "none")
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+# ==================== CONTENT COMPRESSION ====================
+
+def _encode_content(content: str, compression: Optional[str] = None) -> Tuple[Any, str]:
     """
-    Get database connection with row factory enabled
+    Encode script content for storage
+    
+    Args:
+        content: Plain-text script content
+        compression: 'none', 'zlib' or 'zstd' (defaults to SCRIPT_COMPRESSION)
     
     Returns:
-        sqlite3.Connection: Database connection object
+        tuple: (value to store, content_format flag for the row)
+    """
+    compression = compression or SCRIPT_COMPRESSION
+    if compression == 'none':
+        return content, 'text'
+    if compression == 'zlib':
+        return zlib.compress(content.encode('utf-8'), ZLIB_LEVEL), 'zlib'
+    if compression == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard is not installed; use 'zlib' compression instead")
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(content.encode('utf-8')), 'zstd'
+    raise ValueError(f"Unknown script compression: {compression}")
+
+
+def _decode_content(value: Any, content_format: Optional[str]) -> Optional[str]:
     """
-    conn = sqlite3.connect(DB_PATH)
+    Decode stored script content back to text
+    
+    Args:
+        value: Stored content (TEXT or compressed BLOB)
+        content_format: Row format flag ('text', 'zlib' or 'zstd')
+    
+    Returns:
+        str: Plain-text script content
+    """
+    if value is None or content_format in (None, 'text'):
+        return value
+    if content_format == 'zlib':
+        return zlib.decompress(value).decode('utf-8')
+    if content_format == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard is not installed; cannot read zstd-compressed script")
+        return zstandard.ZstdDecompressor().decompress(value).decode('utf-8')
+    raise ValueError(f"Unknown script content format: {content_format}")
+
+
+def _script_row(row: sqlite3.Row) -> Dict[str, Any]:
+    """Convert a scripts row to a dict with content decoded and the format flag removed"""
+    script = dict(row)
+    content_format = script.pop('content_format', None)
+    if 'content' in script:
+        script['content'] = _decode_content(script['content'], content_format)
+    return script
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """
+    Open a new SQLite connection with row factory and PRAGMAs applied
+    
+    Args:
+        db_path: Path to the database file
+    
+    Returns:
+        sqlite3.Connection: Configured connection in autocommit mode
+    """
+    db_dir = os.path.dirname(db_path)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+    
+    # isolation_level=None: transactions are controlled explicitly via transaction()
+    conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
     conn.row_factory = sqlite3.Row
+    for pragma, value in DB_PRAGMAS.items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
     return conn
 
 
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of configured SQLite connections
+    
+    Connections are opened lazily, handed out to one thread at a time and
+    returned to an idle queue on release, so PRAGMAs are applied once per
+    connection instead of once per query. At most max_size connections are
+    checked out at once; further callers block until one is released.
+    """
+    
+    def __init__(self, db_path: str, max_size: int = DB_POOL_SIZE, timeout: float = DB_POOL_TIMEOUT):
+        """
+        Initialize the pool
+        
+        Args:
+            db_path: Path to the database file
+            max_size: Maximum number of connections checked out (and kept idle)
+            timeout: Seconds acquire() waits when every connection is checked out
+        """
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {'opened': 0, 'reused': 0, 'discarded': 0, 'waits': 0, 'in_use': 0}
+    
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Borrow a connection, opening a new one if none is idle
+        
+        Blocks while max_size connections are checked out.
+        
+        Returns:
+            sqlite3.Connection: Connection owned by the caller until release()
+        
+        Raises:
+            TimeoutError: If no connection was released within the pool timeout
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.stats['waits'] += 1
+            if not self._slots.acquire(timeout=self.timeout):
+                raise TimeoutError(
+                    f"No database connection released within {self.timeout:g}s "
+                    f"({self.max_size} checked out; raise DB_POOL_SIZE?)"
+                )
+        
+        try:
+            conn = self._idle.get_nowait()
+            stat = 'reused'
+        except queue.Empty:
+            try:
+                conn = _connect(self.db_path)
+            except BaseException:
+                self._slots.release()
+                raise
+            stat = 'opened'
+        with self._lock:
+            self.stats[stat] += 1
+            self.stats['in_use'] += 1
+        return conn
+    
+    def release(self, conn: sqlite3.Connection) -> None:
+        """
+        Return a connection to the pool (or close it if the pool is full)
+        
+        Args:
+            conn: Connection previously obtained from acquire()
+        """
+        try:
+            self._return(conn)
+        finally:
+            with self._lock:
+                self.stats['in_use'] -= 1
+            self._slots.release()
+    
+    def _return(self, conn: sqlite3.Connection) -> None:
+        """Roll back any open transaction and park the connection as idle (or close it)"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            conn.close()
+            return
+        
+        if self._closed or self._idle.qsize() >= self.max_size:
+            conn.close()
+            with self._lock:
+                self.stats['discarded'] += 1
+            return
+        self._idle.put(conn)
+    
+    def close(self) -> None:
+        """Close all idle connections and stop pooling"""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+_local = threading.local()
+
+
+def _get_pool() -> ConnectionPool:
+    """Return the module pool, recreating it if DB_PATH has changed"""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.db_path != DB_PATH:
+            if _pool is not None:
+                _pool.close()
+            _pool = ConnectionPool(DB_PATH)
+        return _pool
+
+
+def close_pool() -> None:
+    """Close all pooled connections (e.g. at shutdown or in tests)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def get_pool_stats() -> Dict[str, int]:
+    """
+    Get connection pool counters
+    
+    Returns:
+        dict: Opened, reused, discarded and waited-for connection counts plus in-use and idle sizes
+    """
+    pool = _get_pool()
+    stats = dict(pool.stats)
+    stats['idle'] = pool._idle.qsize()
+    return stats
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Get a standalone database connection with row factory and PRAGMAs applied
+    
+    The caller owns the connection and must close it. Library code should
+    prefer pooled_connection() or transaction().
+    
+    Returns:
+        sqlite3.Connection: Database connection object
+    """
+    return _connect(DB_PATH)
+
+
+@contextmanager
+def pooled_connection() -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a pooled connection for the duration of the block
+    
+    Nested use on the same thread reuses the connection already borrowed,
+    so helpers can be composed inside a single transaction.
+    
+    Yields:
+        sqlite3.Connection: Pooled connection
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        yield conn
+        return
+    
+    pool = _get_pool()
+    conn = pool.acquire()
+    _local.conn = conn
+    _local.depth = 0
+    try:
+        yield conn
+    finally:
+        _local.conn = None
+        pool.release(conn)
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """
+    Run a block inside a write transaction on a pooled connection
+    
+    Commits on success and rolls back on error. Nested calls on the same
+    thread become SAVEPOINTs, so a failing inner block only undoes its own
+    work while the outer transaction continues.
+    
+    Yields:
+        sqlite3.Connection: Connection with an open transaction
+    """
+    with pooled_connection() as conn:
+        depth = _local.depth
+        savepoint = f"sp_{depth}"
+        if depth == 0:
+            conn.execute("BEGIN IMMEDIATE")
+        else:
+            conn.execute(f"SAVEPOINT {savepoint}")
+        _local.depth = depth + 1
+        try:
+            yield conn
+        except BaseException as e:
+            _local.depth = depth
+            _local.last_error = e
+            if depth == 0:
+                conn.rollback()
+            else:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            raise
+        _local.depth = depth
+        if depth == 0:
+            conn.commit()
+        else:
+            conn.execute(f"RELEASE {savepoint}")
+
+
+def last_transaction_error() -> Optional[BaseException]:
+    """
+    Get the most recent exception that rolled back a transaction() block on this thread
+    
+    The helpers below print errors and return a falsy value instead of raising;
+    callers that need the cause (e.g. the async writer) compare this before and after.
+    
+    Returns:
+        BaseException: Last rollback cause, or None if there was none
+    """
+    return getattr(_local, 'last_error', None)
+
+
+# ==================== SCHEMA MIGRATIONS ====================
+
+# Ordered schema migrations: NNN_description.sql, applied once each
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'sql', 'migrations')
+
+_MIGRATION_FILE = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+# Tables whose script_id foreign key gained ON DELETE CASCADE (castings do not cascade from actors)
+CASCADE_TABLES = ('product_placements', 'script_casting', 'revenue_forecasts')
+
+
+@lru_cache(maxsize=None)
+def _load_migrations(migrations_dir: str) -> Tuple[Tuple[int, str, str], ...]:
+    """
+    List migration files in version order
+    
+    Args:
+        migrations_dir: Directory containing NNN_description.sql files
+    
+    Returns:
+        tuple: (version, name, path) for each migration
+    """
+    migrations = []
+    for file_name in os.listdir(migrations_dir):
+        match = _MIGRATION_FILE.match(file_name)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2),
+                               os.path.join(migrations_dir, file_name)))
+    migrations.sort()
+    
+    versions = [m[0] for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"Duplicate migration versions in {migrations_dir}")
+    return tuple(migrations)
+
+
+def _split_sql(script: str) -> List[str]:
+    """
+    Split a SQL script into statements (trigger bodies stay intact)
+    
+    Args:
+        script: SQL text; lines starting with '--' are ignored
+    
+    Returns:
+        list: Individual SQL statements
+    """
+    statements = []
+    buffer = ''
+    for line in script.splitlines(keepends=True):
+        if line.lstrip().startswith('--'):
+            continue
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ''
+    if buffer.strip():
+        raise ValueError(f"Incomplete SQL statement: {buffer.strip()[:80]}")
+    return statements
+
+
+def _schema_version(conn: sqlite3.Connection) -> int:
+    """Return the applied schema version (0 for an unversioned database)"""
+    try:
+        return conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0] or 0
+    except sqlite3.OperationalError:
+        return 0
+
+
+def get_schema_version() -> int:
+    """
+    Get the schema version of the database
+    
+    Returns:
+        int: Highest applied migration version (0 if none)
+    """
+    with pooled_connection() as conn:
+        return _schema_version(conn)
+
+
+def _adopt_unversioned_database(conn: sqlite3.Connection, baseline_sql: str) -> None:
+    """
+    Bring a database created before schema versioning up to the baseline
+    
+    Handles the changes the idempotent baseline cannot express: adding the
+    content_format column and rebuilding child tables whose script_id lacks
+    ON DELETE CASCADE (SQLite cannot alter constraints, so each table is
+    recreated from its baseline definition). Rows referencing a missing script
+    or actor cannot be kept under enforced foreign keys; they are dropped and
+    the count is reported. Indexes, triggers and derived data are then
+    recreated by the baseline migration itself, and migration 003 replaces
+    any older search index.
+    
+    Args:
+        conn: Connection inside a transaction with foreign keys disabled
+        baseline_sql: Contents of the baseline migration
+    """
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'scripts'").fetchone()
+    if row is None:
+        return
+    
+    if 'content_format' not in row['sql']:
+        conn.execute("ALTER TABLE scripts ADD COLUMN content_format TEXT NOT NULL DEFAULT 'text'")
+    
+    for table in CASCADE_TABLES:
+        fks = conn.execute(f"PRAGMA foreign_key_list({table})").fetchall()
+        if not fks or any(fk['table'] == 'scripts' and fk['on_delete'] == 'CASCADE' for fk in fks):
+            continue
+        
+        match = re.search(rf"CREATE TABLE IF NOT EXISTS {table} \((.*?)\n\);", baseline_sql, re.S)
+        conn.execute(f"CREATE TABLE {table}_new ({match.group(1)})")
+        
+        columns = ', '.join(row['name'] for row in conn.execute(f"PRAGMA table_info({table})"))
+        valid = " AND ".join(
+            f"({fk['from']} IS NULL OR {fk['from']} IN (SELECT id FROM {fk['table']}))"
+            for fk in conn.execute(f"PRAGMA foreign_key_list({table}_new)")
+        )
+        copied = conn.execute(f"INSERT INTO {table}_new ({columns}) SELECT {columns} FROM {table} WHERE {valid}").rowcount
+        orphans = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] - copied
+        if orphans:
+            print(f"Dropped {orphans} orphaned row(s) from {table} while adding ON DELETE CASCADE")
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+
+def _apply_migration(conn: sqlite3.Connection, version: int, name: str, path: str) -> None:
+    """
+    Apply one migration file atomically and record it in schema_version
+    
+    Runs with foreign keys disabled (so migrations may rebuild tables) and
+    checks foreign key integrity before committing. A migration already
+    applied by another process while waiting for the write lock is skipped.
+    
+    Args:
+        conn: Pooled connection (not inside a transaction)
+        version: Migration version
+        name: Migration name
+        path: Path to the migration SQL file
+    """
+    with open(path, 'r') as f:
+        sql = f.read()
+    
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        with transaction():
+            if _schema_version(conn) >= version:
+                return
+            
+            if version == 1:
+                _adopt_unversioned_database(conn, sql)
+            
+            for statement in _split_sql(sql):
+                conn.execute(statement)
+            
+            if version == 3:
+                _index_compressed_scripts(conn)
+            
+            if conn.execute("PRAGMA foreign_key_check").fetchone() is not None:
+                raise sqlite3.IntegrityError(f"Migration {version}_{name} left foreign key violations")
+            
+            # Migration files record themselves (for the sqlite3 CLI); this also covers ones that do not
+            conn.execute("INSERT OR REPLACE INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                         (version, name, datetime.now()))
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON")
+
+
 def init_database() -> bool:
     """
-    Initialize database with schema from sql/schema.sql
+    Initialize database and apply pending migrations from sql/migrations
+    
+    When the schema is already current this is a single version query, so
+    it is cheap to call on every startup.
     
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        schema_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'sql', 'schema.sql')
+        migrations = _load_migrations(MIGRATIONS_DIR)
         
-        if not os.path.exists(schema_path):
-            print(f"Schema file not found: {schema_path}")
+        if not migrations:
+            print(f"No migrations found in: {MIGRATIONS_DIR}")
             return False
         
-        with open(schema_path, 'r') as f:
-            schema_sql = f.read()
-        
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.executescript(schema_sql)
-        conn.commit()
-        conn.close()
+        with pooled_connection() as conn:
+            current = _schema_version(conn)
+            if current >= migrations[-1][0]:
+                return True
+            
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            for version, name, path in migrations:
+                if version > current:
+                    _apply_migration(conn, version, name, path)
         
         return True
     
@@ -54,9 +565,32 @@ def init_database() -> bool:
         return False
 
 
+def _inserted_ids(cursor: sqlite3.Cursor, table: str, count: int) -> List[int]:
+    """
+    Get the ids generated by the last executemany() INSERT into an AUTOINCREMENT table
+    
+    Must run in the same write transaction as the INSERT: the write lock
+    guarantees the ids are contiguous and end at the table's sequence value.
+    
+    Args:
+        cursor: Cursor that ran the INSERT
+        table: Table name
+        count: Number of rows inserted
+    
+    Returns:
+        list: Generated ids in insertion order
+    """
+    if count == 0:
+        return []
+    cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+    last_id = cursor.fetchone()['seq']
+    return list(range(last_id - count + 1, last_id + 1))
+
+
 # ==================== SCRIPTS OPERATIONS ====================
 
-def create_script(title: str, genre: str, content: str) -> Optional[int]:
+def create_script(title: str, genre: str, content: str,
+                  compression: Optional[str] = None) -> Optional[int]:
     """
     Create a new script in the database
     
@@ -64,22 +598,25 @@ def create_script(title: str, genre: str, content: str) -> Optional[int]:
         title: Script title
         genre: Script genre
         content: Script content
+        compression: 'none', 'zlib' or 'zstd' (defaults to SCRIPT_COMPRESSION)
     
     Returns:
         int: Script ID if successful, None otherwise
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO scripts (title, genre, content, created_at, modified_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, (title, genre, content, datetime.now(), datetime.now()))
+        stored_content, content_format = _encode_content(content, compression)
         
-        script_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                INSERT INTO scripts (title, genre, content, content_format, created_at, modified_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (title, genre, stored_content, content_format, datetime.now(), datetime.now()))
+            
+            script_id = cursor.lastrowid
+            if content_format != 'text':
+                _index_script(conn, script_id, content)
         
         return script_id
     
@@ -99,15 +636,14 @@ def get_script(script_id: int) -> Optional[Dict[str, Any]]:
         dict: Script data or None if not found
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM scripts WHERE id = ?", (script_id,))
-        row = cursor.fetchone()
-        conn.close()
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT * FROM scripts WHERE id = ?", (script_id,))
+            row = cursor.fetchone()
         
         if row:
-            return dict(row)
+            return _script_row(row)
         return None
     
     except Exception as e:
@@ -115,55 +651,183 @@ def get_script(script_id: int) -> Optional[Dict[str, Any]]:
         return None
 
 
-def get_all_scripts() -> List[Dict[str, Any]]:
+# Columns returned by listing functions; content is only loaded on request
+SCRIPT_LIST_COLUMNS = ('id', 'title', 'genre', 'created_at', 'modified_at')
+
+# Keyset cursor: (created_at, id) of the last script on the previous page
+ScriptCursor = Tuple[str, int]
+
+
+def _script_columns(include_content: bool) -> str:
+    """Build the SELECT column list for script listings"""
+    columns = list(SCRIPT_LIST_COLUMNS)
+    if include_content:
+        columns.extend(['content', 'content_format'])
+    return ', '.join(columns)
+
+
+def get_all_scripts(include_content: bool = True) -> List[Dict[str, Any]]:
     """
     Get all scripts from database
     
+    Prefer list_scripts()/iter_scripts() for large tables.
+    
+    Args:
+        include_content: Load the full script content (default True)
+    
     Returns:
         list: List of script dictionaries
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"SELECT {_script_columns(include_content)} FROM scripts "
+                           "ORDER BY created_at DESC, id DESC")
+            rows = cursor.fetchall()
         
-        cursor.execute("SELECT * FROM scripts ORDER BY created_at DESC")
-        rows = cursor.fetchall()
-        conn.close()
-        
-        return [dict(row) for row in rows]
+        return [_script_row(row) for row in rows]
     
     except Exception as e:
         print(f"Error getting scripts: {str(e)}")
         return []
 
 
-def get_scripts_by_genre(genre: str) -> List[Dict[str, Any]]:
+def get_scripts_by_genre(genre: str, include_content: bool = True) -> List[Dict[str, Any]]:
     """
     Get scripts filtered by genre
     
     Args:
         genre: Genre to filter by
+        include_content: Load the full script content (default True)
     
     Returns:
         list: List of script dictionaries
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM scripts WHERE genre = ? ORDER BY created_at DESC", (genre,))
-        rows = cursor.fetchall()
-        conn.close()
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"SELECT {_script_columns(include_content)} FROM scripts "
+                           "WHERE genre = ? ORDER BY created_at DESC, id DESC", (genre,))
+            rows = cursor.fetchall()
         
-        return [dict(row) for row in rows]
+        return [_script_row(row) for row in rows]
     
     except Exception as e:
         print(f"Error getting scripts by genre: {str(e)}")
         return []
 
 
+def list_scripts(limit: int = 50, after: Optional[ScriptCursor] = None,
+                 genre: Optional[str] = None,
+                 include_content: bool = False) -> Tuple[List[Dict[str, Any]], Optional[ScriptCursor]]:
+    """
+    Get one page of scripts, newest first, using keyset pagination
+    
+    Pages are located with an index seek on (created_at, id), so the cost of
+    a page does not grow with how deep into the listing it is.
+    
+    Args:
+        limit: Page size
+        after: Cursor returned with the previous page (None for the first page)
+        genre: Only list scripts of this genre (optional)
+        include_content: Load the full script content (default False)
+    
+    Returns:
+        tuple: (list of script dictionaries, cursor for the next page or None)
+    """
+    try:
+        conditions = []
+        params: List[Any] = []
+        
+        if genre is not None:
+            conditions.append("genre = ?")
+            params.append(genre)
+        
+        if after is not None:
+            conditions.append("(created_at, id) < (?, ?)")
+            params.extend(after)
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+        
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f"""
+                SELECT {_script_columns(include_content)} FROM scripts
+                {where}
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+            """, params)
+            rows = [_script_row(row) for row in cursor.fetchall()]
+        
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = (rows[-1]['created_at'], rows[-1]['id'])
+        
+        return rows, next_cursor
+    
+    except Exception as e:
+        print(f"Error listing scripts: {str(e)}")
+        return [], None
+
+
+def iter_scripts(page_size: int = 500, genre: Optional[str] = None,
+                 include_content: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over all scripts, newest first, one page at a time
+    
+    Only one page is held in memory, so walking the whole table uses
+    constant memory regardless of its size.
+    
+    Args:
+        page_size: Number of rows fetched per query
+        genre: Only yield scripts of this genre (optional)
+        include_content: Load the full script content (default False)
+    
+    Yields:
+        dict: Script dictionary
+    """
+    cursor = None
+    while True:
+        rows, cursor = list_scripts(limit=page_size, after=cursor, genre=genre,
+                                    include_content=include_content)
+        yield from rows
+        if cursor is None:
+            return
+
+
+def get_script_content(script_id: int) -> Optional[str]:
+    """
+    Get only the content of a script
+    
+    Args:
+        script_id: Script ID
+    
+    Returns:
+        str: Script content or None if not found
+    """
+    try:
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT content, content_format FROM scripts WHERE id = ?", (script_id,))
+            row = cursor.fetchone()
+        
+        if row:
+            return _decode_content(row['content'], row['content_format'])
+        return None
+    
+    except Exception as e:
+        print(f"Error getting script content: {str(e)}")
+        return None
+
+
 def update_script(script_id: int, title: Optional[str] = None, 
-                 genre: Optional[str] = None, content: Optional[str] = None) -> bool:
+                 genre: Optional[str] = None, content: Optional[str] = None,
+                 compression: Optional[str] = None) -> bool:
     """
     Update script fields
     
@@ -172,14 +836,12 @@ def update_script(script_id: int, title: Optional[str] = None,
         title: New title (optional)
         genre: New genre (optional)
         content: New content (optional)
+        compression: Storage format for new content (defaults to SCRIPT_COMPRESSION)
     
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
         updates = []
         params = []
         
@@ -192,8 +854,11 @@ def update_script(script_id: int, title: Optional[str] = None,
             params.append(genre)
         
         if content is not None:
+            stored_content, content_format = _encode_content(content, compression)
             updates.append("content = ?")
-            params.append(content)
+            params.append(stored_content)
+            updates.append("content_format = ?")
+            params.append(content_format)
         
         if not updates:
             return False
@@ -203,10 +868,10 @@ def update_script(script_id: int, title: Optional[str] = None,
         params.append(script_id)
         
         sql = f"UPDATE scripts SET {', '.join(updates)} WHERE id = ?"
-        cursor.execute(sql, params)
-        
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            conn.execute(sql, params)
+            if content is not None and content_format != 'text':
+                _index_script(conn, script_id, content)
         
         return True
     
@@ -215,10 +880,60 @@ def update_script(script_id: int, title: Optional[str] = None,
         return False
 
 
+def recompress_scripts(compression: str = 'zlib', batch_size: int = 200) -> int:
+    """
+    Convert stored script content to another storage format
+    
+    Rows are rewritten in batches (one transaction per batch); rows already in
+    the target format are skipped. Run VACUUM afterwards to shrink the file.
+    
+    Args:
+        compression: Target format: 'none', 'zlib' or 'zstd'
+        batch_size: Number of scripts per transaction
+    
+    Returns:
+        int: Number of scripts rewritten
+    """
+    converted = 0
+    last_id = 0
+    
+    try:
+        target_format = _encode_content('', compression)[1]
+        
+        while True:
+            with transaction() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    SELECT id, content, content_format FROM scripts
+                    WHERE id > ? AND content_format != ?
+                    ORDER BY id LIMIT ?
+                """, (last_id, target_format, batch_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                
+                updates = []
+                for row in rows:
+                    text = _decode_content(row['content'], row['content_format'])
+                    updates.append((*_encode_content(text, compression), row['id']))
+                cursor.executemany("UPDATE scripts SET content = ?, content_format = ? WHERE id = ?", updates)
+                
+                last_id = rows[-1]['id']
+                converted += len(rows)
+        
+        return converted
+    
+    except Exception as e:
+        print(f"Error recompressing scripts: {str(e)}")
+        return converted
+
+
 def delete_script(script_id: int) -> bool:
     """
     Delete script and all related data
     
+    Placements, castings and forecasts are removed by ON DELETE CASCADE.
+    
     Args:
         script_id: Script ID
     
@@ -226,22 +941,149 @@ def delete_script(script_id: int) -> bool:
         bool: True if successful, False otherwise
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with transaction() as conn:
+            conn.execute("DELETE FROM scripts WHERE id = ?", (script_id,))
         
-        # Delete related records first
-        cursor.execute("DELETE FROM product_placements WHERE script_id = ?", (script_id,))
-        cursor.execute("DELETE FROM script_casting WHERE script_id = ?", (script_id,))
-        cursor.execute("DELETE FROM revenue_forecasts WHERE script_id = ?", (script_id,))
-        cursor.execute("DELETE FROM scripts WHERE id = ?", (script_id,))
+        return True
+    
+    except Exception as e:
+        print(f"Error deleting script: {str(e)}")
+        return False
+
+
+def delete_scripts(script_ids: List[int], chunk_size: int = 500) -> int:
+    """
+    Delete many scripts and all related data in a single transaction
+    
+    Args:
+        script_ids: Script IDs to delete
+        chunk_size: Number of ids bound per DELETE statement
+    
+    Returns:
+        int: Number of scripts deleted (0 on failure, nothing is deleted)
+    """
+    try:
+        ids = list(dict.fromkeys(script_ids))
+        deleted = 0
         
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            cursor = conn.cursor()
+            for i in range(0, len(ids), chunk_size):
+                chunk = ids[i:i + chunk_size]
+                placeholders = ', '.join('?' for _ in chunk)
+                cursor.execute(f"DELETE FROM scripts WHERE id IN ({placeholders})", chunk)
+                deleted += cursor.rowcount
+        
+        return deleted
+    
+    except Exception as e:
+        print(f"Error deleting scripts: {str(e)}")
+        return 0
+
+
+# ==================== FULL-TEXT SEARCH ====================
+
+# scripts_fts keeps its own copy of each script's text. Triggers index rows
+# stored as plain text; compressed rows are indexed here, since SQL (and so
+# any client other than this module) cannot decompress them.
+
+def _index_script(conn: sqlite3.Connection, script_id: int, content: str) -> None:
+    """Replace a script's search index entry with the given text (caller holds a transaction)"""
+    conn.execute("DELETE FROM scripts_fts WHERE rowid = ?", (script_id,))
+    conn.execute("""
+        INSERT INTO scripts_fts (rowid, title, genre, content)
+        SELECT id, title, genre, ? FROM scripts WHERE id = ?
+    """, (content, script_id))
+
+
+def _index_compressed_scripts(conn: sqlite3.Connection) -> int:
+    """Index every compressed script (caller holds a transaction); returns the number indexed"""
+    rows = conn.execute("SELECT id, content, content_format FROM scripts WHERE content_format != 'text'").fetchall()
+    for row in rows:
+        _index_script(conn, row['id'], _decode_content(row['content'], row['content_format']))
+    return len(rows)
+
+
+def _fts_query(query: str) -> str:
+    """
+    Turn free text into a safe FTS5 query (all terms must match)
+    
+    Each term is quoted so punctuation or FTS operators typed by the user
+    cannot cause syntax errors. A trailing '*' is kept for prefix search.
+    """
+    terms = []
+    for term in query.split():
+        prefix = term.endswith('*')
+        term = term.rstrip('*').replace('"', '""')
+        if term:
+            terms.append(f'"{term}"*' if prefix else f'"{term}"')
+    return ' '.join(terms)
+
+
+def search_scripts(query: str, limit: int = 20, offset: int = 0,
+                   raw: bool = False) -> List[Dict[str, Any]]:
+    """
+    Full-text search over script titles, genres and content
+    
+    Results are ranked with BM25 (title matches weigh most) and include a
+    highlighted snippet of the matching content.
+    
+    Args:
+        query: Search text (brands, locations, character names, ...)
+        limit: Maximum number of results
+        offset: Number of results to skip (for paging)
+        raw: Pass the query to FTS5 unchanged (allows AND/OR/NEAR/"phrases")
+    
+    Returns:
+        list: Script dictionaries (without content) with 'snippet' and 'rank'
+    """
+    try:
+        match = query if raw else _fts_query(query)
+        if not match:
+            return []
+        
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT s.id, s.title, s.genre, s.created_at, s.modified_at,
+                       snippet(scripts_fts, 2, '**', '**', '…', 16) AS snippet,
+                       bm25(scripts_fts, 10.0, 2.0, 1.0) AS rank
+                FROM scripts_fts
+                JOIN scripts s ON s.id = scripts_fts.rowid
+                WHERE scripts_fts MATCH ?
+                ORDER BY rank
+                LIMIT ? OFFSET ?
+            """, (match, limit, offset))
+            rows = cursor.fetchall()
+        
+        return [dict(row) for row in rows]
+    
+    except Exception as e:
+        print(f"Error searching scripts: {str(e)}")
+        return []
+
+
+def rebuild_search_index() -> bool:
+    """
+    Rebuild the full-text search index from the scripts table
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        with transaction() as conn:
+            conn.execute("DELETE FROM scripts_fts")
+            conn.execute("""
+                INSERT INTO scripts_fts (rowid, title, genre, content)
+                SELECT id, title, genre, content FROM scripts WHERE content_format = 'text'
+            """)
+            _index_compressed_scripts(conn)
         
         return True
     
     except Exception as e:
-        print(f"Error deleting script: {str(e)}")
+        print(f"Error rebuilding search index: {str(e)}")
         return False
 
 
@@ -266,18 +1108,16 @@ def create_product_placement(script_id: int, product_name: str, brand: str,
         int: Placement ID if successful, None otherwise
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO product_placements 
-            (script_id, product_name, brand, placement_type, scene_description, estimated_cost)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (script_id, product_name, brand, placement_type, scene_description, estimated_cost))
-        
-        placement_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                INSERT INTO product_placements 
+                (script_id, product_name, brand, placement_type, scene_description, estimated_cost)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (script_id, product_name, brand, placement_type, scene_description, estimated_cost))
+            
+            placement_id = cursor.lastrowid
         
         return placement_id
     
@@ -286,6 +1126,37 @@ def create_product_placement(script_id: int, product_name: str, brand: str,
         return None
 
 
+def bulk_create_product_placements(placements: List[Dict[str, Any]]) -> List[int]:
+    """
+    Create many product placements in a single transaction
+    
+    Args:
+        placements: List of dicts with the create_product_placement() arguments
+                    (script_id, product_name, brand and optional fields)
+    
+    Returns:
+        list: Placement IDs in input order, empty list on failure
+    """
+    try:
+        rows = [
+            (p['script_id'], p['product_name'], p['brand'], p.get('placement_type'),
+             p.get('scene_description'), p.get('estimated_cost'))
+            for p in placements
+        ]
+        with transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO product_placements 
+                (script_id, product_name, brand, placement_type, scene_description, estimated_cost)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            return _inserted_ids(cursor, 'product_placements', len(rows))
+    
+    except Exception as e:
+        print(f"Error bulk creating product placements: {str(e)}")
+        return []
+
+
 def get_placements_by_script(script_id: int) -> List[Dict[str, Any]]:
     """
     Get all product placements for a script
@@ -297,12 +1168,11 @@ def get_placements_by_script(script_id: int) -> List[Dict[str, Any]]:
         list: List of placement dictionaries
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM product_placements WHERE script_id = ?", (script_id,))
-        rows = cursor.fetchall()
-        conn.close()
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT * FROM product_placements WHERE script_id = ?", (script_id,))
+            rows = cursor.fetchall()
         
         return [dict(row) for row in rows]
     
@@ -313,6 +1183,16 @@ def get_placements_by_script(script_id: int) -> List[Dict[str, Any]]:
 
 # ==================== ACTORS OPERATIONS ====================
 
+_UPSERT_ACTOR_SQL = """
+    INSERT INTO actors (tmdb_id, name, country, popularity, profile_path)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(tmdb_id) DO UPDATE SET
+        name = excluded.name,
+        country = excluded.country,
+        popularity = excluded.popularity,
+        profile_path = excluded.profile_path
+"""
+
 def create_actor(tmdb_id: int, name: str, country: Optional[str] = None,
                 popularity: Optional[float] = None, 
                 profile_path: Optional[str] = None) -> Optional[int]:
@@ -330,31 +1210,11 @@ def create_actor(tmdb_id: int, name: str, country: Optional[str] = None,
         int: Actor ID if successful, None otherwise
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        # Check if actor exists
-        cursor.execute("SELECT id FROM actors WHERE tmdb_id = ?", (tmdb_id,))
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Update existing actor
-            cursor.execute("""
-                UPDATE actors 
-                SET name = ?, country = ?, popularity = ?, profile_path = ?
-                WHERE tmdb_id = ?
-            """, (name, country, popularity, profile_path, tmdb_id))
-            actor_id = existing['id']
-        else:
-            # Insert new actor
-            cursor.execute("""
-                INSERT INTO actors (tmdb_id, name, country, popularity, profile_path)
-                VALUES (?, ?, ?, ?, ?)
-            """, (tmdb_id, name, country, popularity, profile_path))
-            actor_id = cursor.lastrowid
-        
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(_UPSERT_ACTOR_SQL + " RETURNING id",
+                           (tmdb_id, name, country, popularity, profile_path))
+            actor_id = cursor.fetchone()['id']
         
         return actor_id
     
@@ -363,6 +1223,52 @@ def create_actor(tmdb_id: int, name: str, country: Optional[str] = None,
         return None
 
 
+def bulk_create_actors(actors: List[Dict[str, Any]]) -> List[int]:
+    """
+    Create or update many actors in a single transaction
+    
+    Rows are matched on tmdb_id, which is required: a duplicate tmdb_id in the
+    input updates the same actor (the last row wins) and gets the same ID.
+    
+    Args:
+        actors: List of dicts with the create_actor() arguments
+                (tmdb_id, name and optional country/popularity/profile_path)
+    
+    Returns:
+        list: Actor IDs in input order, empty list on failure (nothing is written)
+    """
+    try:
+        rows = [
+            (a['tmdb_id'], a['name'], a.get('country'), a.get('popularity'), a.get('profile_path'))
+            for a in actors
+        ]
+        missing = [i for i, row in enumerate(rows) if row[0] is None]
+        if missing:
+            raise ValueError(f"tmdb_id is required for bulk upserts (missing at positions {missing})")
+        tmdb_ids = list(dict.fromkeys(row[0] for row in rows))
+        id_by_tmdb = {}
+        
+        with transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(_UPSERT_ACTOR_SQL, rows)
+            
+            # Upserted rows keep their existing ids, so resolve them by tmdb_id
+            for i in range(0, len(tmdb_ids), 500):
+                chunk = tmdb_ids[i:i + 500]
+                placeholders = ', '.join('?' for _ in chunk)
+                cursor.execute(f"SELECT id, tmdb_id FROM actors WHERE tmdb_id IN ({placeholders})", chunk)
+                id_by_tmdb.update({row['tmdb_id']: row['id'] for row in cursor.fetchall()})
+            
+            # Resolved before commit, so a lookup failure rolls the upserts back
+            actor_ids = [id_by_tmdb[row[0]] for row in rows]
+        
+        return actor_ids
+    
+    except Exception as e:
+        print(f"Error bulk creating/updating actors: {str(e)}")
+        return []
+
+
 def get_actor_by_tmdb_id(tmdb_id: int) -> Optional[Dict[str, Any]]:
     """
     Get actor by TMDB ID
@@ -374,12 +1280,11 @@ def get_actor_by_tmdb_id(tmdb_id: int) -> Optional[Dict[str, Any]]:
         dict: Actor data or None if not found
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT * FROM actors WHERE tmdb_id = ?", (tmdb_id,))
-        row = cursor.fetchone()
-        conn.close()
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT * FROM actors WHERE tmdb_id = ?", (tmdb_id,))
+            row = cursor.fetchone()
         
         if row:
             return dict(row)
@@ -407,17 +1312,15 @@ def create_script_casting(script_id: int, actor_id: int, role_name: str,
         int: Casting ID if successful, None otherwise
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO script_casting (script_id, actor_id, role_name, match_score)
-            VALUES (?, ?, ?, ?)
-        """, (script_id, actor_id, role_name, match_score))
-        
-        casting_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                INSERT INTO script_casting (script_id, actor_id, role_name, match_score)
+                VALUES (?, ?, ?, ?)
+            """, (script_id, actor_id, role_name, match_score))
+            
+            casting_id = cursor.lastrowid
         
         return casting_id
     
@@ -426,6 +1329,35 @@ def create_script_casting(script_id: int, actor_id: int, role_name: str,
         return None
 
 
+def bulk_create_script_castings(castings: List[Dict[str, Any]]) -> List[int]:
+    """
+    Create many script casting entries in a single transaction
+    
+    Args:
+        castings: List of dicts with the create_script_casting() arguments
+                  (script_id, actor_id, role_name and optional match_score)
+    
+    Returns:
+        list: Casting IDs in input order, empty list on failure
+    """
+    try:
+        rows = [
+            (c['script_id'], c['actor_id'], c['role_name'], c.get('match_score'))
+            for c in castings
+        ]
+        with transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO script_casting (script_id, actor_id, role_name, match_score)
+                VALUES (?, ?, ?, ?)
+            """, rows)
+            return _inserted_ids(cursor, 'script_casting', len(rows))
+    
+    except Exception as e:
+        print(f"Error bulk creating script castings: {str(e)}")
+        return []
+
+
 def get_casting_by_script(script_id: int) -> List[Dict[str, Any]]:
     """
     Get all casting entries for a script with actor details
@@ -437,19 +1369,18 @@ def get_casting_by_script(script_id: int) -> List[Dict[str, Any]]:
         list: List of casting dictionaries with actor info
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT sc.*, a.name, a.tmdb_id, a.country, a.popularity, a.profile_path
-            FROM script_casting sc
-            JOIN actors a ON sc.actor_id = a.id
-            WHERE sc.script_id = ?
-            ORDER BY sc.match_score DESC
-        """, (script_id,))
-        
-        rows = cursor.fetchall()
-        conn.close()
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT sc.*, a.name, a.tmdb_id, a.country, a.popularity, a.profile_path
+                FROM script_casting sc
+                JOIN actors a ON sc.actor_id = a.id
+                WHERE sc.script_id = ?
+                ORDER BY sc.match_score DESC
+            """, (script_id,))
+            
+            rows = cursor.fetchall()
         
         return [dict(row) for row in rows]
     
@@ -478,18 +1409,16 @@ def create_revenue_forecast(script_id: int, genre: str, product_category: str,
         int: Forecast ID if successful, None otherwise
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            INSERT INTO revenue_forecasts 
-            (script_id, genre, product_category, estimated_revenue, estimated_roi, market_reach)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (script_id, genre, product_category, estimated_revenue, estimated_roi, market_reach))
-        
-        forecast_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                INSERT INTO revenue_forecasts 
+                (script_id, genre, product_category, estimated_revenue, estimated_roi, market_reach)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (script_id, genre, product_category, estimated_revenue, estimated_roi, market_reach))
+            
+            forecast_id = cursor.lastrowid
         
         return forecast_id
     
@@ -498,6 +1427,38 @@ def create_revenue_forecast(script_id: int, genre: str, product_category: str,
         return None
 
 
+def bulk_create_revenue_forecasts(forecasts: List[Dict[str, Any]]) -> List[int]:
+    """
+    Create many revenue forecasts in a single transaction
+    
+    Args:
+        forecasts: List of dicts with the create_revenue_forecast() arguments
+                   (script_id, genre, product_category, estimated_revenue,
+                   estimated_roi and optional market_reach)
+    
+    Returns:
+        list: Forecast IDs in input order, empty list on failure
+    """
+    try:
+        rows = [
+            (f['script_id'], f['genre'], f['product_category'], f['estimated_revenue'],
+             f['estimated_roi'], f.get('market_reach'))
+            for f in forecasts
+        ]
+        with transaction() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO revenue_forecasts 
+                (script_id, genre, product_category, estimated_revenue, estimated_roi, market_reach)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+            return _inserted_ids(cursor, 'revenue_forecasts', len(rows))
+    
+    except Exception as e:
+        print(f"Error bulk creating revenue forecasts: {str(e)}")
+        return []
+
+
 def get_forecasts_by_script(script_id: int) -> List[Dict[str, Any]]:
     """
     Get all revenue forecasts for a script
@@ -509,17 +1470,16 @@ def get_forecasts_by_script(script_id: int) -> List[Dict[str, Any]]:
         list: List of forecast dictionaries
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT * FROM revenue_forecasts 
-            WHERE script_id = ? 
-            ORDER BY forecast_date DESC
-        """, (script_id,))
-        
-        rows = cursor.fetchall()
-        conn.close()
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT * FROM revenue_forecasts 
+                WHERE script_id = ? 
+                ORDER BY forecast_date DESC
+            """, (script_id,))
+            
+            rows = cursor.fetchall()
         
         return [dict(row) for row in rows]
     
@@ -528,39 +1488,139 @@ def get_forecasts_by_script(script_id: int) -> List[Dict[str, Any]]:
         return []
 
 
+# ==================== SCRIPT BUNDLES ====================
+
+class ScriptBundle(NamedTuple):
+    """A script with all of its related rows"""
+    script: Dict[str, Any]
+    placements: List[Dict[str, Any]]
+    castings: List[Dict[str, Any]]
+    forecasts: List[Dict[str, Any]]
+
+
+# One query per table; ids are bound as a single JSON array so the number of
+# statements does not depend on how many scripts are requested
+_BUNDLE_QUERIES = {
+    'placements': """
+        SELECT * FROM product_placements
+        WHERE script_id IN (SELECT value FROM json_each(?))
+        ORDER BY script_id, id
+    """,
+    'castings': """
+        SELECT sc.*, a.name, a.tmdb_id, a.country, a.popularity, a.profile_path
+        FROM script_casting sc
+        JOIN actors a ON sc.actor_id = a.id
+        WHERE sc.script_id IN (SELECT value FROM json_each(?))
+        ORDER BY sc.script_id, sc.match_score DESC
+    """,
+    'forecasts': """
+        SELECT * FROM revenue_forecasts
+        WHERE script_id IN (SELECT value FROM json_each(?))
+        ORDER BY script_id, forecast_date DESC
+    """,
+}
+
+
+def get_script_bundles(script_ids: List[int], include_content: bool = True) -> Dict[int, ScriptBundle]:
+    """
+    Load many scripts with their placements, castings and forecasts
+    
+    Runs four queries in one read snapshot, however many ids are given.
+    
+    Args:
+        script_ids: Script IDs to load
+        include_content: Whether to load and decode each script's content
+    
+    Returns:
+        dict: script_id -> ScriptBundle, in the order requested (missing ids are omitted)
+    """
+    try:
+        ids = json.dumps([int(i) for i in dict.fromkeys(script_ids)])
+        
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            snapshot = not conn.in_transaction
+            if snapshot:
+                cursor.execute("BEGIN")
+            try:
+                cursor.execute(f"""
+                    SELECT {_script_columns(include_content)} FROM scripts
+                    WHERE id IN (SELECT value FROM json_each(?))
+                """, (ids,))
+                scripts = {row['id']: _script_row(row) for row in cursor.fetchall()}
+                
+                related = {}
+                for key, sql in _BUNDLE_QUERIES.items():
+                    cursor.execute(sql, (ids,))
+                    related[key] = cursor.fetchall()
+            finally:
+                if snapshot:
+                    cursor.execute("COMMIT")
+        
+        grouped: Dict[str, Dict[int, List[Dict[str, Any]]]] = {key: {} for key in _BUNDLE_QUERIES}
+        for key, rows in related.items():
+            for row in rows:
+                grouped[key].setdefault(row['script_id'], []).append(dict(row))
+        
+        return {
+            script_id: ScriptBundle(
+                script=scripts[script_id],
+                placements=grouped['placements'].get(script_id, []),
+                castings=grouped['castings'].get(script_id, []),
+                forecasts=grouped['forecasts'].get(script_id, []),
+            )
+            for script_id in json.loads(ids) if script_id in scripts
+        }
+    
+    except Exception as e:
+        print(f"Error getting script bundles: {str(e)}")
+        return {}
+
+
+def get_script_bundle(script_id: int, include_content: bool = True) -> Optional[ScriptBundle]:
+    """
+    Load a script with its placements, castings and forecasts
+    
+    Args:
+        script_id: Script ID
+        include_content: Whether to load and decode the script content
+    
+    Returns:
+        ScriptBundle: Script and related rows, or None if not found
+    """
+    return get_script_bundles([script_id], include_content=include_content).get(script_id)
+
+
 # ==================== STATISTICS AND ANALYTICS ====================
 
+# Keys returned by get_database_stats() for each counted table
+STATS_TABLES = {
+    'scripts': 'scripts',
+    'product_placements': 'placements',
+    'actors': 'actors',
+    'script_casting': 'castings',
+    'revenue_forecasts': 'forecasts',
+}
+
+
 def get_database_stats() -> Dict[str, int]:
     """
     Get database statistics
     
+    Counts are read from the trigger-maintained table_stats table.
+    
     Returns:
         dict: Statistics including counts for each table
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT table_name, row_count FROM table_stats")
+            rows = cursor.fetchall()
         
-        stats = {}
-        
-        cursor.execute("SELECT COUNT(*) as count FROM scripts")
-        stats['scripts'] = cursor.fetchone()['count']
-        
-        cursor.execute("SELECT COUNT(*) as count FROM product_placements")
-        stats['placements'] = cursor.fetchone()['count']
-        
-        cursor.execute("SELECT COUNT(*) as count FROM actors")
-        stats['actors'] = cursor.fetchone()['count']
-        
-        cursor.execute("SELECT COUNT(*) as count FROM script_casting")
-        stats['castings'] = cursor.fetchone()['count']
-        
-        cursor.execute("SELECT COUNT(*) as count FROM revenue_forecasts")
-        stats['forecasts'] = cursor.fetchone()['count']
-        
-        conn.close()
-        
-        return stats
+        counts = {row['table_name']: row['row_count'] for row in rows}
+        return {key: counts.get(table, 0) for table, key in STATS_TABLES.items()}
     
     except Exception as e:
         print(f"Error getting database stats: {str(e)}")
@@ -571,25 +1631,60 @@ def get_genre_distribution() -> List[Tuple[str, int]]:
     """
     Get distribution of scripts by genre
     
+    Counts are read from the trigger-maintained genre_counts table.
+    
     Returns:
         list: List of tuples (genre, count)
     """
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT genre, COUNT(*) as count 
-            FROM scripts 
-            GROUP BY genre 
-            ORDER BY count DESC
-        """)
-        
-        rows = cursor.fetchall()
-        conn.close()
+        with pooled_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT genre, script_count 
+                FROM genre_counts 
+                WHERE script_count > 0 
+                ORDER BY script_count DESC, genre
+            """)
+            
+            rows = cursor.fetchall()
         
-        return [(row['genre'], row['count']) for row in rows]
+        return [(row['genre'], row['script_count']) for row in rows]
     
     except Exception as e:
         print(f"Error getting genre distribution: {str(e)}")
         return []
+
+
+def rebuild_stats() -> bool:
+    """
+    Recompute table_stats and genre_counts from the base tables
+    
+    Repair routine for counts that drifted (e.g. rows changed by a tool
+    that bypassed the triggers).
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        with transaction() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("DELETE FROM table_stats")
+            for table in STATS_TABLES:
+                cursor.execute(f"""
+                    INSERT INTO table_stats (table_name, row_count)
+                    SELECT ?, COUNT(*) FROM {table}
+                """, (table,))
+            
+            cursor.execute("DELETE FROM genre_counts")
+            cursor.execute("""
+                INSERT INTO genre_counts (genre, script_count)
+                SELECT genre, COUNT(*) FROM scripts GROUP BY genre
+            """)
+        
+        return True
+    
+    except Exception as e:
+        print(f"Error rebuilding stats: {str(e)}")
+        return False
@@ -0,0 +1,233 @@
+"""
+PDF extraction cache for Movie Analytics Platform
+Content-addressed SQLite store: extraction results are keyed by the SHA-256 of
+the PDF bytes plus the extraction method, extractor version and options, so
+re-opening an already-seen script (under any file name) costs a hash and a read.
+Text is stored zlib-compressed alongside the metadata dict.
+
+Pre-warm a directory:  python -m utils.extraction_cache warm scripts/
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from utils.sqlite_lru import SQLiteLRUStore
+
+# Cache file (kept next to the main database)
+EXTRACTION_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'db', 'extraction_cache.db')
+
+# Global switch; set EXTRACTION_CACHE_ENABLED=0 to always re-extract
+EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "1") != "0"
+
+# Least recently used entries are evicted once stored text exceeds this size
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_MAX_MB", "500")) * 1024 * 1024
+
+_store = SQLiteLRUStore(
+    'pdf_extractions',
+    'sha256 TEXT NOT NULL, text BLOB NOT NULL, metadata TEXT NOT NULL',
+    lambda: EXTRACTION_CACHE_PATH
+)
+_stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+
+def file_sha256(path: str, block_size: int = 1024 * 1024) -> str:
+    """
+    Hash a file's bytes
+
+    Args:
+        path: File path
+        block_size: Read size
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def make_key(sha256: str, method: str, version: int, **options: Any) -> str:
+    """
+    Build the cache key of an extraction
+
+    Args:
+        sha256: Digest of the PDF bytes
+        method: Extraction method requested ('auto', 'pypdf2', 'ocr', ...)
+        version: Extractor version (bumped whenever output changes)
+        **options: Anything else that changes the output (OCR dpi, page range, ...)
+
+    Returns:
+        str: Cache key
+    """
+    suffix = json.dumps(options, sort_keys=True) if options else ''
+    return f"{sha256}:{method}:v{version}{':' + suffix if suffix else ''}"
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a cached extraction
+
+    Args:
+        key: Key from make_key()
+
+    Returns:
+        dict: Extraction result (success, text, metadata, error), or None on a miss
+    """
+    try:
+        with _store.lock:
+            conn = _store.connection()
+            row = conn.execute("SELECT text, metadata FROM pdf_extractions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                _stats['misses'] += 1
+                return None
+            _store.touch(conn, key, time.time())
+            _stats['hits'] += 1
+        return {
+            'success': True,
+            'text': zlib.decompress(row[0]).decode('utf-8'),
+            'metadata': json.loads(row[1]),
+            'error': None
+        }
+
+    except Exception as e:
+        print(f"Error reading extraction cache: {str(e)}")
+        return None
+
+
+def put(key: str, sha256: str, result: Dict[str, Any]) -> bool:
+    """
+    Store a successful extraction and evict least recently used entries over the size bound
+
+    Args:
+        key: Key from make_key()
+        sha256: Digest of the PDF bytes
+        result: Extraction result from PDFScriptExtractor.extract_text
+
+    Returns:
+        bool: True if stored successfully
+    """
+    try:
+        blob = zlib.compress(result.get('text', '').encode('utf-8'), 6)
+        metadata = json.dumps(result.get('metadata', {}), default=str)
+        now = time.time()
+        with _store.lock:
+            conn = _store.connection()
+            conn.execute("""
+                INSERT OR REPLACE INTO pdf_extractions (key, sha256, text, metadata, size, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (key, sha256, blob, metadata, len(blob) + len(metadata), now, now))
+            _stats['writes'] += 1
+            _stats['evictions'] += _store.evict(conn, EXTRACTION_CACHE_MAX_BYTES)
+        return True
+
+    except Exception as e:
+        print(f"Error writing extraction cache: {str(e)}")
+        return False
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Get cache counters for this process plus the size of the cache file
+
+    Returns:
+        dict: hits, misses, hit_rate, writes, evictions, entries, documents, bytes, enabled
+    """
+    stats: Dict[str, Any] = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    stats['enabled'] = EXTRACTION_CACHE_ENABLED
+    try:
+        with _store.lock:
+            entries, documents, size = _store.connection().execute(
+                "SELECT COUNT(*), COUNT(DISTINCT sha256), COALESCE(SUM(size), 0) FROM pdf_extractions"
+            ).fetchone()
+        stats.update(entries=entries, documents=documents, bytes=size)
+    except Exception as e:
+        print(f"Error reading extraction cache stats: {str(e)}")
+        stats.update(entries=0, documents=0, bytes=0)
+    return stats
+
+
+def clear_cache() -> bool:
+    """
+    Delete every cached extraction
+
+    Returns:
+        bool: True if cleared successfully
+    """
+    try:
+        _store.clear()
+        return True
+
+    except Exception as e:
+        print(f"Error clearing extraction cache: {str(e)}")
+        return False
+
+
+def close_cache() -> None:
+    """Close the cache connection (e.g. in tests)"""
+    _store.close()
+
+
+def warm_directory(directory: str, method: str = 'auto', recursive: bool = False) -> Dict[str, int]:
+    """
+    Extract every PDF in a directory that is not cached yet
+
+    Args:
+        directory: Directory to scan
+        method: Extraction method to cache
+        recursive: Include subdirectories
+
+    Returns:
+        dict: pdfs, cached (already present), extracted, failed
+    """
+    from utils.pdf_script_extractor import extract_pdf_text
+
+    summary = {'pdfs': 0, 'cached': 0, 'extracted': 0, 'failed': 0}
+    for root, dirs, files in os.walk(directory):
+        if not recursive:
+            dirs.clear()
+        for name in sorted(files):
+            if not name.lower().endswith('.pdf'):
+                continue
+            path = os.path.join(root, name)
+            summary['pdfs'] += 1
+            start = time.perf_counter()
+            result = extract_pdf_text(path, method)
+            elapsed = time.perf_counter() - start
+            if not result['success']:
+                summary['failed'] += 1
+                print(f"❌ {path}: {result['error']}")
+            elif result['metadata'].get('cached'):
+                summary['cached'] += 1
+                print(f"✓ {path} (already cached)")
+            else:
+                summary['extracted'] += 1
+                print(f"✅ {path}: {result['metadata'].get('num_pages', '?')} pages in {elapsed:.1f}s")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the PDF extraction cache")
+    commands = parser.add_subparsers(dest="command", required=True)
+    warm = commands.add_parser("warm", help="Extract and cache every PDF in a directory")
+    warm.add_argument("directory", nargs="?", default="scripts")
+    warm.add_argument("--method", default="auto", help="Extraction method (default: auto)")
+    warm.add_argument("--recursive", action="store_true", help="Include subdirectories")
+    commands.add_parser("stats", help="Show cache statistics")
+    commands.add_parser("clear", help="Delete every cached extraction")
+    args = parser.parse_args()
+
+    if args.command == "warm":
+        print(warm_directory(args.directory, args.method, args.recursive))
+    elif args.command == "stats":
+        print(get_cache_stats())
+    elif args.command == "clear":
+        print("Cleared" if clear_cache() else "Failed to clear cache")
@@ -1,14 +1,66 @@
 import os
-from typing import Dict, Optional
+import time
+import asyncio
+import itertools
+import hashlib
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
 from langchain_core.prompts import PromptTemplate
 import json
 import re
+from utils import llm_cache, rate_limit
+from utils.token_budget import SCENE_HEADING, count_tokens, fit_sections, prompt_budget, split_scenes
 
 try:
     from langchain_openai import ChatOpenAI
 except Exception:
     ChatOpenAI = None  # type: ignore
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+XAI_BASE_URL = "https://api.x.ai/v1"
+
+# Maximum number of distinct LLM clients kept alive by create_llm()
+LLM_CLIENT_CACHE_SIZE = int(os.getenv("LLM_CLIENT_CACHE_SIZE", "16"))
+
+# Chunked (map-reduce) analysis of full-length screenplays
+ANALYSIS_CHUNK_CHARS = int(os.getenv("ANALYSIS_CHUNK_CHARS", "12000"))
+ANALYSIS_MAX_WORKERS = int(os.getenv("ANALYSIS_MAX_WORKERS", "4"))
+
+# Multi-model fan-out: concurrent requests allowed per provider, and per-model timeout (seconds)
+PROVIDER_CONCURRENCY = {"google": 2, "openai": 4, "xai": 2, "local": 8}
+MULTI_MODEL_TIMEOUT = float(os.getenv("MULTI_MODEL_TIMEOUT", "240"))
+
+# Connection limits of the HTTP transport shared by all OpenAI-compatible clients
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20"))
+LLM_HTTP_TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", "120"))
+
+# Structured output: cheap model per provider used for the one-shot JSON repair call
+JSON_REPAIR_MODELS = {"google": "gemini-2.0-flash", "openai": "gpt-4.1-nano", "xai": "grok-3-mini"}
+JSON_REPAIR_MAX_TOKENS = int(os.getenv("JSON_REPAIR_MAX_TOKENS", "2000"))
+
+# selected_model keys that configure the offline "local" provider (see utils/local_llm.py)
+LOCAL_MODEL_OPTIONS = ("latency_s", "tokens_per_sec")
+
+_llm_clients: "OrderedDict[Tuple, object]" = OrderedDict()
+_llm_lock = threading.Lock()
+_llm_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_http_client = None
+
+# Recent streaming timings (seconds) for time-to-first-token reporting
+_stream_timings: "deque[Dict[str, float]]" = deque(maxlen=200)
+
+# Structured-output parse counters per call site (see invoke_llm_json)
+_json_stats: Dict[str, Dict[str, int]] = {}
+_json_lock = threading.Lock()
+
 
 def _require_env(var_name: str) -> str:
     value = os.getenv(var_name, "")
@@ -17,63 +69,230 @@ def _require_env(var_name: str) -> str:
     return value
 
 
-def create_llm(selected_model: Dict[str, str], temperature: float = 0.5, max_tokens: int = 2000):
-    """
-    Create an LLM instance based on a selected_model dict:
-    expected keys: {'provider': 'google'|'openai'|'xai', 'model': '<model-id>'}
-    """
-    provider = selected_model.get("provider")
-    model = selected_model.get("model")
+def _shared_http_client():
+    """Keep-alive httpx client shared by every OpenAI-compatible LLM client (None if httpx is missing)."""
+    global _http_client
+    if _http_client is None and HTTPX_AVAILABLE:
+        _http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=60.0,
+            ),
+            timeout=httpx.Timeout(LLM_HTTP_TIMEOUT, connect=10.0),
+        )
+    return _http_client
+
+
+def _build_llm(provider: str, model: str, temperature: float, max_tokens: int, api_key: str, base_url: Optional[str], options: Optional[Dict[str, float]] = None, json_mode: bool = False):
+    """Construct a new chat model client; create_llm() memoizes the result."""
+    if provider == "local":
+        from utils.local_llm import LocalChatModel
+        return LocalChatModel(model=model or "local", temperature=temperature, max_tokens=max_tokens, **(options or {}))
 
     if provider == "google":
         try:
             from langchain_google_genai import ChatGoogleGenerativeAI
         except Exception as e:
             raise RuntimeError("langchain_google_genai is not installed or failed to import") from e
-        api_key = _require_env("GOOGLE_API_KEY")
         return ChatGoogleGenerativeAI(
             model=model,
             google_api_key=api_key,
             temperature=temperature,
-            max_output_tokens=max_tokens
+            max_output_tokens=max_tokens,
+            max_retries=0,  # retries are handled by utils.rate_limit
+            **({"response_mime_type": "application/json"} if json_mode else {})
         )
 
-    if provider == "openai":
-        if ChatOpenAI is None:
-            raise RuntimeError("langchain_openai is not installed or failed to import")
-        api_key = _require_env("OPENAI_API_KEY")
-        return ChatOpenAI(
-            model=model,
-            api_key=api_key,
-            temperature=temperature,
-            max_tokens=max_tokens
-        )
+    if ChatOpenAI is None:
+        raise RuntimeError("langchain_openai is not installed or failed to import")
+    kwargs = {}
+    if base_url:
+        kwargs["base_url"] = base_url
+    http_client = _shared_http_client()
+    if http_client is not None:
+        kwargs["http_client"] = http_client
+    llm = ChatOpenAI(
+        model=model,
+        api_key=api_key,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        max_retries=0,  # retries are handled by utils.rate_limit
+        **kwargs
+    )
+    if json_mode:
+        return llm.bind(response_format={"type": "json_object"})
+    return llm
 
-    if provider == "xai":
-        if ChatOpenAI is None:
-            raise RuntimeError("langchain_openai is not installed or failed to import")
-        api_key = _require_env("XAI_API_KEY")
-        return ChatOpenAI(
-            model=model,
-            api_key=api_key,
-            base_url="https://api.x.ai/v1",
-            temperature=temperature,
-            max_tokens=max_tokens
-        )
 
-    raise ValueError(f"Unknown provider: {provider}")
+def create_llm(selected_model: Dict[str, str], temperature: float = 0.5, max_tokens: int = 2000, json_mode: bool = False):
+    """
+    Create an LLM instance based on a selected_model dict:
+    expected keys: {'provider': 'google'|'openai'|'xai'|'local', 'model': '<model-id>'}
+    The 'local' provider is an offline deterministic stand-in (no API key); it also
+    accepts optional 'latency_s' and 'tokens_per_sec' keys.
+    json_mode=True enables the provider's native JSON output mode (response_format /
+    response_mime_type); the prompt must still ask for JSON.
+
+    Clients are memoized on (provider, model, temperature, max_tokens, base_url)
+    in a bounded LRU so repeated calls reuse keep-alive connections; the API key
+    is part of the key too, so rotating a key yields a fresh client.
+    """
+    provider = selected_model.get("provider")
+    model = selected_model.get("model")
+
+    if provider == "google":
+        api_key, base_url = _require_env("GOOGLE_API_KEY"), None
+    elif provider == "openai":
+        api_key, base_url = _require_env("OPENAI_API_KEY"), None
+    elif provider == "xai":
+        api_key, base_url = _require_env("XAI_API_KEY"), XAI_BASE_URL
+    elif provider == "local":
+        api_key, base_url = "", None
+    else:
+        raise ValueError(f"Unknown provider: {provider}")
+
+    key_id = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+    options = {name: float(selected_model[name]) for name in LOCAL_MODEL_OPTIONS if name in selected_model} if provider == "local" else {}
+    cache_key = (provider, model, float(temperature), int(max_tokens), base_url, key_id, tuple(sorted(options.items())), bool(json_mode))
+
+    with _llm_lock:
+        llm = _llm_clients.get(cache_key)
+        if llm is not None:
+            _llm_clients.move_to_end(cache_key)
+            _llm_stats["hits"] += 1
+            return llm
+
+        llm = _build_llm(provider, model, temperature, max_tokens, api_key, base_url, options, json_mode)
+        _llm_stats["misses"] += 1
+        _llm_clients[cache_key] = llm
+        while len(_llm_clients) > LLM_CLIENT_CACHE_SIZE:
+            _llm_clients.popitem(last=False)
+            _llm_stats["evictions"] += 1
+        return llm
+
+
+def get_llm_client_stats() -> Dict[str, float]:
+    """Hit/miss/eviction counters and reuse rate of the create_llm() client cache."""
+    with _llm_lock:
+        stats = dict(_llm_stats)
+        stats["size"] = len(_llm_clients)
+        stats["max_size"] = LLM_CLIENT_CACHE_SIZE
+    total = stats["hits"] + stats["misses"]
+    stats["reuse_rate"] = stats["hits"] / total if total else 0.0
+    return stats
+
+
+def clear_llm_clients() -> None:
+    """Drop all memoized LLM clients (counters are kept)."""
+    with _llm_lock:
+        _llm_clients.clear()
+
 
+def invoke_llm(llm, prompt: str, selected_model: Dict[str, str], temperature: float, max_tokens: int, use_cache: bool = True, json_mode: bool = False) -> str:
+    """
+    Invoke a chat model through the persistent response cache and return the text.
+    The cache key covers provider, model, sampling params, JSON mode (pass the json_mode
+    the llm was created with) and the rendered prompt;
+    pass use_cache=False (or set LLM_CACHE_ENABLED=0) to force a fresh call.
+    Uncached calls go through the provider's rate limiter with retry/backoff.
+    """
+    key = None
+    if use_cache and llm_cache.LLM_CACHE_ENABLED:
+        extra = {"json_mode": True} if json_mode else {}
+        key = llm_cache.make_key(selected_model.get("provider"), selected_model.get("model"), temperature, max_tokens, prompt, **extra)
+        cached = llm_cache.get(key)
+        if cached is not None:
+            return cached
+    response = rate_limit.call_with_retry(selected_model.get("provider") or "llm", llm.invoke, prompt)
+    text = response.content if hasattr(response, "content") else str(response)
+    if key is not None:
+        llm_cache.put(key, text)
+    return text
+
+
+def _chunk_text(chunk) -> str:
+    """Text of a streamed message chunk (content may be a string or a list of parts)."""
+    content = chunk.content if hasattr(chunk, "content") else chunk
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(part.get("text", "") if isinstance(part, dict) else str(part) for part in content)
+    return str(content)
+
+
+def stream_llm(llm, prompt: str, selected_model: Dict[str, str], temperature: float, max_tokens: int, use_cache: bool = True, metrics: Optional[Dict[str, float]] = None) -> Iterator[str]:
+    """
+    Generator over the completion text via the LangChain .stream() interface.
+    A cached response is yielded in one piece; a fresh one is cached once the stream finishes.
+    If a metrics dict is given it receives ttft_s (time to first token), total_s, chunks, chars and cached.
+    """
+    metrics = metrics if metrics is not None else {}
+    start = time.perf_counter()
+    key = None
+    if use_cache and llm_cache.LLM_CACHE_ENABLED:
+        key = llm_cache.make_key(selected_model.get("provider"), selected_model.get("model"), temperature, max_tokens, prompt)
+        cached = llm_cache.get(key)
+        if cached is not None:
+            elapsed = time.perf_counter() - start
+            metrics.update(ttft_s=elapsed, total_s=elapsed, chunks=1, chars=len(cached), cached=True)
+            yield cached
+            return
+
+    def open_stream():
+        # Throttling/transient errors surface before the first chunk, so only opening the stream is retried
+        iterator = iter(llm.stream(prompt))
+        return next(iterator, None), iterator
 
-def build_analysis_prompt(analysis_template: str, script_title: str, script_content: str) -> str:
-    """Injects title and content into the standardized analysis template."""
+    first, iterator = rate_limit.call_with_retry(selected_model.get("provider") or "llm", open_stream)
+    parts: List[str] = []
+    metrics.update(ttft_s=None, chunks=0, cached=False)
+    for chunk in itertools.chain([first] if first is not None else [], iterator):
+        text = _chunk_text(chunk)
+        if not text:
+            continue
+        if metrics["ttft_s"] is None:
+            metrics["ttft_s"] = time.perf_counter() - start
+        metrics["chunks"] += 1
+        parts.append(text)
+        yield text
+
+    full_text = "".join(parts)
+    metrics.update(total_s=time.perf_counter() - start, chars=len(full_text))
+    _stream_timings.append({"ttft_s": metrics["ttft_s"] or metrics["total_s"], "total_s": metrics["total_s"]})
+    if key is not None:
+        llm_cache.put(key, full_text)
+
+
+def get_streaming_stats() -> Dict[str, float]:
+    """Median and worst time-to-first-token / total time over recent uncached streams."""
+    timings = list(_stream_timings)
+    if not timings:
+        return {"streams": 0, "ttft_p50_s": 0.0, "ttft_max_s": 0.0, "total_p50_s": 0.0}
+    ttft = sorted(t["ttft_s"] for t in timings)
+    total = sorted(t["total_s"] for t in timings)
+    return {
+        "streams": len(timings),
+        "ttft_p50_s": ttft[len(ttft) // 2],
+        "ttft_max_s": ttft[-1],
+        "total_p50_s": total[len(total) // 2],
+    }
+
+
+def build_analysis_prompt(analysis_template: str, script_title: str, script_content: str, selected_model: Optional[Dict[str, str]] = None, max_tokens: int = 2000) -> str:
+    """
+    Injects title and content into the standardized analysis template.
+    The screenplay is trimmed at scene boundaries to the model's token budget (see utils/token_budget.py).
+    """
     prompt_text = analysis_template.replace("{SCRIPT_TITLE}", script_title)
-    prompt_text = f"""{prompt_text}
+    head = f"""{prompt_text}
 
 ---
 
 ## SCREENPLAY EXCERPT TO ANALYZE:
 
-{script_content[:15000]}
+"""
+    tail = """
 
 ---
 
@@ -84,15 +303,311 @@ def build_analysis_prompt(analysis_template: str, script_title: str, script_cont
 - Include real brand names where appropriate
 - Ensure all sections are comprehensive and detailed
 - Focus on data consistency and professional formatting"""
-    return prompt_text
+    fitted = fit_sections(head + tail, {"script": (script_content, 1.0)}, selected_model, max_tokens)
+    return f"{head}{fitted['script']}{tail}"
 
 
-def analyze_script(script_title: str, script_content: str, selected_model: Dict[str, str], temperature: float, max_tokens: int, analysis_template: str) -> str:
+def analyze_script(script_title: str, script_content: str, selected_model: Dict[str, str], temperature: float, max_tokens: int, analysis_template: str, use_cache: bool = True) -> str:
     """Creates the model, builds the prompt, and returns the analysis text."""
     llm = create_llm(selected_model, temperature=temperature, max_tokens=max_tokens)
-    prompt_text = build_analysis_prompt(analysis_template, script_title, script_content)
-    response = llm.invoke(prompt_text)
-    return response.content if hasattr(response, "content") else str(response)
+    prompt_text = build_analysis_prompt(analysis_template, script_title, script_content, selected_model, max_tokens)
+    return invoke_llm(llm, prompt_text, selected_model, temperature, max_tokens, use_cache=use_cache)
+
+
+def analyze_script_stream(script_title: str, script_content: str, selected_model: Dict[str, str], temperature: float, max_tokens: int, analysis_template: str, use_cache: bool = True, metrics: Optional[Dict[str, float]] = None) -> Iterator[str]:
+    """Streaming variant of analyze_script(): yields the analysis text as it is generated."""
+    llm = create_llm(selected_model, temperature=temperature, max_tokens=max_tokens)
+    prompt_text = build_analysis_prompt(analysis_template, script_title, script_content, selected_model, max_tokens)
+    return stream_llm(llm, prompt_text, selected_model, temperature, max_tokens, use_cache=use_cache, metrics=metrics)
+
+
+# Map prompt: depends only on the title and the chunk text (no part number or count), so an edit
+# that adds or removes a chunk leaves every other chunk's cache key unchanged. Order is given to
+# the reduce step only.
+CHUNK_ANALYSIS_PROMPT = """You are an expert screenplay analyst specializing in brand integration.
+Below is an excerpt of the screenplay "{title}".
+
+Write concise working notes for this excerpt only, as markdown bullets under these headings:
+### Product Placement Opportunities (scene, moment, product category, brand fit)
+### Characters (name, archetype, lifestyle cues, product affinity)
+### Key Scenes (heading and why it matters for placement)
+### Genre, Tone and Audience Signals
+
+Do not write an introduction or a summary of the whole film.
+
+SCREENPLAY EXCERPT:
+
+{chunk}"""
+
+# Used when the chunk notes together do not fit the reduce model: neighbouring notes are merged first
+NOTES_MERGE_PROMPT = """You are an expert screenplay analyst specializing in brand integration.
+Below are working notes on consecutive excerpts of the screenplay "{title}", in order.
+
+Merge them into one set of concise working notes covering all of these excerpts, as markdown bullets under these headings:
+### Product Placement Opportunities (scene, moment, product category, brand fit)
+### Characters (name, archetype, lifestyle cues, product affinity)
+### Key Scenes (heading and why it matters for placement)
+### Genre, Tone and Audience Signals
+
+Keep scene references; drop repetition. Do not write an introduction.
+
+NOTES:
+
+{notes}"""
+
+REDUCE_INSTRUCTIONS = """---
+
+## SCENE-BY-SCENE NOTES (covering the full screenplay, in order)
+
+{notes}
+
+---
+
+**IMPORTANT INSTRUCTIONS:**
+- The notes above cover every part of the screenplay; base the analysis on all of them, not just the opening
+- Follow the exact structure provided above
+- Use markdown tables for all structured data
+- Provide specific, actionable recommendations
+- Include real brand names where appropriate
+- Ensure all sections are comprehensive and detailed
+- Focus on data consistency and professional formatting"""
+
+
+def _scene_closes_chunk(scene: str) -> bool:
+    """Content-defined boundary: decided by the scene heading alone, so body edits never move chunk edges."""
+    heading = scene.strip().split("\n", 1)[0]
+    return hashlib.sha256(heading.encode("utf-8")).digest()[0] % 4 == 0
+
+
+def chunk_script(script_content: str, max_chars: int = ANALYSIS_CHUNK_CHARS) -> List[str]:
+    """
+    Groups consecutive scenes into chunks of at most max_chars.
+    A chunk closes at a heading-determined boundary once it holds half of max_chars,
+    so editing one scene normally changes only the chunk that contains it.
+    Scenes longer than max_chars are split on blank lines.
+    """
+    pieces = []
+    for scene in split_scenes(script_content):
+        while len(scene) > max_chars:
+            cut = scene.rfind("\n\n", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(scene[:cut])
+            scene = scene[cut:]
+        pieces.append(scene)
+
+    chunks, current = [], ""
+    for piece in pieces:
+        if current and len(current) + len(piece) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += piece
+        if len(current) >= max_chars // 2 and _scene_closes_chunk(piece):
+            chunks.append(current)
+            current = ""
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+def build_chunked_analysis_prompt(
+    script_title: str,
+    chunks: List[str],
+    selected_model: Dict[str, str],
+    temperature: float,
+    analysis_template: str,
+    max_workers: int = ANALYSIS_MAX_WORKERS,
+    chunk_max_tokens: int = 1200,
+    use_cache: bool = True,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    reduce_max_tokens: int = 2000
+) -> str:
+    """
+    Map step of the chunked analysis: summarizes each chunk into working notes, at most
+    max_workers at a time, and returns the reduce prompt (standardized template + ordered notes).
+    Every chunk call goes through the response cache, so an unchanged chunk is never re-analyzed.
+    progress_callback(done, total) is called as chunk notes complete.
+    The reduce prompt is kept within the model's prompt budget (leaving reduce_max_tokens for the
+    answer): notes that do not fit are merged in rounds of neighbouring groups (see _merge_notes).
+    """
+    map_llm = create_llm(selected_model, temperature=temperature, max_tokens=chunk_max_tokens)
+    total = len(chunks)
+
+    def map_chunk(index: int) -> str:
+        prompt = CHUNK_ANALYSIS_PROMPT.format(title=script_title, chunk=chunks[index])
+        return invoke_llm(map_llm, prompt, selected_model, temperature, chunk_max_tokens, use_cache=use_cache)
+
+    notes: List[Optional[str]] = [None] * total
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {pool.submit(map_chunk, i): i for i in range(total)}
+        for done, future in enumerate(as_completed(futures), 1):
+            notes[futures[future]] = future.result()
+            if progress_callback:
+                progress_callback(done, total)
+
+    prompt_text = analysis_template.replace("{SCRIPT_TITLE}", script_title)
+    fixed_text = f"{prompt_text}\n\n{REDUCE_INSTRUCTIONS.format(notes='')}"
+    budget = prompt_budget(selected_model, reduce_max_tokens) - count_tokens(fixed_text, selected_model)
+    notes = _merge_notes(script_title, notes, budget, map_llm, selected_model, temperature, chunk_max_tokens, max_workers, use_cache)
+
+    combined = "\n\n".join(f"### Part {i + 1}/{len(notes)}\n\n{text}" for i, text in enumerate(notes))
+    # Last resort when a single merged note is still too long
+    combined = fit_sections(fixed_text, {"notes": (combined, 1.0)}, selected_model, reduce_max_tokens)["notes"]
+    return f"{prompt_text}\n\n{REDUCE_INSTRUCTIONS.format(notes=combined)}"
+
+
+def _merge_notes(
+    script_title: str,
+    notes: List[str],
+    budget: int,
+    llm: Any,
+    selected_model: Dict[str, str],
+    temperature: float,
+    max_tokens: int,
+    max_workers: int,
+    use_cache: bool
+) -> List[str]:
+    """
+    Hierarchical reduce: while the notes exceed budget tokens, merge runs of neighbouring notes
+    (each run sized to fit one merge prompt, at least two notes) into single notes, concurrently.
+    Merges are cached like chunk notes, so re-runs only redo the groups whose notes changed.
+    """
+    merge_budget = prompt_budget(selected_model, max_tokens) - count_tokens(NOTES_MERGE_PROMPT, selected_model)
+
+    def merge(group: List[str]) -> str:
+        joined = "\n\n".join(group)
+        fitted = fit_sections(NOTES_MERGE_PROMPT.format(title=script_title, notes=""), {"notes": (joined, 1.0)},
+                              selected_model, max_tokens)
+        prompt = NOTES_MERGE_PROMPT.format(title=script_title, notes=fitted["notes"])
+        return invoke_llm(llm, prompt, selected_model, temperature, max_tokens, use_cache=use_cache)
+
+    while len(notes) > 1 and sum(count_tokens(n, selected_model) for n in notes) > budget:
+        groups: List[List[str]] = [[]]
+        used = 0
+        for note in notes:
+            size = count_tokens(note, selected_model)
+            if len(groups[-1]) >= 2 and used + size > merge_budget:
+                groups.append([])
+                used = 0
+            groups[-1].append(note)
+            used += size
+        if len(groups) > 1 and len(groups[-1]) == 1:
+            groups[-2].extend(groups.pop())
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            notes = list(pool.map(merge, groups))
+    return notes
+
+
+def analyze_script_chunked(
+    script_title: str,
+    script_content: str,
+    selected_model: Dict[str, str],
+    temperature: float,
+    max_tokens: int,
+    analysis_template: str,
+    max_workers: int = ANALYSIS_MAX_WORKERS,
+    chunk_chars: int = ANALYSIS_CHUNK_CHARS,
+    chunk_max_tokens: int = 1200,
+    use_cache: bool = True,
+    progress_callback: Optional[Callable[[int, int], None]] = None
+) -> str:
+    """
+    Map-reduce analysis of a full-length screenplay.
+    Map: scene-aligned chunks are summarized concurrently (see build_chunked_analysis_prompt).
+    Reduce: the notes are combined into the standardized analysis template in one final call.
+    """
+    chunks = chunk_script(script_content, max_chars=chunk_chars)
+    if len(chunks) <= 1:
+        return analyze_script(script_title, script_content, selected_model, temperature, max_tokens, analysis_template, use_cache=use_cache)
+
+    prompt_text = build_chunked_analysis_prompt(script_title, chunks, selected_model, temperature, analysis_template,
+                                                max_workers, chunk_max_tokens, use_cache, progress_callback,
+                                                reduce_max_tokens=max_tokens)
+    reduce_llm = create_llm(selected_model, temperature=temperature, max_tokens=max_tokens)
+    return invoke_llm(reduce_llm, prompt_text, selected_model, temperature, max_tokens, use_cache=use_cache)
+
+
+def analyze_script_chunked_stream(
+    script_title: str,
+    script_content: str,
+    selected_model: Dict[str, str],
+    temperature: float,
+    max_tokens: int,
+    analysis_template: str,
+    max_workers: int = ANALYSIS_MAX_WORKERS,
+    chunk_chars: int = ANALYSIS_CHUNK_CHARS,
+    chunk_max_tokens: int = 1200,
+    use_cache: bool = True,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    metrics: Optional[Dict[str, float]] = None
+) -> Iterator[str]:
+    """Streaming variant of analyze_script_chunked(): the map step runs first, then the reduce output is streamed."""
+    chunks = chunk_script(script_content, max_chars=chunk_chars)
+    if len(chunks) <= 1:
+        yield from analyze_script_stream(script_title, script_content, selected_model, temperature, max_tokens, analysis_template, use_cache=use_cache, metrics=metrics)
+        return
+
+    prompt_text = build_chunked_analysis_prompt(script_title, chunks, selected_model, temperature, analysis_template,
+                                                max_workers, chunk_max_tokens, use_cache, progress_callback,
+                                                reduce_max_tokens=max_tokens)
+    reduce_llm = create_llm(selected_model, temperature=temperature, max_tokens=max_tokens)
+    yield from stream_llm(reduce_llm, prompt_text, selected_model, temperature, max_tokens, use_cache=use_cache, metrics=metrics)
+
+
+async def analyze_script_multi(
+    script_title: str,
+    script_content: str,
+    models: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int,
+    analysis_template: str,
+    timeout: float = MULTI_MODEL_TIMEOUT,
+    provider_limits: Optional[Dict[str, int]] = None,
+    chunked: bool = False,
+    use_cache: bool = True
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Analyzes the same script with several models concurrently and yields each result as it completes.
+    Requests are capped per provider (PROVIDER_CONCURRENCY, overridable via provider_limits) and each
+    model gets `timeout` seconds. Every yielded dict has: selected_model, success, text, error, elapsed_s.
+
+    Example:
+        async for result in analyze_script_multi(title, text, [gemini, gpt, grok], 0.5, 4000, template):
+            show(result)
+    """
+    limits = {**PROVIDER_CONCURRENCY, **(provider_limits or {})}
+    semaphores = {provider: asyncio.Semaphore(max(1, n)) for provider, n in limits.items()}
+    analyze = analyze_script_chunked if chunked else analyze_script
+
+    async def run_one(selected_model: Dict[str, str]) -> Dict[str, Any]:
+        provider = selected_model.get("provider")
+        semaphore = semaphores.setdefault(provider, asyncio.Semaphore(1))
+        result = {"selected_model": selected_model, "success": False, "text": "", "error": None, "elapsed_s": 0.0}
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                # LangChain clients here are synchronous; run each call on a worker thread.
+                # A dedicated pool means a timed-out call never delays asyncio.run() shutdown.
+                call = partial(analyze, script_title, script_content, selected_model, temperature,
+                               max_tokens, analysis_template, use_cache=use_cache)
+                result["text"] = await asyncio.wait_for(loop.run_in_executor(executor, call), timeout=timeout)
+                result["success"] = True
+            except asyncio.TimeoutError:
+                result["error"] = f"Timed out after {timeout:g}s"
+            except Exception as e:
+                result["error"] = str(e)
+            result["elapsed_s"] = time.perf_counter() - start
+        return result
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max(1, len(models)), thread_name_prefix="multi-model")
+    tasks = [asyncio.ensure_future(run_one(m)) for m in models]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        executor.shutdown(wait=False)
 
 
 def build_comparison_prompt(template_text: str, original_script: str, modified_script: str) -> str:
@@ -107,38 +622,127 @@ def build_comparison_prompt(template_text: str, original_script: str, modified_s
     )
 
 
-def compare_scripts(original_script: str, modified_script: str, template_text: str, temperature: float = 0.5, model: str = "gpt-4.1-mini", provider: str = "openai", max_tokens: int = 1500) -> str:
+def compare_scripts(original_script: str, modified_script: str, template_text: str, temperature: float = 0.5, model: str = "gpt-4.1-mini", provider: str = "openai", max_tokens: int = 1500, use_cache: bool = True) -> str:
     """
     Performs the AI comparison. Defaults to OpenAI but can be extended.
     """
     selected_model = {"provider": provider, "model": model}
     llm = create_llm(selected_model, temperature=temperature, max_tokens=max_tokens)
     formatted = build_comparison_prompt(template_text, original_script, modified_script)
-    response = llm.invoke(formatted)
-    return response.content if hasattr(response, "content") else str(response)
-
-def _extract_json_block(text: str) -> str:
-    """
-    Extract a JSON block from a response that may include backticks or prose.
-    """
-    # Try to find code-fenced JSON
-    fence = re.search(r"```json\\s*([\\s\\S]*?)\\s*```", text, re.IGNORECASE)
-    if fence:
-        return fence.group(1).strip()
-    # Fallback: find first { and last }
-    start = text.find("{")
-    end = text.rfind("}")
-    if start != -1 and end != -1 and end > start:
-        return text[start:end+1]
-    return text
+    return invoke_llm(llm, formatted, selected_model, temperature, max_tokens, use_cache=use_cache)
 
-def compare_scripts_json(original_script: str, modified_script: str, template_text: str, provider: str = "openai", model: str = "gpt-4.1-mini", temperature: float = 0.2, max_tokens: int = 1800) -> Dict:
+
+def compare_scripts_stream(original_script: str, modified_script: str, template_text: str, temperature: float = 0.5, model: str = "gpt-4.1-mini", provider: str = "openai", max_tokens: int = 1500, use_cache: bool = True, metrics: Optional[Dict[str, float]] = None) -> Iterator[str]:
+    """Streaming variant of compare_scripts()."""
+    selected_model = {"provider": provider, "model": model}
+    llm = create_llm(selected_model, temperature=temperature, max_tokens=max_tokens)
+    formatted = build_comparison_prompt(template_text, original_script, modified_script)
+    return stream_llm(llm, formatted, selected_model, temperature, max_tokens, use_cache=use_cache, metrics=metrics)
+
+
+_JSON_START = re.compile(r"[{\[]")
+_json_decoder = json.JSONDecoder()
+
+JSON_REPAIR_PROMPT = """The text below was supposed to be a single valid JSON {kind} but does not parse ({error}).
+Return ONLY the corrected JSON: keep every field and value, fix syntax (quotes, commas, brackets, truncation), no prose, no code fences.
+
+TEXT:
+{text}"""
+
+
+def parse_json_response(text: str, expect: type = dict, required: Tuple[str, ...] = ()) -> Any:
+    """
+    Parse the first JSON value of type `expect` (a dict must contain the `required` keys) in a model response.
+    Fast path: the whole (stripped) text is JSON, as native JSON mode returns. Next, the body of the
+    first ``` code fence is tried. Otherwise the whole text is scanned from the start with
+    JSONDecoder.raw_decode at each '{' / '[' (fences and surrounding prose are skipped), stopping
+    at the first acceptable value. Raises ValueError if there is none.
+    """
+    def acceptable(value: Any) -> bool:
+        return isinstance(value, expect) and (not isinstance(value, dict) or all(k in value for k in required))
+
+    stripped = text.strip()
+    try:
+        value = json.loads(stripped)
+        if acceptable(value):
+            return value
+    except ValueError:
+        pass
+    fence = stripped.find("```")
+    if fence != -1:
+        body_start = stripped.find("\n", fence) + 1
+        body_end = stripped.find("```", body_start) if body_start else -1
+        if body_start and body_end != -1:
+            try:
+                value = json.loads(stripped[body_start:body_end])
+                if acceptable(value):
+                    return value
+            except ValueError:
+                pass
+    error: Optional[Exception] = None
+    for match in _JSON_START.finditer(stripped):
+        try:
+            value, _ = _json_decoder.raw_decode(stripped, match.start())
+        except ValueError as e:
+            error = error or e
+            continue
+        if acceptable(value):
+            return value
+    raise ValueError(f"no JSON {expect.__name__} with {list(required)} found: {error or 'no complete value'}")
+
+
+def _record_json(purpose: str, **deltas: int) -> None:
+    with _json_lock:
+        stats = _json_stats.setdefault(purpose, {"calls": 0, "parse_failures": 0, "repaired": 0, "failed": 0})
+        for name, delta in deltas.items():
+            stats[name] += delta
+
+
+def invoke_llm_json(selected_model: Dict[str, str], prompt: str, temperature: float, max_tokens: int, purpose: str = "json", expect: type = dict, required: Tuple[str, ...] = (), use_cache: bool = True) -> Any:
+    """
+    Structured-output call: native JSON mode, fast parse, and at most one cheap repair call.
+    The repair call sends only the broken output (not the original prompt) to the provider's
+    JSON_REPAIR_MODELS entry. Outcomes are counted per purpose (see get_json_parse_stats).
+    Raises ValueError if the output cannot be parsed even after repair.
+    """
+    llm = create_llm(selected_model, temperature=temperature, max_tokens=max_tokens, json_mode=True)
+    text = invoke_llm(llm, prompt, selected_model, temperature, max_tokens, use_cache=use_cache, json_mode=True)
+    _record_json(purpose, calls=1)
+    try:
+        return parse_json_response(text, expect, required)
+    except ValueError as e:
+        _record_json(purpose, parse_failures=1)
+        error = e
+
+    provider = selected_model.get("provider")
+    repair_model = {**selected_model, "model": JSON_REPAIR_MODELS.get(provider, selected_model.get("model"))}
+    repair_tokens = max(max_tokens, JSON_REPAIR_MAX_TOKENS)
+    repair_prompt = JSON_REPAIR_PROMPT.format(kind="object" if expect is dict else "array", error=error, text=text)
+    try:
+        repair_llm = create_llm(repair_model, temperature=0.0, max_tokens=repair_tokens, json_mode=True)
+        value = parse_json_response(invoke_llm(repair_llm, repair_prompt, repair_model, 0.0, repair_tokens, use_cache=use_cache, json_mode=True), expect, required)
+    except Exception as e:
+        _record_json(purpose, failed=1)
+        raise ValueError(f"Failed to parse JSON from model output: {error}; repair failed: {e}") from e
+    _record_json(purpose, repaired=1)
+    return value
+
+
+def get_json_parse_stats() -> Dict[str, Dict[str, float]]:
+    """Per-purpose structured-output counters: calls, parse_failures, repaired, failed, failure_rate (first-pass)."""
+    with _json_lock:
+        stats = {purpose: dict(counts) for purpose, counts in _json_stats.items()}
+    for counts in stats.values():
+        counts["failure_rate"] = counts["parse_failures"] / counts["calls"] if counts["calls"] else 0.0
+    return stats
+
+
+def compare_scripts_json(original_script: str, modified_script: str, template_text: str, provider: str = "openai", model: str = "gpt-4.1-mini", temperature: float = 0.2, max_tokens: int = 1800, use_cache: bool = True) -> Dict:
     """
-    Performs an AI comparison and expects STRICT JSON output describing changes.
-    Returns a parsed Python dict. Raises if parsing fails.
+    Performs an AI comparison in the provider's JSON mode and returns the parsed dict.
+    Raises RuntimeError if the output cannot be parsed (after one repair attempt).
     """
     selected_model = {"provider": provider, "model": model}
-    llm = create_llm(selected_model, temperature=temperature, max_tokens=max_tokens)
     prompt = PromptTemplate(
         input_variables=["original_script", "modified_script"],
         template=template_text
@@ -147,27 +751,13 @@ def compare_scripts_json(original_script: str, modified_script: str, template_te
         original_script=original_script,
         modified_script=modified_script
     )
-    response = llm.invoke(formatted)
-    text = response.content if hasattr(response, "content") else str(response)
-    json_str = _extract_json_block(text)
     try:
-        return json.loads(json_str)
-    except Exception:
-        # Attempt a simple cleanup (remove trailing prose)
-        try:
-            cleaned = json_str.strip()
-            # If model returned bare key-value pairs without outer braces, wrap them
-            if cleaned and not cleaned.lstrip().startswith("{") and '"summary"' in cleaned:
-                cleaned = "{\n" + cleaned + "\n}"
-            # Ensure we end at the last closing brace
-            if "}" in cleaned and cleaned.count("{") != cleaned.count("}"):
-                # Trim after the last closing brace
-                cleaned = cleaned[: cleaned.rfind("}") + 1]
-            return json.loads(cleaned)
-        except Exception as e:
-            raise RuntimeError(f"Failed to parse JSON from model output: {e}")
+        return invoke_llm_json(selected_model, formatted, temperature, max_tokens, purpose="compare_scripts", required=("changes",), use_cache=use_cache)
+    except ValueError as e:
+        raise RuntimeError(str(e))
 
-def generate_modified_script(original_script: str, template_text: str, provider: str = "openai", model: str = "gpt-4.1-mini", temperature: float = 0.4, max_tokens: int = 3500) -> str:
+
+def generate_modified_script(original_script: str, template_text: str, provider: str = "openai", model: str = "gpt-4.1-mini", temperature: float = 0.4, max_tokens: int = 3500, use_cache: bool = True) -> str:
     """
     Generates a modified version of the script with product placements,
     preserving story and character arcs.
@@ -179,7 +769,18 @@ def generate_modified_script(original_script: str, template_text: str, provider:
         template=template_text
     )
     formatted = prompt.format(original_script=original_script)
-    response = llm.invoke(formatted)
-    return response.content if hasattr(response, "content") else str(response)
+    return invoke_llm(llm, formatted, selected_model, temperature, max_tokens, use_cache=use_cache)
+
+
+def generate_modified_script_stream(original_script: str, template_text: str, provider: str = "openai", model: str = "gpt-4.1-mini", temperature: float = 0.4, max_tokens: int = 3500, use_cache: bool = True, metrics: Optional[Dict[str, float]] = None) -> Iterator[str]:
+    """Streaming variant of generate_modified_script()."""
+    selected_model = {"provider": provider, "model": model}
+    llm = create_llm(selected_model, temperature=temperature, max_tokens=max_tokens)
+    prompt = PromptTemplate(
+        input_variables=["original_script"],
+        template=template_text
+    )
+    formatted = prompt.format(original_script=original_script)
+    return stream_llm(llm, formatted, selected_model, temperature, max_tokens, use_cache=use_cache, metrics=metrics)
 
 
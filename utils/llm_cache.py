@@ -0,0 +1,172 @@
+"""
+Persistent LLM response cache for Movie Analytics Platform
+Content-addressed SQLite store: responses are keyed by a SHA-256 of the
+provider, model, sampling parameters and the fully rendered prompt, so
+re-running the same analysis returns instantly instead of re-paying the call.
+"""
+
+import hashlib
+import json
+import os
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from utils.sqlite_lru import SQLiteLRUStore
+
+# Cache file (kept next to the main database, gitignored with it)
+LLM_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'db', 'llm_cache.db')
+
+# Global switch; set LLM_CACHE_ENABLED=0 to bypass the cache everywhere
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") != "0"
+
+# Entries older than this are treated as misses and removed
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Least recently used entries are evicted once stored responses exceed this size
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_MB", "200")) * 1024 * 1024
+
+_store = SQLiteLRUStore(
+    'llm_responses',
+    'response BLOB NOT NULL',
+    lambda: LLM_CACHE_PATH
+)
+_stats = {'hits': 0, 'misses': 0, 'writes': 0, 'expired': 0, 'evictions': 0}
+
+
+def make_key(provider: Optional[str], model: Optional[str], temperature: float,
+             max_tokens: int, prompt: str, **extra: Any) -> str:
+    """
+    Build the content address of an LLM call
+
+    Args:
+        provider: Provider name ('google', 'openai', 'xai', ...)
+        model: Model id
+        temperature: Sampling temperature
+        max_tokens: Completion token limit
+        prompt: Fully rendered prompt text
+        **extra: Any other parameter that changes the output (e.g. response_format)
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    payload = json.dumps({
+        'provider': provider,
+        'model': model,
+        'temperature': float(temperature),
+        'max_tokens': int(max_tokens),
+        'extra': extra,
+    }, sort_keys=True)
+    digest = hashlib.sha256(payload.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(prompt.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def get(key: str) -> Optional[str]:
+    """
+    Look up a cached response
+
+    Args:
+        key: Key from make_key()
+
+    Returns:
+        str: Cached response text, or None on a miss (or any cache error)
+    """
+    try:
+        now = time.time()
+        with _store.lock:
+            conn = _store.connection()
+            row = conn.execute(
+                "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                _stats['misses'] += 1
+                return None
+            if LLM_CACHE_TTL and now - row[1] > LLM_CACHE_TTL:
+                _store.delete(conn, key)
+                _stats['expired'] += 1
+                _stats['misses'] += 1
+                return None
+            _store.touch(conn, key, now)
+            _stats['hits'] += 1
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    except Exception as e:
+        print(f"Error reading LLM cache: {str(e)}")
+        return None
+
+
+def put(key: str, response: str) -> bool:
+    """
+    Store a response and evict least recently used entries over the size bound
+
+    Args:
+        key: Key from make_key()
+        response: Response text
+
+    Returns:
+        bool: True if stored successfully
+    """
+    try:
+        blob = zlib.compress(response.encode('utf-8'), 6)
+        now = time.time()
+        with _store.lock:
+            conn = _store.connection()
+            conn.execute("""
+                INSERT OR REPLACE INTO llm_responses (key, response, size, created_at, last_used)
+                VALUES (?, ?, ?, ?, ?)
+            """, (key, blob, len(blob), now, now))
+            _stats['writes'] += 1
+            _stats['evictions'] += _store.evict(conn, LLM_CACHE_MAX_BYTES)
+        return True
+
+    except Exception as e:
+        print(f"Error writing LLM cache: {str(e)}")
+        return False
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Get cache counters for this process plus the size of the cache file
+
+    Returns:
+        dict: hits, misses, hit_rate, writes, expired, evictions, entries, bytes, enabled
+    """
+    stats: Dict[str, Any] = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    stats['enabled'] = LLM_CACHE_ENABLED
+    try:
+        with _store.lock:
+            entries, size = _store.connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+            ).fetchone()
+        stats['entries'] = entries
+        stats['bytes'] = size
+    except Exception as e:
+        print(f"Error reading LLM cache stats: {str(e)}")
+        stats['entries'] = 0
+        stats['bytes'] = 0
+    return stats
+
+
+def clear_cache() -> bool:
+    """
+    Delete every cached response
+
+    Returns:
+        bool: True if cleared successfully
+    """
+    try:
+        _store.clear()
+        return True
+
+    except Exception as e:
+        print(f"Error clearing LLM cache: {str(e)}")
+        return False
+
+
+def close_cache() -> None:
+    """Close the cache connection (e.g. in tests)"""
+    _store.close()
@@ -0,0 +1,170 @@
+"""
+Offline chat model for Movie Analytics Platform
+LocalChatModel is a LangChain chat model that never touches the network: it
+answers with deterministic, templated text derived from a hash of the prompt,
+after a configurable first-token latency and at a configurable token rate.
+Select it with {'provider': 'local', 'model': '<any name>'} to run the analysis,
+comparison and casting flows (and their benchmarks) without API keys or quota.
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+# Defaults for models created without explicit latency_s / tokens_per_sec
+LOCAL_LLM_LATENCY = float(os.getenv("LOCAL_LLM_LATENCY", "0.2"))  # seconds before the first token
+LOCAL_LLM_TOKENS_PER_SEC = float(os.getenv("LOCAL_LLM_TOKENS_PER_SEC", "80"))
+
+# Patched in tests
+_sleep = time.sleep
+
+_TOKEN = re.compile(r"\S+\s*|\s+")
+_SCENE_HEADING = re.compile(r"^[ \t]*(?:\d+[A-Z]?\.?[ \t]+)?((?:INT|EXT|I/E)[^\n]{2,60})$", re.MULTILINE)
+_CHARACTER_CUE = re.compile(r"^[ \t]*([A-Z][A-Z'\-]{1,20}(?: [A-Z][A-Z'\-]{1,20})?)[ \t]*(?:\(.*\))?[ \t]*$", re.MULTILINE)
+_MARKDOWN_HEADING = re.compile(r"^(#{2,3} [^\n{}]{3,80})$", re.MULTILINE)
+
+_DEFAULT_HEADINGS = [
+    "## Summary", "## Product Placement Opportunities", "## Brand Fit",
+    "## Audience Impact", "## Recommendations",
+]
+_ACTORS = [
+    "Zendaya", "Pedro Pascal", "Florence Pugh", "Dev Patel", "Viola Davis", "Oscar Isaac",
+    "Anya Taylor-Joy", "Mahershala Ali", "Saoirse Ronan", "Riz Ahmed", "Jodie Comer", "Daniel Kaluuya",
+]
+_BRANDS = ["Nespresso", "Apple", "Nike", "Coca-Cola", "Audi", "Samsung", "Ray-Ban", "Starbucks"]
+_CAMERA = ["close-up", "over-the-shoulder shot", "slow push-in", "wide establishing shot", "insert shot"]
+_PHRASES = [
+    "The scene offers a natural moment for {brand} without interrupting the dialogue.",
+    "{character} handles the product on screen, which keeps the integration organic.",
+    "A {camera} in {scene} can feature {brand} for two to three seconds.",
+    "Audience attention peaks here, so placement recall should be high.",
+    "The tone of {scene} suits a premium lifestyle brand such as {brand}.",
+    "Keep the integration light; {character} should not name the product.",
+    "This beat carries emotional weight, so avoid overt branding.",
+]
+
+
+class LocalChatModel(BaseChatModel):
+    """Deterministic offline chat model with simulated latency and streaming rate."""
+
+    model: str = "local"
+    temperature: float = 0.0
+    max_tokens: int = 2000
+    latency_s: float = LOCAL_LLM_LATENCY
+    tokens_per_sec: float = LOCAL_LLM_TOKENS_PER_SEC
+
+    @property
+    def _llm_type(self) -> str:
+        return "local"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model, "latency_s": self.latency_s, "tokens_per_sec": self.tokens_per_sec}
+
+    def _tokens(self, messages: List[BaseMessage]) -> List[str]:
+        """Completion for the given messages, split into word tokens and cut at max_tokens."""
+        prompt = "\n".join(m.content if isinstance(m.content, str) else str(m.content) for m in messages)
+        tokens = _TOKEN.findall(render_response(prompt, self.model))
+        return tokens[:max(1, self.max_tokens)]
+
+    def _pace(self, start: float, emitted: int) -> None:
+        """Sleep until `emitted` tokens are due: first-token latency plus tokens_per_sec."""
+        due = start + self.latency_s + (emitted / self.tokens_per_sec if self.tokens_per_sec > 0 else 0.0)
+        delay = due - time.perf_counter()
+        if delay > 0:
+            _sleep(delay)
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        start = time.perf_counter()
+        tokens = self._tokens(messages)
+        self._pace(start, len(tokens))
+        message = AIMessage(content="".join(tokens), response_metadata={"model_name": self.model})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        start = time.perf_counter()
+        for emitted, token in enumerate(self._tokens(messages), start=1):
+            self._pace(start, emitted)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+def render_response(prompt: str, model: str = "local") -> str:
+    """
+    Build the templated response for a prompt
+
+    The output depends only on the model name and prompt text, so repeated runs
+    (and invoke vs. stream) return identical text regardless of temperature.
+
+    Args:
+        prompt: Fully rendered prompt
+        model: Model name (part of the seed)
+
+    Returns:
+        str: JSON for prompts asking for STRICT JSON, a scored review for prompts
+        asking for 'Score: NN/100', otherwise markdown following the prompt's headings
+    """
+    seed = int(hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()[:16], 16)
+    rng = random.Random(seed)
+    scenes = [s.strip() for s in _SCENE_HEADING.findall(prompt)][:40] or ["INT. UNKNOWN LOCATION - DAY"]
+    characters = sorted({c.strip() for c in _CHARACTER_CUE.findall(prompt)
+                         if not c.startswith(("INT", "EXT", "FADE", "CUT", "THE END"))})[:20] or ["LEAD"]
+
+    def sentence() -> str:
+        return rng.choice(_PHRASES).format(
+            brand=rng.choice(_BRANDS), character=rng.choice(characters),
+            scene=rng.choice(scenes), camera=rng.choice(_CAMERA),
+        )
+
+    if "JSON" in prompt[:600]:
+        if "candidates" in prompt[:600]:
+            picks = rng.sample(_ACTORS, 5)
+            return json.dumps({"candidates": [
+                {"name": name, "target_role": f"{rng.choice(characters).title()} — {sentence()}"}
+                for name in picks
+            ]})
+        if "changes" in prompt:
+            changes = []
+            for i in range(rng.randint(1, 4)):
+                kind = rng.choice(["placement", "cinematography", "both"])
+                brand = rng.choice(_BRANDS)
+                changes.append({
+                    "id": f"chg-{i + 1:03d}",
+                    "type": kind,
+                    "sceneHint": rng.choice(scenes),
+                    "originalExcerpt": "",
+                    "modifiedExcerpt": sentence(),
+                    "productMentions": [brand] if kind != "cinematography" else [],
+                    "cinematographyNotes": [rng.choice(_CAMERA)] if kind != "placement" else [],
+                    "confidence": rng.choice(["low", "medium", "high"]),
+                })
+            summary = {
+                "newPlacementsCount": sum(c["type"] != "cinematography" for c in changes),
+                "cinematographyChangesCount": sum(c["type"] != "placement" for c in changes),
+            }
+            return json.dumps({"summary": summary, "changes": changes}, indent=2)
+        return json.dumps({"result": sentence()})
+
+    if "Score: NN/100" in prompt:
+        bullets = "\n".join(f"- {sentence()}" for _ in range(4))
+        return f"{bullets}\n\nScore: {rng.randint(40, 95)}/100"
+
+    headings = list(dict.fromkeys(_MARKDOWN_HEADING.findall(prompt)))[:12] or _DEFAULT_HEADINGS
+    sections = []
+    for heading in headings:
+        body = " ".join(sentence() for _ in range(rng.randint(2, 4)))
+        sections.append(f"{heading}\n\n{body}\n\n- {sentence()}\n- {sentence()}")
+    return "\n\n".join(sections) + "\n"
@@ -0,0 +1,305 @@
+"""
+Client-side rate limiting and retry for Movie Analytics Platform
+A shared token bucket per provider/API key smooths request bursts, and
+call_with_retry() retries throttled or transient failures with jittered
+exponential backoff, honoring Retry-After when the provider sends one.
+Used for LLM calls (utils/langchain_util.py), TMDb/OMDb/Tavily lookups
+(utils/ai_casting_util.py) and the Feature Importance fetch helpers.
+"""
+
+import hashlib
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import requests
+except ImportError:
+    requests = None  # type: ignore
+
+# Sustained requests/second and burst size per provider
+# Override the rate with RATE_LIMIT_<PROVIDER>, e.g. RATE_LIMIT_OPENAI=10
+RATE_LIMITS = {
+    'openai': (5.0, 10),
+    'google': (2.0, 5),
+    'xai': (2.0, 5),
+    'tmdb': (20.0, 40),
+    'omdb': (5.0, 10),
+    'tavily': (2.0, 5),
+    'local': (1000.0, 1000),  # offline stand-in (utils/local_llm.py); effectively unthrottled
+}
+DEFAULT_RATE_LIMIT = (2.0, 5)
+
+# Environment variable holding each provider's API key (limiters are per key)
+PROVIDER_KEY_ENV = {
+    'openai': 'OPENAI_API_KEY',
+    'google': 'GOOGLE_API_KEY',
+    'xai': 'XAI_API_KEY',
+    'tmdb': 'TMDB_API_KEY',
+    'omdb': 'OMDB_API_KEY',
+    'tavily': 'TAVILY_API_KEY',
+}
+
+MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "4"))
+RETRY_BASE_DELAY = 1.0    # seconds; doubled per attempt before jitter
+RETRY_MAX_DELAY = 60.0    # upper bound for any single wait, including Retry-After
+
+# HTTP statuses worth retrying: timeouts, throttling and transient server errors
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# Exception class names raised by provider SDKs for throttling/transient failures
+RETRYABLE_ERRORS = {
+    'RateLimitError', 'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable',
+    'InternalServerError', 'APITimeoutError', 'APIConnectionError', 'DeadlineExceeded',
+    'Timeout', 'ReadTimeout', 'ConnectTimeout', 'ConnectionError', 'TimeoutException',
+}
+
+# Patched in tests
+_sleep = time.sleep
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize a full bucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token (possibly going into debt) and return how long the caller must wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def acquire(self) -> float:
+        """
+        Wait until a request may be sent
+
+        Returns:
+            float: Seconds spent waiting (0 if a token was available)
+        """
+        wait = self._reserve()
+        if wait > 0:
+            _sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller of this bucket for `seconds` (e.g. after a 429 with Retry-After)"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+class RetryableResponse(Exception):
+    """Raised internally for an HTTP response whose status is worth retrying"""
+
+    def __init__(self, response: Any):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+        self.status_code = response.status_code
+
+
+_limiters: Dict[Tuple[str, str], TokenBucket] = {}
+_limiters_lock = threading.Lock()
+_stats: Dict[str, Dict[str, float]] = {}
+_stats_lock = threading.Lock()
+
+
+def get_limiter(provider: str, api_key: Optional[str] = None) -> TokenBucket:
+    """
+    Get the shared token bucket for a provider and API key
+
+    Args:
+        provider: Provider name ('openai', 'tmdb', ...)
+        api_key: API key (defaults to the provider's environment variable)
+
+    Returns:
+        TokenBucket: Limiter shared by every caller using that key
+    """
+    if api_key is None:
+        api_key = os.getenv(PROVIDER_KEY_ENV.get(provider, ''), '')
+    key_id = hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12]
+    with _limiters_lock:
+        limiter = _limiters.get((provider, key_id))
+        if limiter is None:
+            rate, capacity = RATE_LIMITS.get(provider, DEFAULT_RATE_LIMIT)
+            override = os.getenv(f"RATE_LIMIT_{provider.upper()}")
+            if override:
+                rate = float(override)
+                capacity = max(1, int(rate * 2))
+            limiter = TokenBucket(rate, capacity)
+            _limiters[(provider, key_id)] = limiter
+        return limiter
+
+
+def _record(provider: str, **deltas: float) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(provider, {
+            'calls': 0, 'throttled': 0, 'throttle_wait_s': 0.0, 'retries': 0, 'failures': 0
+        })
+        for name, delta in deltas.items():
+            stats[name] += delta
+
+
+def _status_of(error: Exception) -> Optional[int]:
+    """HTTP status carried by an SDK/HTTP exception, if any"""
+    for attr in ('status_code', 'code', 'status'):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, 'response', None)
+    value = getattr(response, 'status_code', None)
+    return value if isinstance(value, int) else None
+
+
+def retry_after_seconds(headers: Any) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP date)
+
+    Args:
+        headers: Response headers mapping (or None)
+
+    Returns:
+        float: Seconds to wait, or None if absent/unparseable
+    """
+    if not headers:
+        return None
+    value = headers.get('retry-after') or headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Decide whether a failed call is worth retrying
+
+    Args:
+        error: Exception raised by the call
+
+    Returns:
+        bool: True for throttling, timeouts, connection and 5xx errors
+    """
+    status = _status_of(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    if any(cls.__name__ in RETRYABLE_ERRORS for cls in type(error).__mro__):
+        return True
+    message = str(error).lower()
+    return '429' in message or 'rate limit' in message or 'resource has been exhausted' in message
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff for the given retry attempt (0-based)"""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+def call_with_retry(provider: str, fn: Callable[..., Any], *args,
+                    api_key: Optional[str] = None, max_retries: Optional[int] = None, **kwargs) -> Any:
+    """
+    Call fn through the provider's rate limiter, retrying transient failures
+
+    Args:
+        provider: Provider name used for the limiter and counters
+        fn: Callable performing one request
+        api_key: API key selecting the limiter (defaults to the provider's environment variable)
+        max_retries: Retries after the first attempt (defaults to MAX_RETRIES)
+
+    Returns:
+        Any: fn's return value
+
+    Raises:
+        Exception: The last error once retries are exhausted or the error is not retryable
+    """
+    limiter = get_limiter(provider, api_key)
+    retries = MAX_RETRIES if max_retries is None else max_retries
+
+    for attempt in range(retries + 1):
+        waited = limiter.acquire()
+        _record(provider, calls=1, throttled=1 if waited > 0 else 0, throttle_wait_s=waited)
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if attempt >= retries or not is_retryable(e):
+                _record(provider, failures=1)
+                raise
+            retry_after = retry_after_seconds(getattr(getattr(e, 'response', None), 'headers', None))
+            if retry_after is not None:
+                delay = min(retry_after, RETRY_MAX_DELAY)
+                limiter.pause(delay)
+            else:
+                delay = backoff_delay(attempt)
+            _record(provider, retries=1)
+            _sleep(delay)
+
+
+def rate_limited_get(provider: str, url: str, api_key: Optional[str] = None,
+                     max_retries: Optional[int] = None, **kwargs) -> Any:
+    """
+    requests.get() through the provider's limiter with retries on 429/5xx
+
+    Args:
+        provider: Provider name ('tmdb', 'omdb', ...)
+        url: Request URL
+        api_key: API key selecting the limiter
+        max_retries: Retries after the first attempt
+        **kwargs: Passed to requests.get (params, timeout, ...)
+
+    Returns:
+        requests.Response: Final response (callers still check status / raise_for_status)
+    """
+    def fetch():
+        response = requests.get(url, **kwargs)
+        if response.status_code in RETRYABLE_STATUS:
+            raise RetryableResponse(response)
+        return response
+
+    try:
+        return call_with_retry(provider, fetch, api_key=api_key, max_retries=max_retries)
+    except RetryableResponse as e:
+        return e.response
+
+
+def get_rate_limit_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Get per-provider request counters
+
+    Returns:
+        dict: provider -> calls, throttled, throttle_wait_s, retries, failures
+    """
+    with _stats_lock:
+        return {provider: dict(stats) for provider, stats in _stats.items()}
+
+
+def reset_rate_limits() -> None:
+    """Drop all limiters and counters (e.g. in tests or after changing RATE_LIMITS)"""
+    with _limiters_lock:
+        _limiters.clear()
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,133 @@
+"""
+Shared SQLite LRU store for Movie Analytics Platform caches
+One table of size-tracked rows per cache file, evicted least recently used
+first once the stored size exceeds a bound. utils/llm_cache.py and
+utils/extraction_cache.py keep their own key formats, payload columns and
+counters on top of it.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Callable, Optional
+
+
+class SQLiteLRUStore:
+    """
+    Keyed SQLite table whose rows carry size, created_at and last_used columns
+
+    Callers hold `lock` around `connection()` and their own row queries; the
+    store opens the file, creates the table and handles eviction and teardown.
+    """
+
+    def __init__(self, table: str, columns: str, path: Callable[[], str]):
+        """
+        Initialize the store (the file is opened on first use)
+
+        Args:
+            table: Table name
+            columns: Cache-specific column definitions besides key, size, created_at and last_used
+            path: Returns the cache file path; read on every use so the module setting can change
+        """
+        self.table = table
+        self.path = path
+        self.lock = threading.Lock()
+        self._schema = f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT PRIMARY KEY,
+                {columns},
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_{table}_last_used ON {table}(last_used);
+
+            -- Running size total kept by triggers, so eviction never has to SUM the table
+            BEGIN IMMEDIATE;
+            CREATE TABLE IF NOT EXISTS lru_totals (
+                tbl TEXT PRIMARY KEY,
+                bytes INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO lru_totals (tbl, bytes) SELECT '{table}', COALESCE(SUM(size), 0) FROM {table};
+            CREATE TRIGGER IF NOT EXISTS {table}_size_insert AFTER INSERT ON {table} BEGIN
+                UPDATE lru_totals SET bytes = bytes + NEW.size WHERE tbl = '{table}';
+            END;
+            CREATE TRIGGER IF NOT EXISTS {table}_size_delete AFTER DELETE ON {table} BEGIN
+                UPDATE lru_totals SET bytes = bytes - OLD.size WHERE tbl = '{table}';
+            END;
+            CREATE TRIGGER IF NOT EXISTS {table}_size_update AFTER UPDATE OF size ON {table} BEGIN
+                UPDATE lru_totals SET bytes = bytes + NEW.size - OLD.size WHERE tbl = '{table}';
+            END;
+            COMMIT;
+        """
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_path: Optional[str] = None
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the shared connection, reopening it if the path changed (caller holds lock)"""
+        path = self.path()
+        if self._conn is None or self._conn_path != path:
+            if self._conn is not None:
+                self._conn.close()
+            cache_dir = os.path.dirname(path)
+            if cache_dir:
+                os.makedirs(cache_dir, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._conn.execute("PRAGMA busy_timeout = 5000")
+            # INSERT OR REPLACE only fires the delete trigger for the replaced row with this on
+            self._conn.execute("PRAGMA recursive_triggers = ON")
+            self._conn.executescript(self._schema)
+            self._conn_path = path
+        return self._conn
+
+    def touch(self, conn: sqlite3.Connection, key: str, now: float) -> None:
+        """Mark a row as used (caller holds lock)"""
+        conn.execute(f"UPDATE {self.table} SET last_used = ? WHERE key = ?", (now, key))
+
+    def delete(self, conn: sqlite3.Connection, key: str) -> None:
+        """Remove one row (caller holds lock)"""
+        conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def total_size(self, conn: sqlite3.Connection) -> int:
+        """Sum of the size column over every row, read from the running total (caller holds lock)"""
+        return conn.execute("SELECT bytes FROM lru_totals WHERE tbl = ?", (self.table,)).fetchone()[0]
+
+    def evict(self, conn: sqlite3.Connection, max_bytes: int) -> int:
+        """
+        Delete least recently used rows until the stored size fits (caller holds lock)
+
+        Args:
+            conn: Connection from connection()
+            max_bytes: Size bound
+
+        Returns:
+            int: Number of rows evicted
+        """
+        total = self.total_size(conn)
+        if total <= max_bytes:
+            return 0
+
+        excess = total - max_bytes
+        victims = []
+        for key, size in conn.execute(f"SELECT key, size FROM {self.table} ORDER BY last_used"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", victims)
+        return len(victims)
+
+    def clear(self) -> None:
+        """Delete every row"""
+        with self.lock:
+            self.connection().execute(f"DELETE FROM {self.table}")
+
+    def close(self) -> None:
+        """Close the connection (it is reopened on next use)"""
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            self._conn_path = None
@@ -0,0 +1,315 @@
+"""
+Token-aware prompt budgeting for Movie Analytics Platform
+Counts tokens per model family (tiktoken for OpenAI models when installed,
+a conservative characters-per-token estimate otherwise), splits a model's
+prompt budget across the sections of a prompt (template, script, evidence)
+and trims screenplays at scene boundaries instead of mid-line.
+Counts are memoized by a hash of the text, so re-budgeting the same script is
+free without the memo keeping whole scripts alive.
+"""
+
+import hashlib
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Context window (tokens) by model-id prefix; the longest matching prefix wins
+CONTEXT_WINDOWS = {
+    'gpt-4.1': 1_047_576,
+    'gpt-4o': 128_000,
+    'gpt-4-turbo': 128_000,
+    'gpt-4': 8_192,
+    'gpt-3.5': 16_385,
+    'gpt-5': 400_000,
+    'o1': 200_000,
+    'o3': 200_000,
+    'o4': 200_000,
+    'gemini-2.5': 1_048_576,
+    'gemini-2.0': 1_048_576,
+    'gemini-1.5': 1_048_576,
+    'grok-4': 256_000,
+    'grok-3': 131_072,
+    'grok-2': 131_072,
+}
+DEFAULT_CONTEXT_WINDOW = 32_768
+
+# Completion token limit by model-id prefix (longest matching prefix wins); unknown models get the low default
+OUTPUT_TOKEN_LIMITS = {
+    'gpt-4.1': 32_768,
+    'gpt-4o': 16_384,
+    'gpt-4-turbo': 4_096,
+    'gpt-4': 8_192,
+    'gpt-3.5': 4_096,
+    'gpt-5': 128_000,
+    'o1': 100_000,
+    'o3': 100_000,
+    'o4': 100_000,
+    'gemini-2.5': 65_536,
+    'gemini-2.0': 8_192,
+    'gemini-1.5': 8_192,
+    'grok-4': 32_768,
+    'grok-3': 16_384,
+    'grok-2': 8_192,
+}
+DEFAULT_OUTPUT_TOKEN_LIMIT = 4_096
+
+# Upper bound on prompt tokens regardless of the window, to keep latency and cost sane
+PROMPT_TOKEN_CAP = int(os.getenv("PROMPT_TOKEN_CAP", "32000"))
+
+# Tokens held back for chat formatting overhead and counting error
+SAFETY_MARGIN = 512
+
+# Estimated characters per token where no exact tokenizer is available (kept on the low side)
+CHARS_PER_TOKEN = {
+    'openai': 3.8,
+    'google': 3.6,
+    'xai': 3.4,
+}
+DEFAULT_CHARS_PER_TOKEN = 3.4
+
+# Token counts remembered by count_tokens() (least recently used are dropped first)
+TOKEN_COUNT_CACHE_SIZE = 4096
+
+TRUNCATION_NOTE = "\n\n[... truncated to fit the model's context: {kept} of {total} {unit} included ...]\n"
+
+# Scene headings: "INT. KITCHEN - DAY", "EXT./INT. CAR", "12 INT. OFFICE", "I/E HALLWAY"
+SCENE_HEADING = re.compile(r"^[ \t]*(?:\d+[A-Z]?\.?[ \t]+)?(?:INT\.?/EXT|EXT\.?/INT|I/E|INT|EXT)[\.\s]", re.MULTILINE)
+
+
+def split_scenes(script_content: str) -> List[str]:
+    """Splits a screenplay at scene headings; any title-page preamble is the first piece."""
+    starts = [m.start() for m in SCENE_HEADING.finditer(script_content)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    starts.append(len(script_content))
+    return [script_content[a:b] for a, b in zip(starts, starts[1:]) if script_content[a:b].strip()]
+
+
+def _longest_prefix(mapping: Dict[str, int], model: str) -> Optional[str]:
+    matches = [prefix for prefix in mapping if model.startswith(prefix)]
+    return max(matches, key=len) if matches else None
+
+
+def context_window(selected_model: Optional[Dict[str, str]]) -> int:
+    """
+    Get the context window of a model
+
+    Args:
+        selected_model: {'provider': ..., 'model': ...} (None for the default)
+
+    Returns:
+        int: Context window in tokens
+    """
+    model = ((selected_model or {}).get('model') or '').lower()
+    prefix = _longest_prefix(CONTEXT_WINDOWS, model)
+    return CONTEXT_WINDOWS[prefix] if prefix else DEFAULT_CONTEXT_WINDOW
+
+
+def output_token_limit(selected_model: Optional[Dict[str, str]]) -> int:
+    """
+    Get the largest completion a model can return
+
+    Args:
+        selected_model: {'provider': ..., 'model': ...} (None for the default)
+
+    Returns:
+        int: Output token limit
+    """
+    model = ((selected_model or {}).get('model') or '').lower()
+    prefix = _longest_prefix(OUTPUT_TOKEN_LIMITS, model)
+    return OUTPUT_TOKEN_LIMITS[prefix] if prefix else DEFAULT_OUTPUT_TOKEN_LIMIT
+
+
+def prompt_budget(selected_model: Optional[Dict[str, str]], max_tokens: int) -> int:
+    """
+    Get the number of prompt tokens available once the completion is reserved
+
+    Args:
+        selected_model: {'provider': ..., 'model': ...}
+        max_tokens: Completion token limit
+
+    Returns:
+        int: Prompt token budget (capped at PROMPT_TOKEN_CAP)
+    """
+    return max(0, min(context_window(selected_model) - int(max_tokens) - SAFETY_MARGIN, PROMPT_TOKEN_CAP))
+
+
+def tokenizer_for(selected_model: Optional[Dict[str, str]]) -> str:
+    """
+    Name the tokenizer used to count tokens for a model
+
+    Args:
+        selected_model: {'provider': ..., 'model': ...}
+
+    Returns:
+        str: A tiktoken encoding name for OpenAI models when tiktoken is installed,
+        otherwise 'approx:<family>'
+    """
+    provider = (selected_model or {}).get('provider') or ''
+    model = ((selected_model or {}).get('model') or '').lower()
+    if provider == 'openai' and TIKTOKEN_AVAILABLE:
+        legacy = model.startswith(('gpt-4-', 'gpt-3.5')) or model == 'gpt-4'
+        return 'cl100k_base' if legacy else 'o200k_base'
+    return f"approx:{provider}"
+
+
+@lru_cache(maxsize=8)
+def _encoding(name: str):
+    return tiktoken.get_encoding(name)
+
+
+# (tokenizer, SHA-256 of the text) -> token count; digests instead of texts keep the memo small
+_counts: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+_counts_lock = threading.Lock()
+_count_stats = {'hits': 0, 'misses': 0}
+
+
+def _count(tokenizer: str, text: str) -> int:
+    key = (tokenizer, hashlib.sha256(text.encode('utf-8', 'surrogatepass')).digest())
+    with _counts_lock:
+        if key in _counts:
+            _counts.move_to_end(key)
+            _count_stats['hits'] += 1
+            return _counts[key]
+        _count_stats['misses'] += 1
+
+    count = _tokenize_count(tokenizer, text)
+    with _counts_lock:
+        _counts[key] = count
+        while len(_counts) > TOKEN_COUNT_CACHE_SIZE:
+            _counts.popitem(last=False)
+    return count
+
+
+def _tokenize_count(tokenizer: str, text: str) -> int:
+    if tokenizer.startswith('approx:'):
+        ratio = CHARS_PER_TOKEN.get(tokenizer[len('approx:'):], DEFAULT_CHARS_PER_TOKEN)
+        return math.ceil(len(text) / ratio)
+    return len(_encoding(tokenizer).encode(text, disallowed_special=()))
+
+
+def count_tokens(text: str, selected_model: Optional[Dict[str, str]] = None) -> int:
+    """
+    Count the tokens of a text for a model family (memoized)
+
+    Args:
+        text: Text to count
+        selected_model: {'provider': ..., 'model': ...}
+
+    Returns:
+        int: Token count (exact for OpenAI models with tiktoken, estimated otherwise)
+    """
+    if not text:
+        return 0
+    return _count(tokenizer_for(selected_model), text)
+
+
+def get_token_count_stats() -> Dict[str, int]:
+    """
+    Get memoization counters of count_tokens()
+
+    Returns:
+        dict: hits, misses, size, max_size
+    """
+    with _counts_lock:
+        return {**_count_stats, 'size': len(_counts), 'max_size': TOKEN_COUNT_CACHE_SIZE}
+
+
+def allocate_budget(budget: int, sections: Dict[str, Tuple[int, float]]) -> Dict[str, int]:
+    """
+    Split a token budget across prompt sections by weight
+
+    Sections that need less than their weighted share get exactly what they need;
+    the leftover is redistributed among the rest.
+
+    Args:
+        budget: Tokens available for the sections
+        sections: name -> (tokens needed, weight)
+
+    Returns:
+        dict: name -> allotted tokens
+    """
+    allotted: Dict[str, int] = {}
+    pending = dict(sections)
+    remaining = max(0, budget)
+    while pending:
+        total_weight = sum(weight for _, weight in pending.values()) or 1.0
+        shares = {name: remaining * weight / total_weight for name, (_, weight) in pending.items()}
+        satisfied = [name for name, (needed, _) in pending.items() if needed <= shares[name]]
+        if not satisfied:
+            allotted.update({name: int(share) for name, share in shares.items()})
+            break
+        for name in satisfied:
+            allotted[name] = pending[name][0]
+            remaining -= pending.pop(name)[0]
+    return allotted
+
+
+def trim_to_budget(text: str, max_tokens: int, selected_model: Optional[Dict[str, str]] = None) -> str:
+    """
+    Trim text to a token budget at the last whole scene (or line) that fits
+
+    Screenplays are cut at scene headings; other text at line breaks. A short note
+    records how much was kept so the model knows the text is partial.
+
+    Args:
+        text: Screenplay or other text
+        max_tokens: Token budget for the text
+        selected_model: {'provider': ..., 'model': ...}
+
+    Returns:
+        str: text unchanged if it fits, otherwise its longest fitting prefix of whole units
+    """
+    if count_tokens(text, selected_model) <= max_tokens:
+        return text
+
+    units, unit = split_scenes(text), 'scenes'
+    if len(units) < 2:
+        units, unit = text.splitlines(keepends=True), 'lines'
+    note_tokens = count_tokens(TRUNCATION_NOTE.format(kept=len(units), total=len(units), unit=unit), selected_model)
+    available = max_tokens - note_tokens
+
+    kept: List[str] = []
+    used = 0
+    for piece in units:
+        cost = count_tokens(piece, selected_model)
+        if used + cost > available:
+            break
+        kept.append(piece)
+        used += cost
+
+    if not kept and available > 0:
+        # A single oversized unit: fall back to a proportional character cut
+        ratio = available / max(1, count_tokens(units[0], selected_model))
+        kept.append(units[0][:int(len(units[0]) * ratio)])
+    return "".join(kept) + TRUNCATION_NOTE.format(kept=len(kept), total=len(units), unit=unit)
+
+
+def fit_sections(fixed_text: str, sections: Dict[str, Tuple[str, float]],
+                 selected_model: Optional[Dict[str, str]], max_tokens: int) -> Dict[str, str]:
+    """
+    Trim the variable sections of a prompt so the whole prompt fits the model
+
+    Args:
+        fixed_text: Parts of the prompt that are always sent in full (template, instructions)
+        sections: name -> (text, weight) for trimmable parts such as 'script' or 'evidence'
+        selected_model: {'provider': ..., 'model': ...}
+        max_tokens: Completion token limit reserved out of the context window
+
+    Returns:
+        dict: name -> text trimmed to its share of the budget
+    """
+    budget = prompt_budget(selected_model, max_tokens) - count_tokens(fixed_text, selected_model)
+    needs = {name: (count_tokens(text, selected_model), weight) for name, (text, weight) in sections.items()}
+    allotted = allocate_budget(budget, needs)
+    return {name: trim_to_budget(text, allotted[name], selected_model) for name, (text, _) in sections.items()}